@@ -1,3 +1,29 @@
 from django.contrib import admin
+from .models import ArticleCacheEntry, SearchCacheEntry, VerdictCacheEntry, VerificationJobEntry
 
 # Register your models here.
+
+@admin.register(SearchCacheEntry)
+class SearchCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ('query', 'hits', 'created_at', 'last_accessed')
+    search_fields = ('query',)
+
+
+@admin.register(ArticleCacheEntry)
+class ArticleCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ('url', 'size', 'fetched_at', 'last_accessed')
+    search_fields = ('url',)
+
+
+@admin.register(VerdictCacheEntry)
+class VerdictCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ('claim', 'verdict', 'created_at')
+    search_fields = ('claim',)
+    exclude = ('embedding',)
+
+
+@admin.register(VerificationJobEntry)
+class VerificationJobEntryAdmin(admin.ModelAdmin):
+    list_display = ('id', 'claim', 'status', 'created_at', 'updated_at')
+    list_filter = ('status',)
+    search_fields = ('claim',)
@@ -0,0 +1,460 @@
+import datetime
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+from django.conf import settings
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import ArticleCacheEntry, SearchCacheEntry, VerdictCacheEntry
+
+
+def normalize_query(query):
+    """Lowercases, strips punctuation and collapses whitespace so trivially different claims share a key."""
+    text = unicodedata.normalize('NFKC', str(query)).lower()
+    text = re.sub(r'[^\w\s]', ' ', text)
+    return ' '.join(text.split())
+
+
+class SearchResultCache:
+    """
+    Persistent cache in front of FactCheckerService.search_web.
+
+    Entries live in the default database (SQLite) so they survive restarts.
+    They expire after FACTS_SEARCH_CACHE_TTL seconds, and the least recently
+    used ones are evicted once there are more than
+    FACTS_SEARCH_CACHE_MAX_ENTRIES. Hit/miss counters are per process.
+    """
+    hits = 0
+    misses = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def make_key(query, num_results):
+        normalized = normalize_query(query)
+        return hashlib.sha256(f"{num_results}:{normalized}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def enabled():
+        return getattr(settings, 'FACTS_SEARCH_CACHE', True)
+
+    @classmethod
+    def _count(cls, hit):
+        with cls._lock:
+            if hit:
+                cls.hits += 1
+            else:
+                cls.misses += 1
+
+    @classmethod
+    def get(cls, query, num_results):
+        """Returns the cached result dicts for the query, or None on a miss."""
+        if not cls.enabled():
+            return None
+
+        key = cls.make_key(query, num_results)
+        ttl = getattr(settings, 'FACTS_SEARCH_CACHE_TTL', 6 * 60 * 60)
+        now = timezone.now()
+
+        try:
+            entry = SearchCacheEntry.objects.filter(key=key).first()
+            if entry is None:
+                cls._count(hit=False)
+                return None
+
+            if entry.created_at < now - datetime.timedelta(seconds=ttl):
+                entry.delete()
+                cls._count(hit=False)
+                return None
+
+            SearchCacheEntry.objects.filter(pk=entry.pk).update(
+                last_accessed=now, hits=F('hits') + 1
+            )
+            cls._count(hit=True)
+            print(f"DEBUG: Search cache hit for '{query}'")
+            return entry.results
+
+        except Exception as e:
+            print(f"DEBUG: Search cache read failed: {e}")
+            cls._count(hit=False)
+            return None
+
+    @classmethod
+    def set(cls, query, num_results, results):
+        """Stores ranked result dicts ({"url", "title", "snippet"}) and applies LRU eviction."""
+        if not cls.enabled() or not results:
+            return
+
+        now = timezone.now()
+        try:
+            SearchCacheEntry.objects.update_or_create(
+                key=cls.make_key(query, num_results),
+                defaults={
+                    'query': str(query)[:1000],
+                    'results': results,
+                    'created_at': now,
+                    'last_accessed': now,
+                    'hits': 0,
+                },
+            )
+            cls._evict()
+        except Exception as e:
+            print(f"DEBUG: Search cache write failed: {e}")
+
+    @staticmethod
+    def _evict():
+        max_entries = getattr(settings, 'FACTS_SEARCH_CACHE_MAX_ENTRIES', 5000)
+        if SearchCacheEntry.objects.count() <= max_entries:
+            return
+        stale_ids = list(
+            SearchCacheEntry.objects.order_by('-last_accessed').values_list('pk', flat=True)[max_entries:]
+        )
+        SearchCacheEntry.objects.filter(pk__in=stale_ids).delete()
+        print(f"DEBUG: Search cache evicted {len(stale_ids)} entries")
+
+    @classmethod
+    def stats(cls):
+        with cls._lock:
+            hits, misses = cls.hits, cls.misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+        }
+
+
+class ArticleCache:
+    """
+    URL-keyed cache of extracted page text and its summary.
+
+    Entries younger than FACTS_ARTICLE_CACHE_FRESHNESS seconds are used
+    as-is. Older ones keep their ETag/Last-Modified validators so the scraper
+    can revalidate with a conditional GET. The total stored text is capped at
+    FACTS_ARTICLE_CACHE_MAX_BYTES, evicting least recently used pages first.
+    """
+
+    @staticmethod
+    def make_key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def enabled():
+        return getattr(settings, 'FACTS_ARTICLE_CACHE', True)
+
+    @classmethod
+    def get(cls, url):
+        if not cls.enabled():
+            return None
+        try:
+            entry = ArticleCacheEntry.objects.filter(key=cls.make_key(url)).first()
+            if entry is not None:
+                ArticleCacheEntry.objects.filter(pk=entry.pk).update(last_accessed=timezone.now())
+            return entry
+        except Exception as e:
+            print(f"DEBUG: Article cache read failed: {e}")
+            return None
+
+    @staticmethod
+    def is_fresh(entry):
+        freshness = getattr(settings, 'FACTS_ARTICLE_CACHE_FRESHNESS', 60 * 60)
+        return entry.fetched_at >= timezone.now() - datetime.timedelta(seconds=freshness)
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    @staticmethod
+    def revalidated(entry):
+        """Marks an entry fresh again after a 304 Not Modified."""
+        try:
+            ArticleCacheEntry.objects.filter(pk=entry.pk).update(fetched_at=timezone.now())
+        except Exception as e:
+            print(f"DEBUG: Article cache write failed: {e}")
+
+    @staticmethod
+    def set_summary(entry, summary):
+        entry.summary = summary
+        try:
+            ArticleCacheEntry.objects.filter(pk=entry.pk).update(
+                summary=summary,
+                size=len(entry.text.encode('utf-8')) + len(summary.encode('utf-8')),
+            )
+        except Exception as e:
+            print(f"DEBUG: Article cache write failed: {e}")
+
+    @classmethod
+    def store(cls, url, etag, last_modified, text, summary):
+        if not cls.enabled():
+            return
+
+        now = timezone.now()
+        try:
+            ArticleCacheEntry.objects.update_or_create(
+                key=cls.make_key(url),
+                defaults={
+                    'url': url,
+                    'etag': etag[:255],
+                    'last_modified': last_modified[:64],
+                    'text': text,
+                    'summary': summary,
+                    'size': len(text.encode('utf-8')) + len(summary.encode('utf-8')),
+                    'fetched_at': now,
+                    'last_accessed': now,
+                },
+            )
+            cls._evict()
+        except Exception as e:
+            print(f"DEBUG: Article cache write failed: {e}")
+
+    @staticmethod
+    def _evict():
+        max_bytes = getattr(settings, 'FACTS_ARTICLE_CACHE_MAX_BYTES', 200 * 1024 * 1024)
+        total = ArticleCacheEntry.objects.aggregate(total=Sum('size'))['total'] or 0
+        if total <= max_bytes:
+            return
+
+        stale_ids = []
+        for pk, size in ArticleCacheEntry.objects.order_by('last_accessed').values_list('pk', 'size').iterator():
+            if total <= max_bytes:
+                break
+            stale_ids.append(pk)
+            total -= size
+        ArticleCacheEntry.objects.filter(pk__in=stale_ids).delete()
+        print(f"DEBUG: Article cache evicted {len(stale_ids)} pages")
+
+
+class EmbeddingCache:
+    """
+    Sentence embeddings keyed by a hash of the model name and the text.
+
+    The first tier is an in-memory LRU of FACTS_EMBEDDING_CACHE_SIZE vectors.
+    If FACTS_EMBEDDING_CACHE_DIR is set, vectors are also written there as
+    float16 .npy files, which survive restarts and are shared by workers.
+    """
+    _memory = OrderedDict()
+    _lock = threading.Lock()
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def make_key(text, model_name):
+        return hashlib.sha256(f"{model_name}\0{text}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _disk_path(key):
+        cache_dir = getattr(settings, 'FACTS_EMBEDDING_CACHE_DIR', None)
+        if not cache_dir:
+            return None
+        return os.path.join(cache_dir, key[:2], f"{key}.npy")
+
+    @classmethod
+    def get(cls, text, model_name):
+        key = cls.make_key(text, model_name)
+        with cls._lock:
+            vector = cls._memory.get(key)
+            if vector is not None:
+                cls._memory.move_to_end(key)
+                cls.hits += 1
+                return vector
+
+        vector = cls._read_disk(key)
+        with cls._lock:
+            if vector is None:
+                cls.misses += 1
+                return None
+            cls.hits += 1
+        cls._remember(key, vector)
+        return vector
+
+    @classmethod
+    def put(cls, text, model_name, vector):
+        key = cls.make_key(text, model_name)
+        vector = np.asarray(vector, dtype=np.float32)
+        cls._remember(key, vector)
+        cls._write_disk(key, vector)
+
+    @classmethod
+    def _remember(cls, key, vector):
+        max_size = getattr(settings, 'FACTS_EMBEDDING_CACHE_SIZE', 4096)
+        with cls._lock:
+            cls._memory[key] = vector
+            cls._memory.move_to_end(key)
+            while len(cls._memory) > max_size:
+                cls._memory.popitem(last=False)
+
+    @classmethod
+    def _read_disk(cls, key):
+        path = cls._disk_path(key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            return np.load(path).astype(np.float32)
+        except Exception as e:
+            print(f"DEBUG: Embedding cache read failed: {e}")
+            return None
+
+    @classmethod
+    def _write_disk(cls, key, vector):
+        path = cls._disk_path(key)
+        if path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, vector.astype(np.float16))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"DEBUG: Embedding cache write failed: {e}")
+
+    @classmethod
+    def stats(cls):
+        with cls._lock:
+            hits, misses, size = cls.hits, cls.misses, len(cls._memory)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+            'size': size,
+        }
+
+
+class VerdictCache:
+    """
+    Previously verified claims, looked up by cosine similarity of the claim
+    embeddings so rewordings of the same claim share a verdict.
+
+    A match needs a similarity of at least FACTS_VERDICT_CACHE_THRESHOLD and
+    an entry younger than FACTS_VERDICT_CACHE_TTL seconds. Only the newest
+    FACTS_VERDICT_CACHE_MAX_CANDIDATES entries are compared. Storing the same
+    normalized claim again replaces its entry; expired entries are deleted
+    and at most FACTS_VERDICT_CACHE_MAX_ENTRIES are kept, newest first.
+    """
+    hits = 0
+    misses = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def make_key(claim, model_name):
+        return hashlib.sha256(f"{model_name}\0{normalize_query(claim)}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def enabled():
+        return getattr(settings, 'FACTS_VERDICT_CACHE', True)
+
+    @classmethod
+    def _count(cls, hit):
+        with cls._lock:
+            if hit:
+                cls.hits += 1
+            else:
+                cls.misses += 1
+
+    @classmethod
+    def lookup(cls, embedding, model_name):
+        """Returns the closest fresh entry as a dict (with its similarity), or None."""
+        if not cls.enabled():
+            return None
+
+        threshold = getattr(settings, 'FACTS_VERDICT_CACHE_THRESHOLD', 0.9)
+        ttl = getattr(settings, 'FACTS_VERDICT_CACHE_TTL', 24 * 60 * 60)
+        max_candidates = getattr(settings, 'FACTS_VERDICT_CACHE_MAX_CANDIDATES', 2000)
+
+        try:
+            candidates = list(
+                VerdictCacheEntry.objects
+                .filter(model_name=model_name, created_at__gte=timezone.now() - datetime.timedelta(seconds=ttl))
+                .order_by('-created_at')[:max_candidates]
+            )
+            if not candidates:
+                cls._count(hit=False)
+                return None
+
+            matrix = np.vstack([np.frombuffer(bytes(c.embedding), dtype=np.float32) for c in candidates])
+            query = np.asarray(embedding, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+            similarities = matrix @ query / np.where(norms == 0, 1, norms)
+
+            best = int(np.argmax(similarities))
+            if similarities[best] < threshold:
+                cls._count(hit=False)
+                return None
+
+            entry = candidates[best]
+            cls._count(hit=True)
+            print(f"DEBUG: Verdict cache hit ({similarities[best]:.3f}) with '{entry.claim}'")
+            return {
+                'claim': entry.claim,
+                'similarity': float(similarities[best]),
+                'verdict': entry.verdict,
+                'sources': entry.sources,
+                'scores': entry.scores,
+                'image_url': entry.image_url,
+            }
+
+        except Exception as e:
+            print(f"DEBUG: Verdict cache read failed: {e}")
+            cls._count(hit=False)
+            return None
+
+    @classmethod
+    def store(cls, claim, embedding, model_name, verdict, sources, scores, image_url=''):
+        if not cls.enabled():
+            return
+        try:
+            VerdictCacheEntry.objects.update_or_create(
+                key=cls.make_key(claim, model_name),
+                defaults={
+                    'claim': str(claim)[:10000],
+                    'model_name': model_name,
+                    'embedding': np.asarray(embedding, dtype=np.float32).tobytes(),
+                    'verdict': verdict,
+                    'sources': list(sources),
+                    'scores': [float(x) for x in scores],
+                    'image_url': image_url or '',
+                    'created_at': timezone.now(),
+                },
+            )
+            cls._evict()
+        except Exception as e:
+            print(f"DEBUG: Verdict cache write failed: {e}")
+
+    @staticmethod
+    def _evict():
+        ttl = getattr(settings, 'FACTS_VERDICT_CACHE_TTL', 24 * 60 * 60)
+        expired, _ = VerdictCacheEntry.objects.filter(
+            created_at__lt=timezone.now() - datetime.timedelta(seconds=ttl)).delete()
+
+        max_entries = getattr(settings, 'FACTS_VERDICT_CACHE_MAX_ENTRIES', 5000)
+        stale_ids = []
+        if VerdictCacheEntry.objects.count() > max_entries:
+            stale_ids = list(
+                VerdictCacheEntry.objects.order_by('-created_at').values_list('pk', flat=True)[max_entries:]
+            )
+            VerdictCacheEntry.objects.filter(pk__in=stale_ids).delete()
+        if expired or stale_ids:
+            print(f"DEBUG: Verdict cache evicted {expired} expired and {len(stale_ids)} old entries")
+
+    @classmethod
+    def stats(cls):
+        with cls._lock:
+            hits, misses = cls.hits, cls.misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+        }
@@ -0,0 +1,241 @@
+"""
+Sentence encoder backends used by encode_texts.
+
+FACTS_ENCODER_BACKEND selects one of:
+    "torch"      SentenceTransformer on PyTorch (default)
+    "onnx"       the same transformer exported to ONNX, run with ONNX Runtime
+    "onnx-int8"  that export with dynamically quantized int8 weights
+
+The ONNX backends load from FACTS_ENCODER_PATH, which
+`python manage.py export_encoder` fills in. They reproduce the
+SentenceTransformer head (pooling and optional L2 normalization) in numpy,
+using the settings recorded at export time.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from . import metrics
+
+BACKENDS = ('torch', 'onnx', 'onnx-int8')
+ONNX_FILES = {'onnx': 'model.onnx', 'onnx-int8': 'model-int8.onnx'}
+CONFIG_FILE = 'encoder_config.json'
+
+
+class TorchEncoder:
+    backend = 'torch'
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device='cpu')
+
+    def encode(self, texts, batch_size=32):
+        return np.asarray(self.model.encode(list(texts), batch_size=batch_size), dtype=np.float32)
+
+
+class OnnxEncoder:
+    def __init__(self, path, backend='onnx', threads=0):
+        # Imported here so processes on the torch backend never load ONNX Runtime
+        try:
+            import onnxruntime
+        except ImportError:
+            raise ImportError("onnxruntime is not installed (pip install -r requirements-onnx.txt)")
+        from transformers import AutoTokenizer
+
+        self.backend = backend
+        with open(os.path.join(path, CONFIG_FILE)) as f:
+            self.config = json.load(f)
+        self.tokenizer = AutoTokenizer.from_pretrained(path)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(path, ONNX_FILES[backend]), options, providers=['CPUExecutionProvider'])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def encode(self, texts, batch_size=32):
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.config['dimension']), dtype=np.float32)
+
+        # Longest first, so each batch pads to similar lengths
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        embeddings = np.empty((len(texts), self.config['dimension']), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            batch = order[start:start + batch_size]
+            tokens = self.tokenizer(
+                [texts[i] for i in batch], padding=True, truncation=True,
+                max_length=self.config['max_seq_length'], return_tensors='np')
+            feeds = {name: tokens[name].astype(np.int64) for name in self.input_names}
+            hidden = self.session.run(None, feeds)[0]
+            embeddings[batch] = self._pool(hidden, tokens['attention_mask'])
+        return embeddings
+
+    def _pool(self, hidden, attention_mask):
+        mask = attention_mask[..., None].astype(np.float32)
+        pooling = self.config['pooling']
+        if pooling == 'cls':
+            pooled = hidden[:, 0]
+        elif pooling == 'max':
+            pooled = np.where(mask > 0, hidden, -1e9).max(axis=1)
+        else:
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.config['normalize']:
+            norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+            pooled = pooled / np.clip(norms, 1e-12, None)
+        return pooled.astype(np.float32)
+
+
+class EncodeBatcher:
+    """
+    Coalesces encode calls from concurrent threads into shared forward passes.
+
+    The first waiting request opens a batch window of `max_wait` seconds; the
+    batch runs when the window closes or `max_batch` texts are queued. Texts
+    repeated across callers are encoded once, and the encoders sort by length
+    before padding. Each caller blocks until its own rows are back.
+    """
+
+    def __init__(self, encoder, max_batch=64, max_wait=0.005):
+        self.encoder = encoder
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending = []
+        self._changed = threading.Condition()
+        self._worker = None
+        self._worker_pid = None
+
+    def encode(self, texts):
+        texts = list(texts)
+        if not texts:
+            return self.encoder.encode(texts)
+        future = Future()
+        with self._changed:
+            self._ensure_worker()
+            self._pending.append((texts, future, time.monotonic()))
+            self._changed.notify_all()
+        return future.result()
+
+    def _ensure_worker(self):
+        # Threads don't survive a fork; a preloaded batcher needs a new one per worker
+        if self._worker is None or self._worker_pid != os.getpid() or not self._worker.is_alive():
+            self._worker_pid = os.getpid()
+            self._worker = threading.Thread(target=self._run, name='encode-batcher', daemon=True)
+            self._worker.start()
+
+    def _next_batch(self):
+        with self._changed:
+            while not self._pending:
+                self._changed.wait()
+            deadline = self._pending[0][2] + self.max_wait
+            while sum(len(texts) for texts, _, _ in self._pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+
+            # Whole requests only; one bigger than max_batch runs on its own
+            batch, size = [], 0
+            while self._pending and (not batch or size + len(self._pending[0][0]) <= self.max_batch):
+                texts, future, _ = self._pending.pop(0)
+                batch.append((texts, future))
+                size += len(texts)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            unique_texts = list(dict.fromkeys(text for texts, _ in batch for text in texts))
+            try:
+                encoded = self.encoder.encode(unique_texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            metrics.ENCODE_BATCH_TEXTS.observe(len(unique_texts))
+            metrics.ENCODE_BATCH_REQUESTS.observe(len(batch))
+            rows = {text: i for i, text in enumerate(unique_texts)}
+            for texts, future in batch:
+                future.set_result(encoded[[rows[text] for text in texts]])
+
+
+def load_encoder(backend, model_name, path, threads=0):
+    """Builds the encoder for `backend`. ONNX backends need an export in `path`."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown encoder backend {backend!r}, expected one of {BACKENDS}")
+    if backend == 'torch':
+        return TorchEncoder(model_name)
+    encoder = OnnxEncoder(path, backend, threads)
+    if encoder.config['model_name'] != model_name:
+        raise ValueError(f"{path} holds an export of {encoder.config['model_name']}, not {model_name}")
+    return encoder
+
+
+def export_encoder(model_name, path, quantize=True):
+    """
+    Exports `model_name`'s transformer to `path`/model.onnx together with its
+    tokenizer and head settings, plus an int8 copy when `quantize` is set.
+    Needs torch (via sentence-transformers), and onnx for quantization.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize, Pooling
+
+    model = SentenceTransformer(model_name, device='cpu')
+    model.eval()
+    transformer = model[0].auto_model
+    tokenizer = model.tokenizer
+    pooling = next((m for m in model if isinstance(m, Pooling)), None)
+    pooling_mode = pooling.get_pooling_mode_str() if pooling is not None else 'mean'
+    if pooling_mode not in ('cls', 'max', 'mean'):
+        raise ValueError(f"Pooling mode {pooling_mode!r} of {model_name} is not supported by the ONNX backend")
+
+    os.makedirs(path, exist_ok=True)
+    sample = tokenizer(["TruthLens export sample sentence."], return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in sample]
+
+    class HiddenStates(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, *inputs):
+            return self.transformer(**dict(zip(input_names, inputs)))[0]
+
+    onnx_path = os.path.join(path, ONNX_FILES['onnx'])
+    axes = {0: 'batch', 1: 'sequence'}
+    with torch.no_grad():
+        torch.onnx.export(
+            HiddenStates(),
+            tuple(sample[name] for name in input_names),
+            onnx_path,
+            input_names=input_names,
+            output_names=['last_hidden_state'],
+            dynamic_axes={name: axes for name in input_names + ['last_hidden_state']},
+            opset_version=14,
+            do_constant_folding=True,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(onnx_path, os.path.join(path, ONNX_FILES['onnx-int8']), weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(path)
+    config = {
+        'model_name': model_name,
+        'dimension': model.get_sentence_embedding_dimension(),
+        'max_seq_length': model.max_seq_length,
+        'pooling': pooling_mode,
+        'normalize': any(isinstance(m, Normalize) for m in model),
+    }
+    with open(os.path.join(path, CONFIG_FILE), 'w') as f:
+        json.dump(config, f, indent=2)
+    return config
@@ -0,0 +1,305 @@
+"""
+Per-host health, circuit breaking and politeness for the scraper.
+
+HostRegistry remembers, per host, how fetches went: latency, status codes
+and timeouts. After FACTS_HOST_FAILURE_THRESHOLD failures in a row (timeouts,
+connection errors, 403, 429, 5xx) the host's circuit opens and its URLs are
+skipped for FACTS_HOST_COOLDOWN seconds (or a 429's Retry-After). After the
+cool-down one probe request is let through, and its outcome closes or reopens
+the circuit.
+
+robots.txt is fetched once per host, with the scraper's own headers, and
+cached for FACTS_ROBOTS_TTL seconds. As RFC 9309 says, a robots.txt that
+can't be had (4xx, 5xx, unreachable) allows everything.
+Requests to one host start at least FACTS_HOST_MIN_INTERVAL seconds apart, or
+the robots.txt Crawl-delay if that is longer. A fetch whose turn would come
+after its deadline is skipped ("paced") without booking the slot.
+
+The registry also holds each host's FACTS_FETCH_PER_HOST_LIMIT semaphore, so
+it is dropped together with the host's entry. Like the job queue, the registry
+lives in the worker process, shared by all its requests.
+"""
+import asyncio
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+from django.conf import settings
+
+from . import metrics
+
+FAILURE_STATUSES = {403, 429}
+
+
+class SlotUnavailable(Exception):
+    """A request to a host can't start before its deadline, or its fetch was stopped."""
+
+
+class HostHealth:
+    def __init__(self, host):
+        self.host = host
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.timeouts = 0
+        self.statuses = {}
+        self.latency = None
+        self.open_until = 0.0
+        self.probe_started = 0.0
+        self.next_slot = 0.0
+        self.robots = None
+        self.robots_fetched = 0.0
+        self.robots_lock = threading.Lock()
+        self.semaphore = threading.BoundedSemaphore(getattr(settings, 'FACTS_FETCH_PER_HOST_LIMIT', 2))
+        # asyncio semaphores belong to one event loop
+        self.async_semaphores = weakref.WeakKeyDictionary()
+
+    def snapshot(self):
+        return {
+            "host": self.host,
+            "requests": self.requests,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "statuses": dict(self.statuses),
+            "latency": self.latency,
+            "circuit_open": self.open_until > time.time(),
+        }
+
+
+class HostRegistry:
+    _hosts = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url):
+        return urlparse(url).netloc.lower()
+
+    @classmethod
+    def _get(cls, host):
+        with cls._lock:
+            health = cls._hosts.get(host)
+            if health is None:
+                health = cls._hosts[host] = HostHealth(host)
+                max_hosts = getattr(settings, 'FACTS_HOST_REGISTRY_SIZE', 2000)
+                while len(cls._hosts) > max_hosts:
+                    cls._hosts.popitem(last=False)
+            else:
+                cls._hosts.move_to_end(host)
+            return health
+
+    @classmethod
+    def check(cls, url, headers=None):
+        """
+        Returns None when `url` may be fetched now, or the reason to skip it
+        ("circuit_open" or "robots"). May fetch the host's robots.txt, sending
+        `headers` (the page request's headers).
+        """
+        health = cls._get(cls.host_of(url))
+        reason = cls._admit(health)
+        if reason is None and getattr(settings, 'FACTS_RESPECT_ROBOTS', True):
+            reason = cls._robots_verdict(health, url, cls._robots(health, url, headers))
+        return reason
+
+    @classmethod
+    async def acheck(cls, url, headers=None):
+        """Async check(): robots.txt is fetched with the event loop's httpx client."""
+        health = cls._get(cls.host_of(url))
+        reason = cls._admit(health)
+        if reason is None and getattr(settings, 'FACTS_RESPECT_ROBOTS', True):
+            # No lock across the await: two first requests to a host may both fetch robots.txt
+            if not cls._robots_fresh(health):
+                health.robots = await cls._afetch_robots(health, url, headers)
+                health.robots_fetched = time.time()
+            reason = cls._robots_verdict(health, url, health.robots)
+        return reason
+
+    @classmethod
+    def _admit(cls, health):
+        """"circuit_open" while the host's circuit is open, else None."""
+        now = time.time()
+        # A probe that never reported back (cancelled, crashed) doesn't block the host forever
+        probe_timeout = 2 * getattr(settings, 'FACTS_FETCH_TIMEOUT', 5)
+        with cls._lock:
+            reason = None
+            if health.open_until:
+                if now < health.open_until or now - health.probe_started < probe_timeout:
+                    reason = "circuit_open"
+                else:
+                    # Cool-down over: this request is the half-open probe
+                    health.probe_started = now
+        if reason:
+            metrics.HOST_SKIPS.inc(reason=reason)
+        return reason
+
+    @classmethod
+    def _robots_verdict(cls, health, url, robots):
+        """"robots" when `robots` disallows `url`, else None."""
+        agent = getattr(settings, 'FACTS_ROBOTS_USER_AGENT', 'TruthLens')
+        if robots is not None and not robots.can_fetch(agent, url):
+            with cls._lock:
+                health.probe_started = 0.0
+            metrics.HOST_SKIPS.inc(reason="robots")
+            return "robots"
+        return None
+
+    @classmethod
+    def _robots(cls, health, url, headers=None):
+        with health.robots_lock:
+            if cls._robots_fresh(health):
+                return health.robots
+
+            from .services import FactCheckerService, get_http_session
+
+            robots_url = robots_url_for(url)
+            robots = None
+            try:
+                # Browser headers: many CDNs answer the python-requests User-Agent with 403
+                response = get_http_session().get(
+                    robots_url, headers=headers or FactCheckerService._build_headers(),
+                    timeout=getattr(settings, 'FACTS_ROBOTS_TIMEOUT', 3))
+                robots = parse_robots(robots_url, response.status_code, response.text)
+            except Exception as e:
+                # Unreachable robots.txt: don't block the host on it
+                print(f"DEBUG: robots.txt fetch failed for {health.host}: {e}")
+            health.robots = robots
+            health.robots_fetched = time.time()
+            return robots
+
+    @staticmethod
+    async def _afetch_robots(health, url, headers=None):
+        from .services import FactCheckerService, get_async_http_client
+
+        robots_url = robots_url_for(url)
+        try:
+            response = await get_async_http_client().get(
+                robots_url, headers=headers or FactCheckerService._build_headers(),
+                timeout=getattr(settings, 'FACTS_ROBOTS_TIMEOUT', 3))
+            return parse_robots(robots_url, response.status_code, response.text)
+        except Exception as e:
+            print(f"DEBUG: robots.txt fetch failed for {health.host}: {e}")
+            return None
+
+    @staticmethod
+    def _robots_fresh(health):
+        ttl = getattr(settings, 'FACTS_ROBOTS_TTL', 24 * 60 * 60)
+        return bool(health.robots_fetched) and time.time() - health.robots_fetched < ttl
+
+    @classmethod
+    def semaphore(cls, url):
+        """The semaphore limiting parallel requests to the host of `url`."""
+        return cls._get(cls.host_of(url)).semaphore
+
+    @classmethod
+    def async_semaphore(cls, url):
+        """semaphore() for the running event loop."""
+        health = cls._get(cls.host_of(url))
+        loop = asyncio.get_running_loop()
+        with cls._lock:
+            semaphore = health.async_semaphores.get(loop)
+            if semaphore is None:
+                limit = getattr(settings, 'FACTS_FETCH_PER_HOST_LIMIT', 2)
+                semaphore = health.async_semaphores[loop] = asyncio.Semaphore(limit)
+            return semaphore
+
+    @classmethod
+    def reserve_slot(cls, url, budget=None):
+        """
+        Books the host's next request slot and returns how many seconds to wait
+        for it. None, without booking, when the wait would exceed `budget` seconds.
+        """
+        health = cls._get(cls.host_of(url))
+        interval = getattr(settings, 'FACTS_HOST_MIN_INTERVAL', 0.5)
+        if health.robots is not None:
+            crawl_delay = health.robots.crawl_delay(getattr(settings, 'FACTS_ROBOTS_USER_AGENT', 'TruthLens'))
+            if crawl_delay:
+                interval = max(interval, float(crawl_delay))
+        with cls._lock:
+            now = time.monotonic()
+            start = max(now, health.next_slot)
+            if budget is not None and start - now > budget:
+                start = None
+            else:
+                health.next_slot = start + interval
+        if start is None:
+            metrics.HOST_SKIPS.inc(reason="paced")
+            return None
+        return start - now
+
+    @classmethod
+    def record(cls, url, status_code, latency, retry_after=None):
+        """Records a completed request."""
+        failed = status_code in FAILURE_STATUSES or status_code >= 500
+        cls._update(url, latency, failed, status=status_code, retry_after=retry_after)
+
+    @classmethod
+    def record_error(cls, url, latency, timeout=False):
+        """Records a request that failed without a response (timeout, connection error)."""
+        cls._update(url, latency, True, timeout=timeout)
+
+    @classmethod
+    def _update(cls, url, latency, failed, status=None, timeout=False, retry_after=None):
+        health = cls._get(cls.host_of(url))
+        threshold = getattr(settings, 'FACTS_HOST_FAILURE_THRESHOLD', 3)
+        cooldown = getattr(settings, 'FACTS_HOST_COOLDOWN', 5 * 60)
+        with cls._lock:
+            health.requests += 1
+            if status is not None:
+                health.statuses[status] = health.statuses.get(status, 0) + 1
+            if timeout:
+                health.timeouts += 1
+            # Exponentially weighted, so a host that got slow shows up quickly
+            health.latency = latency if health.latency is None else 0.8 * health.latency + 0.2 * latency
+
+            was_probe = bool(health.probe_started)
+            health.probe_started = 0.0
+            if not failed:
+                health.consecutive_failures = 0
+                health.open_until = 0.0
+                return
+
+            health.failures += 1
+            health.consecutive_failures += 1
+            if was_probe or health.consecutive_failures >= threshold or retry_after:
+                health.open_until = time.time() + max(cooldown, retry_after or 0)
+                print(f"DEBUG: Circuit open for {health.host} "
+                      f"({health.consecutive_failures} failures, last {status or ('timeout' if timeout else 'error')})")
+
+    @classmethod
+    def open_circuits(cls):
+        now = time.time()
+        with cls._lock:
+            return sum(1 for health in cls._hosts.values() if health.open_until > now)
+
+    @classmethod
+    def snapshot(cls):
+        with cls._lock:
+            return [health.snapshot() for health in cls._hosts.values()]
+
+
+def robots_url_for(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+
+
+def parse_robots(robots_url, status_code, text):
+    """
+    The RobotFileParser for a robots.txt response, or None (allow everything)
+    unless it came back 200. Unlike RobotFileParser.read(), 401/403 don't
+    disallow the whole host: RFC 9309 treats every 4xx as "unavailable".
+    """
+    if status_code != 200:
+        return None
+    robots = RobotFileParser(robots_url)
+    robots.parse(text.splitlines())
+    return robots
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header given in seconds; HTTP dates are ignored."""
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,122 @@
+"""
+Shared inference server: one process holds the sentence model and spaCy and
+serves every web worker over a Unix socket, so adding workers doesn't add
+model copies.
+
+    FACTS_INFERENCE_SOCKET=/tmp/truthlens.sock python manage.py run_inference_server
+    FACTS_INFERENCE_SOCKET=/tmp/truthlens.sock gunicorn news_guardian.wsgi:application
+
+With FACTS_INFERENCE_SOCKET set, get_sentence_model() in the web workers
+returns an InferenceClient (same encode() as the in-process model) and keyword
+extraction goes through the server too. Messages are pickled by
+multiprocessing.connection and the handshake is authenticated with
+FACTS_INFERENCE_AUTHKEY, so only processes holding the key can connect.
+"""
+import os
+import threading
+from multiprocessing.connection import AuthenticationError, Client, Listener
+
+
+class InferenceServer:
+    """Accepts client connections and answers (op, payload) requests, one thread per connection."""
+
+    def __init__(self, address, authkey, handlers):
+        self.address = address
+        self.authkey = authkey
+        self.handlers = handlers
+
+    def serve_forever(self):
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+        listener = Listener(self.address, family='AF_UNIX', authkey=self.authkey)
+        os.chmod(self.address, 0o600)
+        print(f"DEBUG: Inference server listening on {self.address}")
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except (AuthenticationError, OSError) as e:
+                    print(f"DEBUG: Inference connection rejected: {e}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            listener.close()
+
+    def _serve_connection(self, conn):
+        with conn:
+            while True:
+                try:
+                    op, payload = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    handler = self.handlers.get(op)
+                    if handler is None:
+                        raise ValueError(f"Unknown operation {op!r}")
+                    reply = ('ok', handler(payload))
+                except Exception as e:
+                    reply = ('error', f"{type(e).__name__}: {e}")
+                try:
+                    conn.send(reply)
+                except OSError:
+                    return
+
+
+class InferenceClient:
+    """
+    Client for InferenceServer. encode() matches the in-process encoders, so it
+    can stand in for get_sentence_model(). Each thread keeps its own connection.
+    """
+    backend = 'remote'
+
+    def __init__(self, address, authkey, timeout=60):
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        # threading.local survives a fork: a connection the preloading master
+        # opened would be shared by the main thread of every worker
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._local.conn = Client(self.address, family='AF_UNIX', authkey=self.authkey)
+            self._local.pid = os.getpid()
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def call(self, op, payload=None):
+        # Every operation is idempotent, so a broken connection is retried once on a fresh one
+        for attempt in (1, 2):
+            try:
+                conn = self._connection()
+                conn.send((op, payload))
+                if not conn.poll(self.timeout):
+                    self._drop_connection()
+                    raise TimeoutError(f"Inference server did not answer {op!r} within {self.timeout}s")
+                status, result = conn.recv()
+                break
+            except (EOFError, OSError) as e:
+                self._drop_connection()
+                if attempt == 2 or isinstance(e, TimeoutError):
+                    raise ConnectionError(f"Inference server at {self.address} unavailable: {e}") from e
+        if status == 'error':
+            raise RuntimeError(f"Inference server: {result}")
+        return result
+
+    def encode(self, texts, batch_size=32):
+        return self.call('encode', list(texts))
+
+    def keywords(self, text):
+        return self.call('keywords', text)
+
+    def ping(self):
+        return self.call('ping')
@@ -0,0 +1,192 @@
+import datetime
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count
+from django.utils import timezone
+
+from . import metrics
+from .models import VerificationJobEntry, VerificationJobEvent
+from .services import FactCheckerService
+
+FINISHED = ("done", "failed")
+
+# Notified on every job write in this process, so local readers wake at once;
+# writes from other workers are picked up every FACTS_JOB_POLL_INTERVAL seconds
+_changed = threading.Condition()
+
+
+def _notify():
+    with _changed:
+        _changed.notify_all()
+
+
+class VerificationJob:
+    """
+    One claim being verified in the background.
+
+    State and progress events live in the database (VerificationJobEntry,
+    VerificationJobEvent), so the status and event stream can be served by
+    any worker, not only the one running the job. Events from
+    FactCheckerService.verify_claim are numbered in order from 0.
+    """
+
+    def __init__(self, entry):
+        self.id = entry.id
+        self.claim = entry.claim
+        self.status = entry.status
+        self.result = entry.result
+        self.error = entry.error
+        # Writer side only: verify_claim reports from several threads
+        self._lock = threading.Lock()
+        self._next_seq = 0
+
+    @classmethod
+    def create(cls, claim):
+        now = timezone.now()
+        return cls(VerificationJobEntry.objects.create(
+            id=uuid.uuid4().hex, claim=claim, status="queued", created_at=now, updated_at=now))
+
+    @property
+    def finished(self):
+        return self.status in FINISHED
+
+    def add_event(self, stage, data):
+        try:
+            with self._lock:
+                VerificationJobEvent.objects.create(job_id=self.id, seq=self._next_seq, stage=stage, data=data)
+                self._next_seq += 1
+                VerificationJobEntry.objects.filter(pk=self.id).update(updated_at=timezone.now())
+        except Exception as e:
+            # A lost progress event mustn't fail the verification
+            print(f"DEBUG: Job event write failed for {self.id}: {e}")
+        _notify()
+
+    def set_status(self, status, result=None, error=None):
+        self.status, self.result, self.error = status, result, error or ''
+        VerificationJobEntry.objects.filter(pk=self.id).update(
+            status=status, result=result, error=self.error, updated_at=timezone.now())
+        _notify()
+
+    def refresh(self):
+        entry = VerificationJobEntry.objects.filter(pk=self.id).values('status', 'result', 'error').first()
+        if entry is not None:
+            self.status, self.result, self.error = entry['status'], entry['result'], entry['error']
+
+    def events(self, after=0):
+        return [{"seq": seq, "stage": stage, "data": data} for seq, stage, data in
+                VerificationJobEvent.objects.filter(job_id=self.id, seq__gte=after)
+                .values_list('seq', 'stage', 'data')]
+
+    def wait_for_events(self, after, timeout):
+        """
+        Returns the events numbered `after` and up, waiting up to `timeout`
+        seconds for one. The status is refreshed before the events are read,
+        so once `finished` is true the returned events are the last ones.
+        """
+        poll = getattr(settings, 'FACTS_JOB_POLL_INTERVAL', 0.5)
+        give_up = time.monotonic() + timeout
+        while True:
+            self.refresh()
+            events = self.events(after)
+            remaining = give_up - time.monotonic()
+            if events or self.finished or remaining <= 0:
+                return events
+            with _changed:
+                _changed.wait(min(poll, remaining))
+
+    def snapshot(self):
+        """Current state, including the partial results reported so far."""
+        self.refresh()
+        events = self.events()
+        urls = []
+        scored = []
+        for event in events:
+            if event["stage"] == "urls_found":
+                urls = event["data"]["urls"]
+            elif event["stage"] == "source_scored":
+                scored.append(event["data"])
+        return {
+            "job_id": self.id,
+            "claim": self.claim,
+            "status": self.status,
+            "stage": events[-1]["stage"] if events else None,
+            "urls": urls,
+            "scored_sources": scored,
+            "result": self.result,
+            "error": self.error or None,
+        }
+
+
+class JobQueue:
+    """
+    Bounded pool running verification jobs.
+
+    Each worker process runs the jobs it accepted on FACTS_JOB_WORKERS
+    threads; their state is in the database, shared by all workers. At most
+    FACTS_JOB_MAX_PENDING jobs may be queued or running across workers;
+    submit() returns None beyond that. Finished jobs are deleted after
+    FACTS_JOB_TTL seconds, and unfinished ones that haven't moved for
+    FACTS_JOB_TIMEOUT seconds (their worker died) are marked failed.
+    """
+    _executor = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_executor(cls):
+        if cls._executor is None:
+            workers = getattr(settings, 'FACTS_JOB_WORKERS', 2)
+            cls._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='verify-job')
+        return cls._executor
+
+    @classmethod
+    def submit(cls, claim):
+        max_pending = getattr(settings, 'FACTS_JOB_MAX_PENDING', 20)
+        with cls._lock:
+            cls._purge()
+            if VerificationJobEntry.objects.exclude(status__in=FINISHED).count() >= max_pending:
+                return None
+            job = VerificationJob.create(claim)
+            cls._get_executor().submit(cls._run, job)
+        print(f"DEBUG: Queued verification job {job.id}")
+        return job
+
+    @staticmethod
+    def get(job_id):
+        entry = VerificationJobEntry.objects.filter(pk=job_id).first()
+        return None if entry is None else VerificationJob(entry)
+
+    @staticmethod
+    def counts():
+        return {row['status']: row['count'] for row in
+                VerificationJobEntry.objects.values('status').annotate(count=Count('pk'))}
+
+    @staticmethod
+    def _purge():
+        now = timezone.now()
+        ttl = getattr(settings, 'FACTS_JOB_TTL', 60 * 60)
+        timeout = getattr(settings, 'FACTS_JOB_TIMEOUT', 15 * 60)
+        VerificationJobEntry.objects.filter(
+            status__in=FINISHED, updated_at__lt=now - datetime.timedelta(seconds=ttl)).delete()
+        lost = VerificationJobEntry.objects.exclude(status__in=FINISHED).filter(
+            updated_at__lt=now - datetime.timedelta(seconds=timeout)).update(
+            status="failed", error="Job lost: its worker stopped", updated_at=now)
+        if lost:
+            print(f"DEBUG: Marked {lost} lost verification jobs failed")
+
+    @staticmethod
+    def _run(job):
+        job.set_status("running")
+        try:
+            with metrics.REQUESTS_IN_FLIGHT.track_in_progress(endpoint='verify_job'):
+                result = FactCheckerService.verify_claim(job.claim, on_event=job.add_event)
+            job.set_status("done", result=result)
+        except Exception as e:
+            print(f"DEBUG: Verification job {job.id} failed: {e}")
+            job.set_status("failed", error=str(e))
+        finally:
+            connections.close_all()
@@ -0,0 +1,167 @@
+"""
+Local index of labeled headlines from the bundled FakeNewsNet datasets
+(dataset/politifact_*.csv, dataset/gossipcop_*.csv).
+
+`python manage.py build_known_claims` streams the CSVs in chunks, encodes the
+titles with the project's sentence model and writes FACTS_KNOWN_CLAIMS_PATH:
+
+    vectors.npy   (n, dim) float16, L2-normalized title embeddings
+    claims.json   model, dimension and one [title, label, dataset, url] row per vector
+
+At request time KnownClaimsIndex.search() is a single matrix-vector product
+over the whole index, so the nearest labeled headlines come back in
+milliseconds, without touching the network.
+"""
+import json
+import os
+import threading
+
+import numpy as np
+
+VECTORS_FILE = 'vectors.npy'
+CLAIMS_FILE = 'claims.json'
+
+# File name -> (dataset, label)
+DATASETS = {
+    'politifact_fake.csv': ('politifact', 'fake'),
+    'politifact_real.csv': ('politifact', 'real'),
+    'gossipcop_fake.csv': ('gossipcop', 'fake'),
+    'gossipcop_real.csv': ('gossipcop', 'real'),
+}
+
+_index = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class KnownClaimsIndex:
+    def __init__(self, vectors, claims, model):
+        # Stored as float16 to halve the file; searched in float32, which numpy multiplies with BLAS
+        self.vectors = np.asarray(vectors, dtype=np.float32)
+        self.claims = claims
+        self.model = model
+
+    def __len__(self):
+        return len(self.claims)
+
+    @classmethod
+    def load(cls, path):
+        with open(os.path.join(path, CLAIMS_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        vectors = np.load(os.path.join(path, VECTORS_FILE))
+        if vectors.shape != (len(meta['claims']), meta['dimension']):
+            raise ValueError(f"{path}: {vectors.shape} vectors for {len(meta['claims'])} claims")
+        return cls(vectors, meta['claims'], meta['model'])
+
+    def search(self, embedding, k=5):
+        """The k headlines closest to `embedding` (cosine similarity), best first."""
+        if not len(self.claims):
+            return []
+        scores = self.vectors @ _normalize(embedding)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        matches = []
+        for i in top:
+            title, label, dataset, url = self.claims[i]
+            matches.append({
+                "title": title,
+                "label": label,
+                "dataset": dataset,
+                "url": url,
+                "score": float(scores[i]),
+            })
+        return matches
+
+
+def build(dataset_dir, path, encode, model, chunksize=5000, batch_size=256, log=print):
+    """
+    Encodes every title in the dataset CSVs and writes the index to `path`.
+    encode(texts) must return one embedding per text. Titles are read
+    `chunksize` rows at a time and encoded `batch_size` at a time, so memory
+    stays flat apart from the float16 vectors themselves. Returns the number
+    of headlines indexed.
+    """
+    import pandas as pd
+
+    claims = []
+    chunks = []
+    seen = set()
+    for filename, (dataset, label) in DATASETS.items():
+        csv_path = os.path.join(dataset_dir, filename)
+        if not os.path.exists(csv_path):
+            log(f"Skipping missing {csv_path}")
+            continue
+        with open(csv_path, encoding='utf-8', errors='replace') as f:
+            if f.readline().startswith('version https://git-lfs'):
+                log(f"Skipping {csv_path}: Git LFS pointer, run `git lfs pull` first")
+                continue
+
+        count = 0
+        for frame in pd.read_csv(csv_path, usecols=['title', 'news_url'], chunksize=chunksize,
+                                 dtype=str, keep_default_na=False):
+            rows = []
+            for title, url in zip(frame['title'], frame['news_url']):
+                title = ' '.join(title.split())
+                # The same story is often listed more than once
+                if not title or (title.lower(), label) in seen:
+                    continue
+                seen.add((title.lower(), label))
+                if url and not url.startswith(('http://', 'https://')):
+                    url = 'https://' + url
+                rows.append([title, label, dataset, url])
+
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                chunks.append(_normalize(encode([row[0] for row in batch])).astype(np.float16))
+                claims.extend(batch)
+            count += len(rows)
+        log(f"{filename}: {count} headlines")
+
+    if not claims:
+        raise ValueError(f"No headlines found in {dataset_dir}")
+
+    vectors = np.vstack(chunks)
+    os.makedirs(path, exist_ok=True)
+    # Vectors before metadata: a reader that sees the new claims.json also gets the matching vectors
+    tmp_vectors = os.path.join(path, f'{VECTORS_FILE}.tmp')
+    with open(tmp_vectors, 'wb') as f:
+        np.save(f, vectors)
+    os.replace(tmp_vectors, os.path.join(path, VECTORS_FILE))
+    tmp_claims = os.path.join(path, f'{CLAIMS_FILE}.tmp')
+    with open(tmp_claims, 'w', encoding='utf-8') as f:
+        json.dump({"model": model, "dimension": int(vectors.shape[1]), "claims": claims}, f)
+    os.replace(tmp_claims, os.path.join(path, CLAIMS_FILE))
+    return len(claims)
+
+
+def get_index(path, model):
+    """
+    The index at `path`, loaded once per process. None when it hasn't been
+    built, or was built with a different model than `model`.
+    """
+    global _index, _index_loaded
+    if not _index_loaded:
+        with _index_lock:
+            if not _index_loaded:
+                try:
+                    index = KnownClaimsIndex.load(path)
+                    if index.model != model:
+                        print(f"DEBUG: Known-claims index was built with {index.model}, not {model}; ignoring it")
+                        index = None
+                    else:
+                        print(f"DEBUG: Loaded known-claims index ({len(index)} headlines)")
+                except FileNotFoundError:
+                    index = None
+                except Exception as e:
+                    print(f"DEBUG: Known-claims index unreadable: {e}")
+                    index = None
+                _index = index
+                _index_loaded = True
+    return _index
@@ -0,0 +1,42 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from facts import known_claims, services
+
+
+class Command(BaseCommand):
+    help = "Encodes the labeled headlines in dataset/ into the known-claims index (FACTS_KNOWN_CLAIMS_PATH)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dataset', default=os.path.join(settings.BASE_DIR, 'dataset'),
+                            help="Directory holding the PolitiFact / GossipCop CSVs")
+        parser.add_argument('--output', default=None, help="Index directory (default: FACTS_KNOWN_CLAIMS_PATH)")
+        parser.add_argument('--chunksize', type=int, default=5000, help="CSV rows read at a time")
+        parser.add_argument('--batch-size', type=int, default=256, help="Titles per encoder call")
+
+    def handle(self, *args, **options):
+        path = options['output'] or getattr(settings, 'FACTS_KNOWN_CLAIMS_PATH', None)
+        if not path:
+            raise CommandError("No output directory: pass --output or set FACTS_KNOWN_CLAIMS_PATH")
+
+        # The raw model, not encode_texts: tens of thousands of titles shouldn't flood the EmbeddingCache
+        model = services.get_sentence_model()
+        batch_size = options['batch_size']
+        started = time.time()
+        try:
+            count = known_claims.build(
+                options['dataset'], path,
+                encode=lambda texts: model.encode(texts, batch_size=batch_size),
+                model=services.get_embedding_key(),
+                chunksize=options['chunksize'],
+                batch_size=batch_size,
+                log=self.stdout.write,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {count} headlines in {path} ({time.time() - started:.1f}s)"))
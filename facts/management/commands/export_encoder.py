@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from facts import encoders
+from facts.services import get_sentence_model_name
+
+
+class Command(BaseCommand):
+    help = "Exports the sentence model to ONNX (fp32 and int8) for FACTS_ENCODER_BACKEND='onnx' / 'onnx-int8'."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', default=None, help="Model to export (default: FACTS_SENTENCE_MODEL)")
+        parser.add_argument('--output', default=None, help="Output directory (default: FACTS_ENCODER_PATH)")
+        parser.add_argument('--no-quantize', action='store_true', help="Skip the int8 copy")
+
+    def handle(self, *args, **options):
+        model_name = options['model'] or get_sentence_model_name()
+        path = options['output'] or getattr(settings, 'FACTS_ENCODER_PATH', None)
+        if not path:
+            raise CommandError("No output directory: pass --output or set FACTS_ENCODER_PATH")
+
+        self.stdout.write(f"Exporting {model_name} to {path} ...")
+        try:
+            config = encoders.export_encoder(model_name, path, quantize=not options['no_quantize'])
+        except ImportError as e:
+            raise CommandError(f"Export needs torch, onnx and onnxruntime (pip install -r requirements-onnx.txt): {e}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {config['model_name']} ({config['dimension']}-d, {config['pooling']} pooling)"))
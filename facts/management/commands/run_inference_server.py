@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from facts import services
+from facts.inference import InferenceServer
+
+
+class Command(BaseCommand):
+    help = "Serves the sentence model and spaCy to all web workers over FACTS_INFERENCE_SOCKET."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--socket', default=None, help="Unix socket path (default: FACTS_INFERENCE_SOCKET)")
+
+    def handle(self, *args, **options):
+        address = options['socket'] or getattr(settings, 'FACTS_INFERENCE_SOCKET', None)
+        if not address:
+            raise CommandError("No socket path: pass --socket or set FACTS_INFERENCE_SOCKET")
+        authkey = getattr(settings, 'FACTS_INFERENCE_AUTHKEY', None) or settings.SECRET_KEY
+
+        services.use_local_models()
+        services.preload_models()
+
+        # Encodes go through the EncodeBatcher, so requests from different workers share forward passes
+        handlers = {
+            'encode': lambda texts: services.get_batched_encoder().encode(texts),
+            'keywords': lambda text: services.extract_keywords(services.get_nlp_model(), text),
+            'ping': lambda _: services.models_loaded(),
+        }
+        self.stdout.write(f"Serving models on {address}")
+        try:
+            InferenceServer(address, authkey.encode(), handlers).serve_forever()
+        except KeyboardInterrupt:
+            pass
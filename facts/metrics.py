@@ -0,0 +1,234 @@
+"""
+In-process metrics for the verification pipeline, rendered in the
+Prometheus text exposition format by the /metrics view.
+
+Values are per worker process, like everything else kept in memory here; each
+scrape of /metrics reports the worker that served it.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple((name, labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self):
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in sorted(values.items())]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_in_progress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value)
+
+    def _samples(self):
+        with self._lock:
+            values = {k: (list(c), s) for k, (c, s) in self._values.items()}
+        lines = []
+        for key, (counts, total) in sorted(values.items()):
+            for bound, count in zip(self.buckets, counts):
+                labels = key + (('le', _format_value(bound)),)
+                lines.append(f"{self.name}_bucket{_format_labels(labels)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {counts[-1]}")
+        return lines
+
+
+class CallbackGauge(Metric):
+    """Reads its values from `collect()`, a callable returning (labels dict, value) pairs."""
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, collect, kind='gauge'):
+        super().__init__(name, documentation)
+        self.collect = collect
+        self.kind = kind
+
+    def _samples(self):
+        return [
+            f"{self.name}{_format_labels(tuple(sorted(labels.items())))} {_format_value(value)}"
+            for labels, value in self.collect()
+        ]
+
+
+REGISTRY = []
+
+STAGE_DURATION = Histogram(
+    'truthlens_stage_duration_seconds', 'Duration of verification pipeline stages.', ['stage'])
+STAGE_TOTAL = Counter(
+    'truthlens_stage_total', 'Verification pipeline stage runs by outcome.', ['stage', 'outcome'])
+SEARCH_ATTEMPT_DURATION = Histogram(
+    'truthlens_search_attempt_duration_seconds', 'Duration of individual search strategy attempts.', ['strategy'])
+SEARCH_ATTEMPT_TOTAL = Counter(
+    'truthlens_search_attempt_total', 'Search strategy attempts by outcome.', ['strategy', 'outcome'])
+REQUESTS_IN_FLIGHT = Gauge(
+    'truthlens_requests_in_flight', 'Verification requests currently being processed.', ['endpoint'])
+MODEL_LOADED = Gauge(
+    'truthlens_model_loaded', 'Whether a model is loaded in this worker (1) or not (0).', ['model'])
+MODEL_LOAD_SECONDS = Gauge(
+    'truthlens_model_load_seconds', 'Time it took to load a model.', ['model'])
+PIPELINE_CRITICAL_PATH = Histogram(
+    'truthlens_pipeline_critical_path_seconds', 'End-to-end time of a pipeline run (its critical path).', ['pipeline'])
+PIPELINE_CRITICAL_STAGE = Counter(
+    'truthlens_pipeline_critical_stage_total', 'Times a stage was on the critical path of a pipeline run.',
+    ['pipeline', 'stage'])
+HOST_SKIPS = Counter(
+    'truthlens_host_skips_total', 'URLs skipped without a request, by reason (circuit_open, robots, busy, paced).', ['reason'])
+EARLY_EXITS = Counter(
+    'truthlens_early_exits_total', 'Verifications that stopped fetching once the verdict was settled.', ['policy'])
+ENCODE_BATCH_TEXTS = Histogram(
+    'truthlens_encode_batch_texts', 'Texts per micro-batched encoder forward pass.',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+ENCODE_BATCH_REQUESTS = Histogram(
+    'truthlens_encode_batch_requests', 'Encode calls coalesced into one forward pass.',
+    buckets=(1, 2, 4, 8, 16, 32))
+
+
+class Outcome:
+    """Handed out by `observe`; set `status` to 'failure', 'empty', 'skipped' or 'cancelled' when the stage didn't succeed."""
+
+    def __init__(self):
+        self.status = 'success'
+
+
+@contextmanager
+def observe(duration, total, **labels):
+    outcome = Outcome()
+    started = time.perf_counter()
+    try:
+        yield outcome
+    except Exception:
+        outcome.status = 'failure'
+        raise
+    finally:
+        duration.observe(time.perf_counter() - started, **labels)
+        total.inc(outcome=outcome.status, **labels)
+
+
+def stage(name):
+    """Times one pipeline stage: `with metrics.stage('fetch') as outcome: ...`"""
+    return observe(STAGE_DURATION, STAGE_TOTAL, stage=name)
+
+
+def search_attempt(strategy):
+    return observe(SEARCH_ATTEMPT_DURATION, SEARCH_ATTEMPT_TOTAL, strategy=strategy)
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def _cache_requests():
+    from .cache import EmbeddingCache, SearchResultCache, VerdictCache
+
+    samples = []
+    for name, cache in (('search', SearchResultCache), ('embedding', EmbeddingCache), ('verdict', VerdictCache)):
+        stats = cache.stats()
+        samples.append(({'cache': name, 'result': 'hit'}, stats['hits']))
+        samples.append(({'cache': name, 'result': 'miss'}, stats['misses']))
+    return samples
+
+
+def _jobs_by_status():
+    from .jobs import JobQueue
+
+    return [({'status': status}, count) for status, count in sorted(JobQueue.counts().items())]
+
+
+def _open_circuits():
+    from .hosts import HostRegistry
+
+    return [({}, HostRegistry.open_circuits())]
+
+
+CACHE_REQUESTS = CallbackGauge(
+    'truthlens_cache_requests_total', 'Cache lookups by cache and result.', _cache_requests, kind='counter')
+JOBS = CallbackGauge(
+    'truthlens_jobs', 'Async verification jobs by status, across workers.', _jobs_by_status)
+OPEN_CIRCUITS = CallbackGauge(
+    'truthlens_host_circuits_open', 'Hosts whose circuit breaker is currently open.', _open_circuits)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facts', '0002_article_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VerdictCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('claim', models.TextField()),
+                ('model_name', models.CharField(max_length=255)),
+                ('embedding', models.BinaryField()),
+                ('verdict', models.TextField()),
+                ('sources', models.JSONField(default=list)),
+                ('scores', models.JSONField(default=list)),
+                ('image_url', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
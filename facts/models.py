@@ -1,3 +1,82 @@
 from django.db import models
 
 # Create your models here.
+
+class SearchCacheEntry(models.Model):
+    """search_web results for a normalized query, see facts.cache.SearchResultCache."""
+    key = models.CharField(max_length=64, unique=True)
+    query = models.TextField()
+    # Ranked list of {"url", "title", "snippet"} dicts
+    results = models.JSONField(default=list)
+    created_at = models.DateTimeField()
+    last_accessed = models.DateTimeField(db_index=True)
+    hits = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.query
+
+
+class ArticleCacheEntry(models.Model):
+    """Extracted text and summary of a scraped page, see facts.cache.ArticleCache."""
+    key = models.CharField(max_length=64, unique=True)
+    url = models.TextField()
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+    text = models.TextField()
+    summary = models.TextField()
+    # Stored bytes of text + summary, used to cap the cache size
+    size = models.PositiveIntegerField(default=0)
+    fetched_at = models.DateTimeField()
+    last_accessed = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.url
+
+
+class VerdictCacheEntry(models.Model):
+    """A verified claim and its outcome, matched by embedding, see facts.cache.VerdictCache."""
+    # Hash of the model name and the normalized claim; re-verifying a claim updates its row
+    key = models.CharField(max_length=64, unique=True)
+    claim = models.TextField()
+    model_name = models.CharField(max_length=255)
+    # float32 claim embedding
+    embedding = models.BinaryField()
+    verdict = models.TextField()
+    sources = models.JSONField(default=list)
+    scores = models.JSONField(default=list)
+    image_url = models.TextField(blank=True)
+    created_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.claim
+
+
+class VerificationJobEntry(models.Model):
+    """An async verification, see facts.jobs.JobQueue. Any worker can read it."""
+    id = models.CharField(max_length=32, primary_key=True)
+    claim = models.TextField()
+    # queued, running, done or failed
+    status = models.CharField(max_length=16, db_index=True)
+    # verify_claim's result dict once done
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.claim
+
+
+class VerificationJobEvent(models.Model):
+    """One progress event of a VerificationJobEntry; `seq` is its SSE event id."""
+    job = models.ForeignKey(VerificationJobEntry, on_delete=models.CASCADE, related_name='events')
+    seq = models.PositiveIntegerField()
+    stage = models.CharField(max_length=32)
+    data = models.JSONField()
+
+    class Meta:
+        ordering = ['seq']
+        constraints = [models.UniqueConstraint(fields=['job', 'seq'], name='unique_job_event_seq')]
+
+    def __str__(self):
+        return f"{self.job_id} #{self.seq} {self.stage}"
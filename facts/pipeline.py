@@ -0,0 +1,117 @@
+"""
+Dependency-graph executor for the verification pipeline.
+
+A StageGraph lists stages and the stages whose results they need; run()
+starts every stage as soon as its dependencies are done, so independent
+branches (image lookup next to search and scraping) overlap and a request
+takes as long as its critical path. Stage functions receive the dict of
+results so far.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = getattr(settings, 'FACTS_PIPELINE_WORKERS', 16)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pipeline')
+    return _executor
+
+
+class PipelineRun:
+    """Results and timing of one StageGraph.run()."""
+
+    def __init__(self, name):
+        self.name = name
+        self.results = {}
+        self.started = {}
+        self.finished = {}
+        self.origin = time.perf_counter()
+
+    def duration(self, stage):
+        return self.finished[stage] - self.started[stage]
+
+    def critical_path(self, graph):
+        """Stages on the longest dependency chain, ending at the stage that finished last."""
+        if not self.finished:
+            return []
+        stage = max(self.finished, key=self.finished.get)
+        path = [stage]
+        while graph.deps[stage]:
+            stage = max(graph.deps[stage], key=self.finished.get)
+            path.append(stage)
+        return list(reversed(path))
+
+    def report(self, graph):
+        path = self.critical_path(graph)
+        total = max(self.finished.values()) - self.origin if self.finished else 0.0
+        steps = " -> ".join(f"{stage} {self.duration(stage):.2f}s" for stage in path)
+        print(f"DEBUG: {self.name} critical path ({total:.2f}s): {steps}")
+        metrics.PIPELINE_CRITICAL_PATH.observe(total, pipeline=self.name)
+        for stage in path:
+            metrics.PIPELINE_CRITICAL_STAGE.inc(pipeline=self.name, stage=stage)
+        return path
+
+
+class StageGraph:
+    def __init__(self, name):
+        self.name = name
+        self.stages = {}
+        self.deps = {}
+
+    def add(self, name, fn, deps=()):
+        """Adds stage `name`; fn(results) runs once every stage in `deps` has finished."""
+        unknown = [dep for dep in deps if dep not in self.stages]
+        if unknown:
+            raise ValueError(f"Stage {name!r} depends on unknown stages {unknown}")
+        self.stages[name] = fn
+        self.deps[name] = tuple(deps)
+        return self
+
+    def run(self):
+        """Runs every stage, returns a PipelineRun. A failing stage cancels the rest and re-raises."""
+        run = PipelineRun(self.name)
+        executor = _get_executor()
+        running = {}
+
+        def submit_ready():
+            for name, deps in self.deps.items():
+                if name in run.started or not all(dep in run.finished for dep in deps):
+                    continue
+                run.started[name] = time.perf_counter()
+                running[executor.submit(self._run_stage, name, run.results)] = name
+
+        submit_ready()
+        try:
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    run.results[name] = future.result()
+                    run.finished[name] = time.perf_counter()
+                submit_ready()
+        finally:
+            for future in running:
+                future.cancel()
+
+        run.report(self)
+        return run
+
+    def _run_stage(self, name, results):
+        try:
+            return self.stages[name](results)
+        finally:
+            # Pool threads are long-lived; don't keep a DB connection per thread open
+            connections.close_all()
@@ -1,48 +1,452 @@
-from duckduckgo_search import DDGS
 import requests
-from bs4 import BeautifulSoup
-from sumy.parsers.html import HtmlParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer
-from sentence_transformers import SentenceTransformer
-import spacy
-from sklearn.metrics.pairwise import cosine_similarity
-from transformers import pipeline
 import numpy as np
+import asyncio
 import datetime
+import functools
+import os
+import re
 import time
 from statistics import mean
 import random
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from django.conf import settings
+from django.db import connections
+from requests.adapters import HTTPAdapter
+from . import encoders, inference, known_claims, metrics, streams
+from .hosts import HostRegistry, SlotUnavailable, parse_retry_after
+from .pipeline import StageGraph
+from .cache import ArticleCache, EmbeddingCache, SearchResultCache, VerdictCache
 
-try:
-    from googlesearch import search as google_search
-except ImportError:
-    google_search = None
+# Search, parsing, NLP and async HTTP libraries are imported on first use (see
+# get_ddgs, get_google_search, get_nlp_model, _loop_state), so booting a
+# worker or running manage.py doesn't pay for them
+DDGS = None
+_NOT_IMPORTED = object()
+google_search = _NOT_IMPORTED
 
 # Models are now lazy-loaded to prevent startup timeouts
 nlp = None
 sentence_model = None
+encode_batcher = None
+inference_client = None
+_local_models_only = False
+metrics.MODEL_LOADED.set(0, model='sentence')
+metrics.MODEL_LOADED.set(0, model='spacy')
+
+def get_sentence_model_name():
+    return getattr(settings, 'FACTS_SENTENCE_MODEL', 'all-MiniLM-L6-v2')
+
+def get_encoder_backend():
+    return getattr(settings, 'FACTS_ENCODER_BACKEND', 'torch')
+
+def get_embedding_key():
+    """Model identity stored with cached embeddings; ONNX backends get their own entries."""
+    backend = get_encoder_backend()
+    name = get_sentence_model_name()
+    return name if backend == 'torch' else f"{name}:{backend}"
+
+def use_local_models():
+    """Makes this process load its own models even with FACTS_INFERENCE_SOCKET set (the inference server does)."""
+    global _local_models_only
+    _local_models_only = True
+
+def get_inference_client():
+    """Client for the shared inference server, or None when models run in this process."""
+    global inference_client
+    address = getattr(settings, 'FACTS_INFERENCE_SOCKET', None)
+    if not address or _local_models_only:
+        return None
+    if inference_client is None:
+        authkey = getattr(settings, 'FACTS_INFERENCE_AUTHKEY', None) or settings.SECRET_KEY
+        inference_client = inference.InferenceClient(
+            address, authkey.encode(), timeout=getattr(settings, 'FACTS_INFERENCE_TIMEOUT', 60))
+    return inference_client
+
+# Request threads, scrape workers and the warm-up thread may all ask for a model at once
+_model_lock = threading.Lock()
+_warmup_thread = None
 
 def get_sentence_model():
     global sentence_model
     if sentence_model is None:
-        print("DEBUG: Loading SBERT Model (Lazy Load)...")
-        sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
+        with _model_lock:
+            if sentence_model is None:
+                print("DEBUG: Loading SBERT Model (Lazy Load)...")
+                started = time.time()
+                sentence_model = _load_encoder()
+                metrics.MODEL_LOAD_SECONDS.set(time.time() - started, model='sentence')
+                metrics.MODEL_LOADED.set(1, model='sentence')
     return sentence_model
 
+def _load_encoder():
+    client = get_inference_client()
+    if client is not None:
+        print(f"DEBUG: Sentence encoder backend: inference server at {client.address}")
+        return client
+
+    backend = get_encoder_backend()
+    path = getattr(settings, 'FACTS_ENCODER_PATH', None)
+    threads = getattr(settings, 'FACTS_ENCODER_THREADS', 0)
+    try:
+        encoder = encoders.load_encoder(backend, get_sentence_model_name(), path, threads)
+    except Exception as e:
+        if backend == 'torch':
+            raise
+        print(f"DEBUG: {backend} encoder unavailable ({e}), falling back to PyTorch")
+        encoder = encoders.TorchEncoder(get_sentence_model_name())
+    print(f"DEBUG: Sentence encoder backend: {encoder.backend}")
+    return encoder
+
+def get_batched_encoder():
+    """
+    The sentence model behind an EncodeBatcher, so concurrent requests share
+    forward passes. Returns the bare model when FACTS_ENCODE_BATCHING is off.
+    """
+    global encode_batcher
+    if not getattr(settings, 'FACTS_ENCODE_BATCHING', True):
+        return get_sentence_model()
+    if encode_batcher is None:
+        model = get_sentence_model()
+        with _model_lock:
+            if encode_batcher is None:
+                encode_batcher = encoders.EncodeBatcher(
+                    model,
+                    max_batch=getattr(settings, 'FACTS_ENCODE_MAX_BATCH', 64),
+                    max_wait=getattr(settings, 'FACTS_ENCODE_BATCH_WAIT_MS', 5) / 1000,
+                )
+    return encode_batcher
+
+def encode_texts(texts):
+    """
+    Encodes texts with the sentence model, going through the EmbeddingCache.
+    Only cache misses are sent to the model, in a single batch.
+    Returns a (len(texts), dim) float32 array.
+    """
+    texts = [str(t) for t in texts]
+    model_name = get_embedding_key()
+    vectors = [EmbeddingCache.get(t, model_name) for t in texts]
+
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    if missing:
+        # Duplicate texts in one call are only encoded once
+        unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+        encoder = get_batched_encoder()
+        with metrics.stage('encode'):
+            encoded = encoder.encode(unique_texts)
+        by_text = {}
+        for text, vector in zip(unique_texts, encoded):
+            vector = np.asarray(vector, dtype=np.float32)
+            EmbeddingCache.put(text, model_name, vector)
+            by_text[text] = vector
+        for i in missing:
+            vectors[i] = by_text[texts[i]]
+
+    print(f"DEBUG: Encoded {len(texts)} texts ({len(missing)} cache misses)")
+    return np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+def cosine_scores(query_embedding, embeddings):
+    """Cosine similarity of one vector against each row of `embeddings`, as one normalized matrix product."""
+    query_embedding = np.asarray(query_embedding, dtype=np.float32)
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    query_embedding = query_embedding / max(np.linalg.norm(query_embedding), 1e-12)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return (embeddings / np.maximum(norms, 1e-12)) @ query_embedding
+
+def get_known_claims_index():
+    """The known-claims index (python manage.py build_known_claims), or None if it isn't built."""
+    path = getattr(settings, 'FACTS_KNOWN_CLAIMS_PATH', None)
+    if not path:
+        return None
+    return known_claims.get_index(path, get_embedding_key())
+
+def get_ddgs():
+    """A DuckDuckGo search client."""
+    global DDGS
+    if DDGS is None:
+        from duckduckgo_search import DDGS as ddgs_class
+        DDGS = ddgs_class
+    return DDGS()
+
+def get_google_search():
+    """googlesearch.search, or None when googlesearch isn't installed."""
+    global google_search
+    if google_search is _NOT_IMPORTED:
+        try:
+            from googlesearch import search
+        except ImportError:
+            search = None
+        google_search = search
+    return google_search
+
 def get_nlp_model():
     global nlp
     if nlp is None:
-        print("DEBUG: Loading SpaCy Model (Lazy Load)...")
-        nlp = spacy.load("en_core_web_sm")
+        with _model_lock:
+            if nlp is None:
+                print("DEBUG: Loading SpaCy Model (Lazy Load)...")
+                started = time.time()
+                import spacy
+                nlp = spacy.load("en_core_web_sm")
+                metrics.MODEL_LOAD_SECONDS.set(time.time() - started, model='spacy')
+                metrics.MODEL_LOADED.set(1, model='spacy')
     return nlp
 
+def extract_keywords(nlp_model, text):
+    """Keeps significant words (proper nouns, nouns, verbs; no stop words)."""
+    doc = nlp_model(text)
+    keywords = [token.text for token in doc if not token.is_stop and token.pos_ in ['PROPN', 'NOUN', 'VERB']]
+    return " ".join(keywords)
+
+def preload_models():
+    """
+    Loads and warms both models up front. Run in the gunicorn master before
+    forking (see gunicorn.conf.py) so workers share the pages copy-on-write
+    and the first request doesn't pay for the load.
+    With an inference server configured this only checks that it answers.
+    """
+    started = time.time()
+    # The lazily imported page libraries too, so the forked workers share them as well
+    import bs4, sumy.summarizers.lsa  # noqa: F401
+    client = get_inference_client()
+    if client is not None:
+        try:
+            print(f"DEBUG: Inference server models: {client.ping()}")
+        except Exception as e:
+            print(f"DEBUG: Inference server not reachable yet: {e}")
+        return
+    get_sentence_model().encode(["TruthLens warm-up sentence."])
+    get_nlp_model()("TruthLens warm-up sentence.")
+    print(f"DEBUG: Models preloaded in {time.time() - started:.1f}s")
+
+def models_loaded():
+    client = get_inference_client()
+    if client is not None:
+        try:
+            return client.ping()
+        except Exception as e:
+            print(f"DEBUG: Inference server not reachable: {e}")
+            return {"inference_server": False}
+    return {"sentence_model": sentence_model is not None, "nlp_model": nlp is not None}
+
+def warm_models_in_background():
+    """Starts preload_models on a background thread unless it is already running."""
+    global _warmup_thread
+    with _model_lock:
+        if _warmup_thread is not None and _warmup_thread.is_alive():
+            return
+        _warmup_thread = threading.Thread(target=preload_models, name='model-warmup', daemon=True)
+        _warmup_thread.start()
+
+# Sentence ends: terminal punctuation (optionally closing quote/bracket) followed by whitespace
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])["\'\u201d)\]]*\s+')
+
+# Shared keep-alive session so repeated fetches reuse pooled connections
+http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    global http_session
+    if http_session is None:
+        with _http_session_lock:
+            if http_session is None:
+                pool_size = getattr(settings, 'FACTS_FETCH_MAX_WORKERS', 8)
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                http_session = session
+    return http_session
+
+# Per-host semaphores (kept in the HostRegistry), shared across requests, to stay polite to busy news sites
+@contextmanager
+def _host_slot(url, give_up=None, stop=None):
+    """
+    Holds one of the host's slots for a request. Raises SlotUnavailable rather
+    than waiting past `give_up` (a time.monotonic() deadline) or once `stop`
+    is set, so abandoned fetches don't queue up behind a slow host.
+    """
+    semaphore = HostRegistry.semaphore(url)
+    # Short waits, so the deadline and `stop` are noticed while the host is busy
+    while not semaphore.acquire(timeout=0.1):
+        if stop is not None and stop.is_set():
+            raise SlotUnavailable("stopped")
+        if give_up is not None and time.monotonic() >= give_up:
+            metrics.HOST_SKIPS.inc(reason="busy")
+            raise SlotUnavailable("busy")
+    try:
+        if stop is not None and stop.is_set():
+            raise SlotUnavailable("stopped")
+        # Politeness: requests to one host start FACTS_HOST_MIN_INTERVAL (or Crawl-delay) apart
+        delay = HostRegistry.reserve_slot(url, None if give_up is None else give_up - time.monotonic())
+        if delay is None:
+            raise SlotUnavailable("paced")
+        if delay > 0:
+            if stop is None:
+                time.sleep(delay)
+            elif stop.wait(delay):
+                raise SlotUnavailable("stopped")
+        yield
+    finally:
+        semaphore.release()
+
+# Async pipeline state. An httpx client belongs to one event loop, so each
+# loop (one under uvicorn) gets its own.
+_async_loop_state = weakref.WeakKeyDictionary()
+
+def _loop_state():
+    loop = asyncio.get_running_loop()
+    state = _async_loop_state.get(loop)
+    if state is None:
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("The async pipeline needs httpx")
+        max_connections = getattr(settings, 'FACTS_ASYNC_MAX_CONNECTIONS', 100)
+        client = httpx.AsyncClient(
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        state = _async_loop_state[loop] = {'client': client}
+    return state
+
+def get_async_http_client():
+    return _loop_state()['client']
+
+@asynccontextmanager
+async def _async_host_slot(url, give_up=None):
+    """_host_slot for the async pipeline; `stop` is handled by cancelling the download."""
+    semaphore = HostRegistry.async_semaphore(url)
+    try:
+        await asyncio.wait_for(semaphore.acquire(), None if give_up is None else give_up - time.monotonic())
+    except asyncio.TimeoutError:
+        metrics.HOST_SKIPS.inc(reason="busy")
+        raise SlotUnavailable("busy")
+    try:
+        delay = HostRegistry.reserve_slot(url, None if give_up is None else give_up - time.monotonic())
+        if delay is None:
+            raise SlotUnavailable("paced")
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield
+    finally:
+        semaphore.release()
+
+# Parsing, summarizing, encoding and the ORM-backed caches run here, off the event loop
+cpu_executor = None
+_cpu_executor_lock = threading.Lock()
+
+def get_cpu_executor():
+    global cpu_executor
+    if cpu_executor is None:
+        with _cpu_executor_lock:
+            if cpu_executor is None:
+                workers = getattr(settings, 'FACTS_ASYNC_CPU_WORKERS', None) or os.cpu_count() or 4
+                cpu_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='verify-cpu')
+    return cpu_executor
+
+async def run_blocking(fn, *args):
+    """Awaits fn(*args) on the CPU pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cpu_executor(), functools.partial(fn, *args))
+
+# The synchronous search clients (DDG, Google) get their own bounded pool: a
+# hedged race leaves losing strategies running in their threads, and those
+# shouldn't crowd out the default executor Django uses for sync_to_async.
+search_executor = None
+_search_executor_lock = threading.Lock()
+
+def get_search_executor():
+    global search_executor
+    if search_executor is None:
+        with _search_executor_lock:
+            if search_executor is None:
+                workers = getattr(settings, 'FACTS_ASYNC_SEARCH_WORKERS', 8)
+                search_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='verify-search')
+    return search_executor
+
+async def run_search(fn, *args):
+    """Awaits fn(*args) on the search pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_search_executor(), functools.partial(fn, *args))
+
 class FactCheckerService:
+    # Similarity thresholds of the verdict rules (see classify_verdict)
+    STRONG_TRUE_MAX = 0.45
+    LIKELY_TRUE_AVG = 0.25
+    LIKELY_TRUE_MAX = 0.30
+    STRONG_FAKE_MAX = 0.15
+
     @staticmethod
     def get_date_range_query(query):
         """Returns the query as-is. Date range filters often reduce recall on free search APIs."""
         return query
 
+    @staticmethod
+    def _ddg_search(ddgs, search_query, num_results):
+        """Runs one DDG text search. Returns result dicts with href/title/body."""
+        results = list(ddgs.text(search_query, max_results=num_results))
+        return [r for r in results if r.get('href')]
+
+    @staticmethod
+    def _extract_keywords(query):
+        """Keeps significant words (proper nouns, nouns, verbs; no stop words) for a SpaCy-built query."""
+        client = get_inference_client()
+        if client is not None:
+            return client.keywords(query)
+        return extract_keywords(get_nlp_model(), query)
+
+    @staticmethod
+    def _google_search(query, num_results):
+        """Google fallback. advanced=True yields Result objects with .url, .title, .description"""
+        g_results = get_google_search()(query, num_results=num_results, advanced=True)
+        return [{'href': r.url, 'title': r.title, 'body': r.description} for r in g_results if r.url]
+
+    @staticmethod
+    def _search_strategies(query, num_results, ddgs):
+        """
+        Returns the fallback strategies as (name, callable) pairs, split into
+        cheap DDG variants and expensive fallbacks (SpaCy model, Google).
+        """
+        def ddg(search_query):
+            return lambda: FactCheckerService._ddg_search(ddgs, search_query, num_results)
+
+        def entity_search():
+            entity_query = FactCheckerService._extract_keywords(query)
+            print(f"DEBUG: Extracted Keywords: {entity_query}")
+            if not entity_query.strip():
+                return []
+            return FactCheckerService._ddg_search(ddgs, entity_query, num_results)
+
+        # 1. Direct Query, 2. Simplified (no punctuation/quotes), 3. Keyword Append
+        simple_query = ''.join(e for e in query if e.isalnum() or e.isspace())
+        cheap = [('Direct Query', ddg(query))]
+        if simple_query != query:
+            cheap.append(('Simplified Query', ddg(simple_query)))
+        cheap.append(('Keyword Append', ddg(f"{query} news fact check")))
+
+        # 4. Entity & Noun Extraction (Spacy), 5. Google Fallback (If DDG fails)
+        fallbacks = [('Entity/Noun Extraction', entity_search)]
+        if get_google_search():
+            fallbacks.append(('Google Search Fallback', lambda: FactCheckerService._google_search(query, num_results)))
+
+        return cheap, fallbacks
+
+    @staticmethod
+    def _run_strategy(name, strategy):
+        try:
+            print(f"DEBUG: Attempt - {name}")
+            with metrics.search_attempt(name) as outcome:
+                results = strategy()
+                if not results:
+                    outcome.status = 'empty'
+            return results
+        except Exception as e:
+            print(f"DEBUG: {name} Failed: {e}")
+            return []
+
     @staticmethod
     def search_web(query, num_results=10):
         """
@@ -50,158 +454,585 @@ class FactCheckerService:
         1. Exact query
         2. Simple query (no date/special chars)
         3. Keyword based query
+        4. SpaCy keyword query
+        5. Google
+
+        By default strategies run one after another. With FACTS_PARALLEL_SEARCH
+        the cheap DDG variants are raced instead, see _race_strategies.
+        Non-empty results are cached per normalized query (SearchResultCache).
         """
         print(f"DEBUG: Starting Search for '{query}'")
-        urls = []
-        
-        # Strategy 1: Direct Query
+
+        cached = SearchResultCache.get(query, num_results)
+        if cached is not None:
+            return [r['url'] for r in cached]
+
+        results = []
+
+        ddgs = get_ddgs()
+        cheap, fallbacks = FactCheckerService._search_strategies(query, num_results, ddgs)
+
+        if getattr(settings, 'FACTS_PARALLEL_SEARCH', True):
+            results = FactCheckerService._race_strategies(cheap, fallbacks)
+        else:
+            for name, strategy in cheap + fallbacks:
+                results = FactCheckerService._run_strategy(name, strategy)
+                if results:
+                    break
+
+        ranked = FactCheckerService._rank_results(results)
+        SearchResultCache.set(query, num_results, ranked)
+
+        print(f"DEBUG: Total URLs Found: {len(ranked)}")
+        return [r['url'] for r in ranked]
+
+    @staticmethod
+    def _rank_results(results):
+        """Deduplicates search results, keeping rank order, into the cached url/title/snippet form."""
+        ranked = {}
+        for r in results:
+            ranked.setdefault(r['href'], {'url': r['href'], 'title': r.get('title', ''), 'snippet': r.get('body', '')})
+        return list(ranked.values())
+
+    @staticmethod
+    def _race_strategies(cheap, fallbacks):
+        """
+        Launches the cheap strategies together and returns the first non-empty
+        result set. The fallbacks only start once the cheap ones have all come
+        back empty or FACTS_SEARCH_HEDGE_DELAY seconds have passed without a
+        result. Gives up after FACTS_SEARCH_DEADLINE seconds.
+        """
+        hedge_delay = getattr(settings, 'FACTS_SEARCH_HEDGE_DELAY', 3)
+        deadline = getattr(settings, 'FACTS_SEARCH_DEADLINE', 20)
+        started = time.monotonic()
+
+        executor = ThreadPoolExecutor(max_workers=len(cheap) + len(fallbacks), thread_name_prefix='search')
+        pending = {executor.submit(FactCheckerService._run_strategy, name, fn) for name, fn in cheap}
+        fallbacks_started = False
+        results = []
+
         try:
-            print(f"DEBUG: Attempt 1 - Direct Query: {query}")
-            with DDGS() as ddgs:
-                results = list(ddgs.text(query, max_results=num_results))
-                urls = [r['href'] for r in results]
-        except Exception as e:
-            print(f"DEBUG: Attempt 1 Failed: {e}")
+            while pending and not results:
+                elapsed = time.monotonic() - started
+                if elapsed >= deadline:
+                    print(f"DEBUG: Search deadline ({deadline}s) hit")
+                    break
 
-        # Strategy 2: Fallback (Remove punctuation/quotes)
-        if not urls:
-            print("DEBUG: Attempt 2 - Simplified Query")
-            simple_query = ''.join(e for e in query if e.isalnum() or e.isspace())
-            try:
-                with DDGS() as ddgs:
-                    results = list(ddgs.text(simple_query, max_results=num_results))
-                    urls = [r['href'] for r in results]
-            except Exception as e:
-                print(f"DEBUG: Attempt 2 Failed: {e}")
+                timeout = deadline - elapsed
+                if not fallbacks_started:
+                    timeout = min(timeout, max(hedge_delay - elapsed, 0))
 
-        # Strategy 3: Keywords
-        if not urls:
-            print("DEBUG: Attempt 3 - Keyword Append")
-            keyword_query = f"{query} news fact check"
-            try:
-                with DDGS() as ddgs:
-                    results = list(ddgs.text(keyword_query, max_results=num_results))
-                    urls = [r['href'] for r in results]
-            except Exception as e:
-                print(f"DEBUG: Attempt 3 Failed: {e}")
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.result():
+                        results = future.result()
+                        break
 
-        # Strategy 4: Entity & Noun Extraction (Spacy)
-        if not urls:
-            try:
-                print("DEBUG: Attempt 4 - Entity/Noun Extraction")
-                local_nlp = get_nlp_model()
-                doc = local_nlp(query)
-                # Keep significant words: Proper nouns, nouns, verbs (excluding stop words)
-                keywords = [token.text for token in doc if not token.is_stop and token.pos_ in ['PROPN', 'NOUN', 'VERB']]
-                entity_query = " ".join(keywords)
-                
-                print(f"DEBUG: Extracted Keywords: {entity_query}")
-                
-                if entity_query and len(entity_query.split()) > 0:
-                    with DDGS() as ddgs:
-                        results = list(ddgs.text(entity_query, max_results=num_results))
-                        urls = [r['href'] for r in results]
-            except Exception as e:
-                print(f"DEBUG: Attempt 4 Failed: {e}")
-
-        # Strategy 5: Google Fallback (If DDG fails)
-        if not urls and google_search:
-             try:
-                print("DEBUG: Attempt 5 - Google Search Fallback")
-                # googlesearch-python returns a generator of URLs
-                g_results = google_search(query, num_results=num_results, advanced=True)
-                # advanced=True returns Result objects with .url, .title, .description
-                # advanced=False (default) returns strings
-                # Let's use default for simplicity
-                urls = list(google_search(query, num_results=num_results))
-             except Exception as e:
-                print(f"DEBUG: Google Fallback Failed: {e}")
-
-        print(f"DEBUG: Total URLs Found: {len(urls)}")
-        return list(set(urls)) # Deduplicate
-
-    @staticmethod
-    def scrape_and_summarize(urls, query_text):
-        """Scrapes URLs with robust error handling and lower thresholds."""
+                hedge_due = time.monotonic() - started >= hedge_delay
+                if not results and not fallbacks_started and (hedge_due or not pending):
+                    print("DEBUG: Primary search slow or empty, starting fallbacks")
+                    pending |= {executor.submit(FactCheckerService._run_strategy, name, fn) for name, fn in fallbacks}
+                    fallbacks_started = True
+        finally:
+            # Losing strategies finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
+    @staticmethod
+    def _build_headers():
+        """Browser-like request headers with a randomly chosen User-Agent."""
         # Rotating User-Agents could be added here, but a standard modern one usually works
         user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15',
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0'
         ]
-        
-        headers = {
+
+        return {
             'User-Agent': random.choice(user_agents),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Referer': 'https://www.google.com/'
         }
-        
+
+    @staticmethod
+    def _scrape_single(url, headers, summarize=True, give_up=None, stop=None):
+        """
+        Fetches and summarizes one URL. Returns the summary text or None.
+        With summarize=False the extracted page text is returned instead.
+        The request isn't started after `give_up` (a time.monotonic()
+        deadline) or once `stop` is set.
+
+        Pages already in the ArticleCache are served without a request while
+        fresh, and revalidated with a conditional GET afterwards so an
+        unchanged page (304) skips parsing and summarization.
+        """
+        try:
+            cached = ArticleCache.get(url)
+            if cached is not None and ArticleCache.is_fresh(cached):
+                print(f"DEBUG: Article cache hit: {url}")
+                return FactCheckerService._cached_page(cached, url, summarize)
+
+            # Known-bad hosts (open circuit) and robots.txt exclusions are skipped without a request
+            skip_reason = HostRegistry.check(url, headers)
+            if skip_reason:
+                print(f"DEBUG: Skipped {url} - {skip_reason}")
+                return None
+
+            request_headers = dict(headers)
+            if cached is not None:
+                request_headers.update(ArticleCache.conditional_headers(cached))
+
+            # Timeout is crucial to prevent hanging
+            timeout = getattr(settings, 'FACTS_FETCH_TIMEOUT', 5)
+            with _host_slot(url, give_up, stop), metrics.stage('fetch') as outcome:
+                requested = time.monotonic()
+                try:
+                    # stream=True: only headers are read until we decide the body is worth it
+                    response = get_http_session().get(url, headers=request_headers, timeout=timeout, stream=True)
+                    try:
+                        html = None
+                        if response.status_code == 200:
+                            html = FactCheckerService._read_html(response)
+                            if html is None:
+                                outcome.status = 'skipped'
+                        elif response.status_code != 304:
+                            outcome.status = 'failure'
+                    finally:
+                        response.close()
+                except requests.RequestException as e:
+                    HostRegistry.record_error(url, time.monotonic() - requested, timeout=isinstance(e, requests.Timeout))
+                    raise
+                HostRegistry.record(url, response.status_code, time.monotonic() - requested,
+                                    parse_retry_after(response.headers.get('Retry-After')))
+
+            if response.status_code == 304 and cached is not None:
+                ArticleCache.revalidated(cached)
+                print(f"DEBUG: Article not modified (304): {url}")
+                return FactCheckerService._cached_page(cached, url, summarize)
+
+            if response.status_code != 200:
+                print(f"DEBUG: Skipped {url} - Status Code {response.status_code}")
+                return None
+
+            if html is None:
+                print(f"DEBUG: Skipped {url} - Not HTML ({response.headers.get('Content-Type')})")
+                return None
+
+            return FactCheckerService._process_page(url, html, response.headers, summarize)
+
+        except SlotUnavailable as e:
+            print(f"DEBUG: Skipped {url} - {e}")
+            return None
+        except Exception as e:
+            print(f"DEBUG: Error scraping {url}: {e}")
+            return None
+
+    @staticmethod
+    def _process_page(url, html, response_headers, summarize):
+        """Extracts, summarizes and caches a downloaded page. Returns the summary (or text) or None."""
+        with metrics.stage('extract') as outcome:
+            full_text = FactCheckerService._extract_text(html)
+            if len(full_text) <= 100:
+                outcome.status = 'empty'
+
+        if len(full_text) <= 100: # Ensure we have at least some substantial content
+            print(f"DEBUG: Skipped {url} - Content too short ({len(full_text)} chars)")
+            return None
+
+        summary_text = FactCheckerService._summarize_text(full_text, url) if summarize else ''
+        ArticleCache.store(
+            url,
+            etag=response_headers.get('ETag', ''),
+            last_modified=response_headers.get('Last-Modified', ''),
+            text=full_text,
+            summary=summary_text,
+        )
+        return summary_text if summarize else full_text
+
+    @staticmethod
+    def _cached_page(entry, url, summarize):
+        if not summarize:
+            return entry.text
+        if not entry.summary:
+            # Cached by the embedding summarizer, which stores no LSA summary
+            ArticleCache.set_summary(entry, FactCheckerService._summarize_text(entry.text, url))
+        return entry.summary
+
+    @staticmethod
+    def _read_html(response):
+        """
+        Reads a streamed response body for parsing, or returns None for
+        non-HTML content types without downloading the body.
+
+        At most FACTS_FETCH_MAX_BYTES are read; the parser only sees that
+        prefix. With a declared charset the text is decoded here, otherwise
+        the raw bytes go to BeautifulSoup to sniff the <meta> charset.
+        """
+        is_html, charset = FactCheckerService._html_content_type(response.headers.get('Content-Type', ''))
+        if not is_html:
+            return None
+
+        max_bytes = getattr(settings, 'FACTS_FETCH_MAX_BYTES', 2 * 1024 * 1024)
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                print(f"DEBUG: Truncated {response.url} at {max_bytes} bytes")
+                break
+        return FactCheckerService._decode_html(b''.join(chunks)[:max_bytes], charset)
+
+    @staticmethod
+    def _html_content_type(content_type):
+        """Returns (is_html, declared charset or None) for a Content-Type header."""
+        mime_type, _, params = content_type.partition(';')
+        mime_type = mime_type.strip().lower()
+        # Servers that send no Content-Type at all usually serve HTML
+        is_html = not mime_type or mime_type in ('text/html', 'application/xhtml+xml')
+
+        charset = None
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'charset' and value.strip():
+                charset = value.strip().strip('"\'')
+        return is_html, charset
+
+    @staticmethod
+    def _decode_html(body, charset):
+        if charset:
+            try:
+                return body.decode(charset, errors='replace')
+            except LookupError:
+                pass
+        return body
+
+    @staticmethod
+    def _extract_text(html):
+        """Joins the substantial text blocks of a page."""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Extract text from p, h1, h2, article tags
+        paragraphs = soup.find_all(['p', 'h1', 'h2', 'article'])
+        text_content = []
+
+        for p in paragraphs:
+            clean_text = p.get_text().strip()
+            if len(clean_text) > 30: # Lowered threshold from 50/100
+                text_content.append(clean_text)
+
+        return ' '.join(text_content)
+
+    @staticmethod
+    def _summarize_text(full_text, url):
+        """LSA summary of the page text, falling back to the (truncated) raw text."""
+        # Summarization Safety Block
+        try:
+            from sumy.nlp.tokenizers import Tokenizer
+            from sumy.parsers.html import HtmlParser
+            from sumy.summarizers.lsa import LsaSummarizer
+
+            with metrics.stage('summarize'):
+                parser = HtmlParser.from_string(full_text, None, Tokenizer("english"))
+                summarizer = LsaSummarizer()
+                summarizer.stop_words = [' ']
+                # Limit sentences to avoid huge blobs
+                summary = summarizer(parser.document, 10)
+
+            summary_text = " ".join([str(s) for s in summary])
+
+            if summary_text:
+                print(f"DEBUG: Successfully scraped & summarized: {url}")
+                return summary_text
+
+            # Fallback to raw text if summary fails but text exists
+            print(f"DEBUG: LSA Empty, used raw text: {url}")
+            return full_text[:5000] # Truncate large text
+
+        except Exception as sum_e:
+            print(f"DEBUG: Summarization Error for {url}: {sum_e}")
+            # Fallback to raw text
+            return full_text[:5000]
+
+    @staticmethod
+    def _scrape_and_report(url, headers, on_result=None, summarize=True, give_up=None, stop=None):
+        summary_text = FactCheckerService._scrape_single(url, headers, summarize, give_up, stop)
+        if summary_text and on_result is not None:
+            try:
+                on_result(url, summary_text, None)
+            except Exception as e:
+                print(f"DEBUG: Result callback failed for {url}: {e}")
+        return summary_text
+
+    @staticmethod
+    def _scrape_in_worker(url, headers, on_result=None, summarize=True, stop=None, give_up=None):
+        try:
+            if stop is not None and stop.is_set():
+                return None
+            return FactCheckerService._scrape_and_report(url, headers, on_result, summarize, give_up, stop)
+        finally:
+            # Pool threads are short-lived; don't leave their DB connections behind
+            connections.close_all()
+
+    @staticmethod
+    def scrape_and_summarize(urls, query_text, on_result=None):
+        """
+        Scrapes URLs with robust error handling and lower thresholds.
+
+        With FACTS_CONCURRENT_FETCH enabled the pages are fetched by a bounded
+        worker pool over a shared keep-alive session. Hosts are limited to
+        FACTS_FETCH_PER_HOST_LIMIT parallel requests and the whole stage gives
+        up on stragglers after FACTS_FETCH_DEADLINE seconds. Results always
+        come back in the original ranking order.
+
+        FACTS_SUMMARIZER picks the summaries: "lsa" runs sumy's LsaSummarizer
+        per page, "embedding" keeps the sentences closest to query_text
+        (see summarize_for_query).
+
+        on_result(url, summary, embedding), if given, is called as soon as each
+        page is summarized (from the worker thread in concurrent mode).
+        embedding is the summary's vector in embedding mode, None otherwise.
+        """
+        summaries, valid_urls, _ = FactCheckerService._collect_summaries(urls, query_text, on_result)
+        return summaries, valid_urls
+
+    @staticmethod
+    def _collect_summaries(urls, query_text, on_result=None, stop=None):
+        """
+        scrape_and_summarize, also returning the summary embeddings when the
+        summarizer made them. Once `stop` (a threading.Event) is set, pages
+        still being fetched are abandoned and only the finished ones are returned.
+        """
+        if FactCheckerService._summarizer_mode() != 'embedding':
+            summaries, valid_urls = FactCheckerService._fetch_pages(urls, on_result, summarize=True, stop=stop)
+            return summaries, valid_urls, None
+
+        page_callback = FactCheckerService._page_callback(query_text, on_result)
+        texts, valid_urls = FactCheckerService._fetch_pages(urls, page_callback, summarize=False, stop=stop)
+        # Sentences scored by the per-page callbacks are EmbeddingCache hits here
+        summaries, embeddings = FactCheckerService.summarize_for_query(texts, query_text)
+        return summaries, valid_urls, embeddings
+
+    @staticmethod
+    def stream_sources(urls, query_text, stop=None):
+        """
+        Streaming counterpart of _collect_summaries: yields (rank, url, summary,
+        embedding) as pages become ready, in completion order.
+
+        URLs (any iterable, consumed lazily) are fetched and extracted on
+        FACTS_FETCH_MAX_WORKERS threads. At most FACTS_STREAM_QUEUE_SIZE pages
+        wait for the encode stage, which takes whatever is ready (up to
+        FACTS_STREAM_BATCH pages) into one batched encoder call while the
+        next pages download. Page text is dropped once summarized. With
+        FACTS_SCORING='evidence' and LSA summaries, nothing is encoded here and
+        embedding is None: score_evidence encodes the sentences instead.
+        """
+        headers = FactCheckerService._build_headers()
+        # LSA summaries are made by the fetch workers; embedding summaries need the encoder
+        embedding_mode = FactCheckerService._summarizer_mode() == 'embedding'
+        workers = getattr(settings, 'FACTS_FETCH_MAX_WORKERS', 8)
+        if not getattr(settings, 'FACTS_CONCURRENT_FETCH', True):
+            workers = 1
+
+        deadline = getattr(settings, 'FACTS_FETCH_DEADLINE', 12)
+        give_up = time.monotonic() + deadline
+        # The fetches watch the same event the stream sets when it ends
+        stop = stop if stop is not None else threading.Event()
+
+        def fetch(ranked_url):
+            _, url = ranked_url
+            return FactCheckerService._scrape_single(url, headers, not embedding_mode, give_up, stop)
+
+        batches = streams.stream_map(
+            fetch, enumerate(urls),
+            workers=workers,
+            maxsize=getattr(settings, 'FACTS_STREAM_QUEUE_SIZE', 8),
+            max_batch=getattr(settings, 'FACTS_STREAM_BATCH', 8),
+            deadline=deadline,
+            stop=stop,
+        )
+        # Evidence scoring encodes the sentences itself; a whole-summary vector would go unused
+        evidence_mode = getattr(settings, 'FACTS_SCORING', 'summary') == 'evidence'
+        try:
+            for batch in batches:
+                pages = [text for _, text in batch]
+                if embedding_mode:
+                    summaries, embeddings = FactCheckerService.summarize_for_query(pages, query_text)
+                elif evidence_mode:
+                    summaries, embeddings = pages, [None] * len(pages)
+                else:
+                    summaries, embeddings = pages, encode_texts(pages)
+                for ((rank, url), _), summary, embedding in zip(batch, summaries, embeddings):
+                    yield rank, url, summary, embedding
+        finally:
+            batches.close()
+
+    @staticmethod
+    def _collect_streamed(urls, query_text, on_result=None, stop=None):
+        """
+        _collect_summaries on top of stream_sources: same return value, with
+        summaries back in ranking order (embeddings None when none were
+        made). Stops consuming once `stop` is set.
+        """
+        urls = list(urls)
+        print(f"DEBUG: Streaming {len(urls)} URLs...")
+        collected = []
+        for rank, url, summary, embedding in FactCheckerService.stream_sources(urls, query_text, stop):
+            collected.append((rank, url, summary, embedding))
+            if on_result is not None:
+                try:
+                    on_result(url, summary, embedding)
+                except Exception as e:
+                    print(f"DEBUG: Result callback failed for {url}: {e}")
+            if stop is not None and stop.is_set():
+                break
+
+        collected.sort(key=lambda entry: entry[0])
+        summaries = [summary for _, _, summary, _ in collected]
+        valid_urls = [url for _, url, _, _ in collected]
+        embeddings = [embedding for _, _, _, embedding in collected]
+        if any(embedding is None for embedding in embeddings):
+            embeddings = None
+        print(f"DEBUG: Total VALID Summaries: {len(summaries)}")
+        return summaries, valid_urls, embeddings
+
+    @staticmethod
+    def _summarizer_mode():
+        return getattr(settings, 'FACTS_SUMMARIZER', 'lsa')
+
+    @staticmethod
+    def _page_callback(query_text, on_result):
+        """Adapts on_result to raw page text: summarizes each page for the query before reporting it."""
+        if on_result is None:
+            return None
+
+        def page_callback(url, text, _):
+            page_summaries, page_embeddings = FactCheckerService.summarize_for_query([text], query_text)
+            on_result(url, page_summaries[0], page_embeddings[0])
+        return page_callback
+
+    @staticmethod
+    def _fetch_pages(urls, on_result=None, summarize=True, stop=None):
+        """Fetches pages (LSA summaries, or raw text with summarize=False) in ranking order."""
+        headers = FactCheckerService._build_headers()
+
         summaries = []
         valid_urls = []
-        
+
         print(f"DEBUG: Scraping {len(urls)} URLs...")
-        
-        for url in urls:
-            try:
-                # Timeout is crucial to prevent hanging
-                response = requests.get(url, headers=headers, timeout=5)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Extract text from p, h1, h2, article tags
-                    paragraphs = soup.find_all(['p', 'h1', 'h2', 'article'])
-                    text_content = []
-                    
-                    for p in paragraphs:
-                        clean_text = p.get_text().strip()
-                        if len(clean_text) > 30: # Lowered threshold from 50/100
-                            text_content.append(clean_text)
-                    
-                    full_text = ' '.join(text_content)
-                    
-                    if len(full_text) > 100: # Ensure we have at least some substantial content
-                        # Summarization Safety Block
-                        try:
-                            parser = HtmlParser.from_string(full_text, None, Tokenizer("english"))
-                            summarizer = LsaSummarizer()
-                            summarizer.stop_words = [' ']
-                            # Limit sentences to avoid huge blobs
-                            summary = summarizer(parser.document, 10) 
-                            
-                            summary_text = " ".join([str(s) for s in summary])
-                            
-                            if summary_text:
-                                summaries.append(summary_text)
-                                valid_urls.append(url)
-                                print(f"DEBUG: Successfully scraped & summarized: {url}")
-                            else:
-                                # Fallback to raw text if summary fails but text exists
-                                summaries.append(full_text[:5000]) # Truncate large text
-                                valid_urls.append(url)
-                                print(f"DEBUG: LSA Empty, used raw text: {url}")
-                                
-                        except Exception as sum_e:
-                            print(f"DEBUG: Summarization Error for {url}: {sum_e}")
-                            # Fallback to raw text
-                            summaries.append(full_text[:5000])
-                            valid_urls.append(url)
-                    else:
-                        print(f"DEBUG: Skipped {url} - Content too short ({len(full_text)} chars)")
-                else:
-                    print(f"DEBUG: Skipped {url} - Status Code {response.status_code}")
-                    
-            except Exception as e:
-                print(f"DEBUG: Error scraping {url}: {e}")
-                continue
-                
+
+        if getattr(settings, 'FACTS_CONCURRENT_FETCH', True) and len(urls) > 1:
+            results = FactCheckerService._scrape_concurrently(urls, headers, on_result, summarize, stop)
+        else:
+            results = []
+            for url in urls:
+                if stop is not None and stop.is_set():
+                    results.append(None)
+                    continue
+                results.append(FactCheckerService._scrape_and_report(url, headers, on_result, summarize))
+
+        for url, summary_text in zip(urls, results):
+            if summary_text:
+                summaries.append(summary_text)
+                valid_urls.append(url)
+
         print(f"DEBUG: Total VALID Summaries: {len(summaries)}")
         return summaries, valid_urls
 
     @staticmethod
-    def check_similarity(query, summaries):
-        """Calculates cosine similarity using SentenceTransformer (SBERT)."""
+    def split_sentences(text):
+        """Splits page text into sentences on terminal punctuation, dropping fragments."""
+        sentences = _SENTENCE_BOUNDARY.split(text)
+        return [s.strip() for s in sentences if len(s.strip()) >= 20]
+
+    @staticmethod
+    def summarize_for_query(texts, query):
+        """
+        Query-focused extractive summaries, replacing per-page LSA.
+
+        All sentences of all pages (up to FACTS_SUMMARY_MAX_SENTENCES per page)
+        are encoded together with the query in one batched SBERT call. Each
+        page keeps its FACTS_SUMMARY_SENTENCES sentences most similar to the
+        query, in reading order. The summary embedding is the mean of the kept
+        sentence embeddings, so scoring needs no second encode.
+
+        Returns (summaries, embeddings) aligned with texts.
+        """
+        if not texts:
+            return [], []
+
+        per_page = getattr(settings, 'FACTS_SUMMARY_MAX_SENTENCES', 150)
+        keep = getattr(settings, 'FACTS_SUMMARY_SENTENCES', 10)
+
+        page_sentences = []
+        for text in texts:
+            sentences = FactCheckerService.split_sentences(text)[:per_page]
+            page_sentences.append(sentences or [text[:5000]])
+
+        flat = [sentence for sentences in page_sentences for sentence in sentences]
+        with metrics.stage('summarize'):
+            embeddings = encode_texts([query] + flat)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.where(norms == 0, 1, norms)
+            scores = embeddings[1:] @ embeddings[0]
+
+        summaries = []
+        summary_embeddings = []
+        offset = 0
+        for sentences in page_sentences:
+            page_scores = scores[offset:offset + len(sentences)]
+            page_embeddings = embeddings[1 + offset:1 + offset + len(sentences)]
+            offset += len(sentences)
+
+            top = np.sort(np.argsort(-page_scores)[:keep])
+            summaries.append(" ".join(sentences[i] for i in top))
+            summary_embeddings.append(page_embeddings[top].mean(axis=0))
+
+        print(f"DEBUG: Query-focused summaries from {len(flat)} sentences across {len(texts)} pages")
+        return summaries, summary_embeddings
+
+    @staticmethod
+    def _scrape_concurrently(urls, headers, on_result=None, summarize=True, stop=None):
+        """Runs _scrape_single over a worker pool. Returns results aligned with urls."""
+        max_workers = min(getattr(settings, 'FACTS_FETCH_MAX_WORKERS', 8), len(urls))
+        deadline = getattr(settings, 'FACTS_FETCH_DEADLINE', 12)
+        give_up = time.monotonic() + deadline
+
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scrape')
+        futures = [executor.submit(FactCheckerService._scrape_in_worker, url, headers, on_result, summarize, stop,
+                                   give_up)
+                   for url in urls]
+        if stop is None:
+            done, not_done = wait(futures, timeout=deadline)
+        else:
+            # on_result runs inside the worker, so `stop` is already set when its future completes
+            done, not_done = set(), set(futures)
+            while not_done and not stop.is_set():
+                remaining = give_up - time.monotonic()
+                if remaining <= 0:
+                    break
+                finished, not_done = wait(not_done, timeout=remaining, return_when=FIRST_COMPLETED)
+                done |= finished
+        # Don't block the request on stragglers; their sockets time out on their own
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        if not_done and stop is not None and stop.is_set():
+            print(f"DEBUG: Verdict settled, abandoned {len(not_done)} outstanding URLs")
+        elif not_done:
+            print(f"DEBUG: Fetch deadline ({deadline}s) hit, dropped {len(not_done)} slow URLs")
+
+        return [f.result() if f in done else None for f in futures]
+
+    @staticmethod
+    def check_similarity(query, summaries, summary_embeddings=None):
+        """
+        Calculates cosine similarity using SentenceTransformer (SBERT).
+        Precomputed summary_embeddings (from summarize_for_query) skip the summary encode.
+        """
         if not summaries:
             return []
             
@@ -209,16 +1040,17 @@ class FactCheckerService:
         print("DEBUG: Calculating Similarities (SBERT)...")
         
         try:
-            # Encode query and all summaries in one batch for speed
-            # sentence_model.encode returns numpy arrays
-            model = get_sentence_model()
-            q_emb = model.encode(str(query))
-            s_embs = model.encode(summaries)
+            if summary_embeddings is not None:
+                q_emb = encode_texts([query])[0]
+                s_embs = np.vstack(summary_embeddings)
+            else:
+                # Encode query and all summaries in one batch for speed,
+                # only texts missing from the embedding cache reach the model
+                embeddings = encode_texts([query] + list(summaries))
+                q_emb = embeddings[0]
+                s_embs = embeddings[1:]
             
-            # Calculate cosine similarity
-            # cosine_similarity expects 2D arrays. 
-            # q_emb.reshape(1, -1) vs s_embs (n, 1024)
-            sim_scores = cosine_similarity([q_emb], s_embs)[0]
+            sim_scores = cosine_scores(q_emb, s_embs)
             
             # Convert to float list
             similarities = [float(s) for s in sim_scores]
@@ -230,6 +1062,64 @@ class FactCheckerService:
             print(f"DEBUG: SBERT Similarity Error: {e}")
             return [0.0] * len(summaries)
 
+    @staticmethod
+    def score_evidence(query, texts, top_k=None):
+        """
+        Sentence-level scoring: every sentence of every text is encoded in one
+        batch (so nothing is cut off at the model's max sequence length) and
+        compared with the query in a single matrix product.
+
+        Returns one dict per text: "score", its best sentence's similarity,
+        and "sentences", its top_k (FACTS_EVIDENCE_SENTENCES) sentences as
+        {"text", "score"}, best first.
+        """
+        if not texts:
+            return []
+        top_k = top_k or getattr(settings, 'FACTS_EVIDENCE_SENTENCES', 3)
+        per_page = getattr(settings, 'FACTS_SUMMARY_MAX_SENTENCES', 150)
+
+        page_sentences = []
+        for text in texts:
+            sentences = FactCheckerService.split_sentences(text)[:per_page]
+            page_sentences.append(sentences or [text[:5000]])
+
+        flat = [sentence for sentences in page_sentences for sentence in sentences]
+        try:
+            with metrics.stage('evidence'):
+                # The embedding summarizer already encoded these sentences: EmbeddingCache hits
+                embeddings = encode_texts([query] + flat)
+                scores = cosine_scores(embeddings[0], embeddings[1:])
+        except Exception as e:
+            print(f"DEBUG: Evidence Scoring Error: {e}")
+            return [{"score": 0.0, "sentences": []} for _ in texts]
+
+        evidence = []
+        offset = 0
+        for sentences in page_sentences:
+            page_scores = scores[offset:offset + len(sentences)]
+            offset += len(sentences)
+            top = np.argsort(-page_scores)[:top_k]
+            evidence.append({
+                "score": float(page_scores[top[0]]),
+                "sentences": [{"text": sentences[i], "score": float(page_scores[i])} for i in top],
+            })
+
+        best = [f"{e['score']:.3f}" for e in evidence]
+        print(f"DEBUG: Evidence Scores: {best} ({len(flat)} sentences)")
+        return evidence
+
+    @staticmethod
+    def score_sources(query, summaries, summary_embeddings=None):
+        """
+        Scores sources with the FACTS_SCORING mode: "summary" compares one
+        embedding per summary (check_similarity), "evidence" its best sentence
+        (score_evidence). Returns (scores, evidence or None).
+        """
+        if getattr(settings, 'FACTS_SCORING', 'summary') == 'evidence':
+            evidence = FactCheckerService.score_evidence(query, summaries)
+            return [e['score'] for e in evidence], evidence
+        return FactCheckerService.check_similarity(query, summaries, summary_embeddings), None
+
     @staticmethod
     def classify_verdict(avg_similarity, max_similarity, source_count, query):
         """
@@ -242,6 +1132,11 @@ class FactCheckerService:
         4. Strong Fake: max_sim <= 0.15 and sources >= 3 (Negative Confirmation)
         5. Insufficient Data: sources == 0 (Handled by caller usually)
         """
+        with metrics.stage('verdict'):
+            return FactCheckerService._classify_verdict(avg_similarity, max_similarity, source_count, query)
+
+    @staticmethod
+    def _classify_verdict(avg_similarity, max_similarity, source_count, query):
         print(f"DEBUG: Verdict Check - Avg: {avg_similarity:.4f}, Max: {max_similarity:.4f}, Sources: {source_count}")
         
         # Default State
@@ -250,19 +1145,20 @@ class FactCheckerService:
 
         try:
             # 1. Strong True
-            if max_similarity >= 0.45 and source_count >= 1:
+            if max_similarity >= FactCheckerService.STRONG_TRUE_MAX and source_count >= 1:
                 verdict = "The News is True (High Confidence)"
                 rule_triggered = "Strong True (Max >= 0.45)"
             
             # 2. Likely True
-            elif avg_similarity >= 0.25 and max_similarity >= 0.30:
+            elif (avg_similarity >= FactCheckerService.LIKELY_TRUE_AVG
+                  and max_similarity >= FactCheckerService.LIKELY_TRUE_MAX):
                 verdict = "The News is Likely True (Medium Confidence)"
                 rule_triggered = "Likely True (Avg >= 0.25, Max >= 0.30)"
             
             # 4. Strong Fake (Negative Confirmation)
             # We ONLY return Fake if we found plenty of sources (3+) and NONE of them matched well.
             # This implies the claim is likely made up or not reflected in reputable news.
-            elif max_similarity <= 0.15 and source_count >= 3:
+            elif max_similarity <= FactCheckerService.STRONG_FAKE_MAX and source_count >= 3:
                 verdict = "We can classify the news as Fake (Low Similarity across multiple sources)"
                 rule_triggered = "Strong Fake (Max <= 0.15, Sources >= 3)"
             
@@ -302,12 +1198,368 @@ class FactCheckerService:
             print(f"DEBUG: General Verdict Error: {e}")
             return "Unable to Verify (System Error)"
 
+    @staticmethod
+    def confidence_label(verdict):
+        """Simplified confidence label for the API clients."""
+        if "True" in verdict:
+            return "High" if "High" in verdict else "Medium"
+        if "Fake" in verdict:
+            return "High"
+        return "Low"
+
+    @staticmethod
+    def verify_claim(claim, on_event=None):
+        """
+        Runs the whole verification pipeline for the API and returns a dict
+        with the verdict, confidence, source URLs and their scores.
+
+        on_event(stage, data), if given, reports progress as it happens:
+        "urls_found" with the search results, "source_scored" for every page
+        as soon as it is summarized and scored, and "verdict" with the result.
+        """
+        def emit(stage, data):
+            if on_event is not None:
+                on_event(stage, data)
+
+        cached = FactCheckerService.get_cached_verdict(claim)
+        if cached:
+            result = FactCheckerService._cached_result(claim, cached)
+            emit("verdict", result)
+            return result
+
+        matches = FactCheckerService.lookup_known_claims(claim)
+        result = FactCheckerService._known_claim_result(claim, matches)
+        if result is None:
+            run = FactCheckerService.verification_graph(claim, on_event).run()
+            result = run.results['verdict']
+            result["known_claims"] = matches
+        emit("verdict", result)
+        return result
+
+    @staticmethod
+    def lookup_known_claims(claim, k=None):
+        """
+        Nearest labeled headlines from the local PolitiFact / GossipCop index,
+        best first, as dicts with title, label ("fake" / "real"), dataset, url
+        and score. Empty when the index hasn't been built.
+        """
+        try:
+            index = get_known_claims_index()
+            if index is None:
+                return []
+            with metrics.stage('known_claims'):
+                k = k or getattr(settings, 'FACTS_KNOWN_CLAIMS_TOP_K', 5)
+                return index.search(encode_texts([claim])[0], k)
+        except Exception as e:
+            print(f"DEBUG: Known-claims lookup failed: {e}")
+            return []
+
+    @staticmethod
+    def _known_claim_result(claim, matches):
+        """
+        Verdict straight from the index when the claim is (nearly) a labeled
+        headline, i.e. the best match scores FACTS_KNOWN_CLAIMS_MATCH or more.
+        None otherwise, and the claim is verified on the web.
+        """
+        threshold = getattr(settings, 'FACTS_KNOWN_CLAIMS_MATCH', 0.9)
+        if threshold is None or not matches or matches[0]['score'] < threshold:
+            return None
+
+        best = matches[0]
+        print(f"DEBUG: Known {best['label']} headline ({best['score']:.3f}): {best['title']}")
+        if best['label'] == 'fake':
+            verdict = "We can classify the news as Fake (Matches a headline fact-checked as fake)"
+        else:
+            verdict = "The News is Likely True (Matches a headline fact-checked as real)"
+        return {
+            "claim": claim,
+            "verdict": verdict,
+            "confidence": FactCheckerService.confidence_label(verdict),
+            "sources": [best['url']] if best['url'] else [],
+            "scores": [best['score']],
+            "details": f"Matched a {best['label']} headline from {best['dataset']}: {best['title']}",
+            "cached": False,
+            "known_claims": matches,
+        }
+
+    @staticmethod
+    def verification_graph(claim, on_event=None, with_image=False, name='verify'):
+        """
+        The pipeline as a StageGraph (see facts/pipeline.py):
+
+            search -> sources -> scores -> verdict
+            image ------------------------^        (with_image only)
+
+        "sources" holds (summaries, valid_urls, summary_embeddings), streamed
+        through stream_sources with FACTS_STREAMING_PIPELINE, "scores" the
+        (scores, evidence) of score_sources and "verdict" the result dict of
+        verify_claim. The claim is encoded next
+        to the search, so scoring finds it in the EmbeddingCache. Callers may
+        add stages of their own before running it.
+        """
+        def search(results):
+            top_urls = FactCheckerService.search_web(FactCheckerService.get_date_range_query(claim))
+            if on_event is not None:
+                on_event("urls_found", {"urls": top_urls})
+            return top_urls
+
+        def claim_embedding(results):
+            # Only warms the EmbeddingCache: on failure score_sources encodes it again
+            try:
+                return encode_texts([claim])[0]
+            except Exception as e:
+                print(f"DEBUG: Claim embedding failed: {e}")
+                return None
+
+        def sources(results):
+            stop = threading.Event()
+            on_result = FactCheckerService._source_scorer(claim, on_event, len(results['search']), stop)
+            if getattr(settings, 'FACTS_STREAMING_PIPELINE', True):
+                return FactCheckerService._collect_streamed(results['search'], claim, on_result, stop)
+            return FactCheckerService._collect_summaries(results['search'], claim, on_result, stop)
+
+        def scores(results):
+            summaries, _, summary_embeddings = results['sources']
+            return FactCheckerService.score_sources(claim, summaries, summary_embeddings)
+
+        def verdict(results):
+            valid_urls = results['sources'][1]
+            similarities, evidence = results['scores']
+            return FactCheckerService._verdict_result(
+                claim, valid_urls, similarities, image_url=results.get('image') or '', evidence=evidence)
+
+        graph = StageGraph(name)
+        graph.add('search', search)
+        graph.add('claim_embedding', claim_embedding)
+        graph.add('sources', sources, deps=['search'])
+        graph.add('scores', scores, deps=['sources', 'claim_embedding'])
+        verdict_deps = ['scores']
+        if with_image:
+            graph.add('image', lambda results: FactCheckerService.fetch_image(claim))
+            verdict_deps.append('image')
+        graph.add('verdict', verdict, deps=verdict_deps)
+        return graph
+
+    @staticmethod
+    def _source_scorer(claim, on_event, expected=0, stop=None):
+        """
+        on_result callback scoring each page as soon as it is summarized. It
+        emits a "source_scored" event per page (with on_event) and, when
+        FACTS_EARLY_EXIT is set and `stop` is given, sets `stop` once
+        verdict_settled() says the rest of the `expected` pages can't change
+        the outcome. None when there is nothing to do per page.
+        """
+        policy = FactCheckerService._early_exit_policy() if stop is not None else None
+        if on_event is None and not policy:
+            return None
+
+        scores = []
+        lock = threading.Lock()
+
+        def score_source(url, summary, embedding):
+            # Embeddings land in the EmbeddingCache, so scoring reuses them afterwards
+            embeddings = None if embedding is None else [embedding]
+            score = FactCheckerService.score_sources(claim, [summary], embeddings)[0][0]
+            if on_event is not None:
+                on_event("source_scored", {"url": url, "score": score})
+            if not policy:
+                return
+            with lock:
+                scores.append(score)
+                # Pages that failed never report, so they count as still pending
+                settled = FactCheckerService.verdict_settled(scores, expected - len(scores), policy)
+                first = settled and not stop.is_set()
+                if first:
+                    stop.set()
+            if first:
+                print(f"DEBUG: Verdict settled ({policy}) after {len(scores)} of {expected} sources")
+                metrics.EARLY_EXITS.inc(policy=policy)
+        return score_source
+
+    @staticmethod
+    def _early_exit_policy():
+        policy = getattr(settings, 'FACTS_EARLY_EXIT', None)
+        return policy if policy in ('final', 'true') else None
+
+    @staticmethod
+    def verdict_settled(scores, remaining, policy):
+        """
+        Whether `remaining` more sources can no longer change the verdict for
+        the scores seen so far, under an early-exit policy:
+
+            "final"  the verdict itself is fixed. Only Strong True is: the max
+                     similarity never drops as sources are added.
+            "true"   the verdict is sure to be one of the True ones, even if
+                     every remaining source scores FACTS_EARLY_EXIT_FLOOR. A
+                     Likely True may then be reported where the full run would
+                     have reached Strong True.
+        """
+        if not scores:
+            return False
+        best = max(scores)
+        if best >= FactCheckerService.STRONG_TRUE_MAX:
+            return True
+        if policy != 'true' or best < FactCheckerService.LIKELY_TRUE_MAX:
+            return False
+        floor = getattr(settings, 'FACTS_EARLY_EXIT_FLOOR', 0.0)
+        worst_avg = (sum(scores) + max(remaining, 0) * floor) / (len(scores) + max(remaining, 0))
+        return worst_avg >= FactCheckerService.LIKELY_TRUE_AVG
+
+    @staticmethod
+    def _cached_result(claim, cached):
+        return {
+            "claim": claim,
+            "verdict": cached['verdict'],
+            "confidence": FactCheckerService.confidence_label(cached['verdict']),
+            "sources": cached['sources'],
+            "scores": cached['scores'],
+            "details": f"Matched previously verified claim: {cached['claim']}",
+            "cached": True,
+        }
+
+    @staticmethod
+    def _verdict_result(claim, valid_urls, similarities, image_url='', evidence=None):
+        """
+        Classifies the scored sources, remembers the verdict and builds the API
+        result. With evidence from score_evidence, the result lists each
+        source's best sentences under "evidence".
+        """
+        verdict = "Insufficient Data"
+        if similarities:
+            verdict = FactCheckerService.classify_verdict(
+                np.mean(similarities), np.max(similarities), len(valid_urls), claim
+            )
+            # check_similarity and score_evidence fall back to all-zero scores
+            # when encoding fails; that "Fake" mustn't be served to other claims
+            if any(similarities):
+                FactCheckerService.store_verdict(claim, verdict, valid_urls, similarities, image_url)
+            else:
+                print("DEBUG: Scoring failed, verdict not cached")
+
+        result = {
+            "claim": claim,
+            "verdict": verdict,
+            "confidence": FactCheckerService.confidence_label(verdict),
+            "sources": valid_urls,
+            "scores": similarities,
+            "details": "Verified against live web sources.",
+            "cached": False,
+        }
+        if evidence is not None:
+            result["evidence"] = [
+                {"url": url, "score": e['score'], "sentences": e['sentences']}
+                for url, e in zip(valid_urls, evidence)
+            ]
+        return result
+
+    @staticmethod
+    def _gather_sources(claim):
+        """Search + scrape stage of the batch pipeline, run per claim on the batch pool."""
+        try:
+            search_query = FactCheckerService.get_date_range_query(claim)
+            top_urls = FactCheckerService.search_web(search_query)
+            return FactCheckerService._collect_summaries(top_urls, claim)
+        finally:
+            connections.close_all()
+
+    @staticmethod
+    def verify_claims(claims):
+        """
+        Verifies many claims, yielding (index, result) pairs as they complete.
+
+        All claims are encoded in one SBERT call up front (which also serves
+        the verdict cache lookups). Search and scraping then run concurrently
+        across claims on FACTS_BATCH_WORKERS threads. Every time claims finish
+        gathering, the summaries of all of them are encoded in a single
+        batched call before their verdicts are classified and yielded.
+        """
+        claims = [str(c) for c in claims]
+        model_name = get_embedding_key()
+        claim_embeddings = encode_texts(claims)
+
+        remaining = []
+        for index, claim in enumerate(claims):
+            cached = VerdictCache.lookup(claim_embeddings[index], model_name) if VerdictCache.enabled() else None
+            if cached:
+                yield index, FactCheckerService._cached_result(claim, cached)
+            else:
+                remaining.append(index)
+
+        if not remaining:
+            return
+
+        workers = min(getattr(settings, 'FACTS_BATCH_WORKERS', 4), len(remaining))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='verify-batch')
+        pending = {executor.submit(FactCheckerService._gather_sources, claims[i]): i for i in remaining}
+
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                ready = []
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        summaries, valid_urls, embeddings = future.result()
+                        ready.append((index, summaries, valid_urls, embeddings))
+                    except Exception as e:
+                        print(f"DEBUG: Batch gather failed for '{claims[index]}': {e}")
+                        yield index, {"claim": claims[index], "error": str(e)}
+
+                if getattr(settings, 'FACTS_SCORING', 'summary') == 'evidence':
+                    for index, summaries, valid_urls, embeddings in ready:
+                        similarities, evidence = FactCheckerService.score_sources(claims[index], summaries)
+                        yield index, FactCheckerService._verdict_result(
+                            claims[index], valid_urls, similarities, evidence=evidence)
+                    continue
+
+                # One encoder pass for every summary that became available
+                # (the embedding summarizer already produced its vectors)
+                to_encode = [text for _, summaries, _, embeddings in ready if embeddings is None for text in summaries]
+                encoded = encode_texts(to_encode) if to_encode else None
+
+                offset = 0
+                for index, summaries, valid_urls, embeddings in ready:
+                    similarities = []
+                    if summaries:
+                        if embeddings is None:
+                            embeddings = encoded[offset:offset + len(summaries)]
+                            offset += len(summaries)
+                        similarities = [float(x) for x in cosine_scores(claim_embeddings[index], np.vstack(embeddings))]
+                    yield index, FactCheckerService._verdict_result(claims[index], valid_urls, similarities)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def get_cached_verdict(claim):
+        """Returns a stored verdict for the same or a reworded claim, or None (see VerdictCache)."""
+        if not VerdictCache.enabled():
+            return None
+        try:
+            embedding = encode_texts([claim])[0]
+        except Exception as e:
+            print(f"DEBUG: Verdict cache embedding failed: {e}")
+            return None
+        return VerdictCache.lookup(embedding, get_embedding_key())
+
+    @staticmethod
+    def store_verdict(claim, verdict, sources, scores, image_url=''):
+        """Remembers a verdict so near-duplicate claims can reuse it."""
+        if not VerdictCache.enabled():
+            return
+        try:
+            # Already encoded by check_similarity, so this is an EmbeddingCache hit
+            embedding = encode_texts([claim])[0]
+        except Exception as e:
+            print(f"DEBUG: Verdict cache embedding failed: {e}")
+            return
+        VerdictCache.store(claim, embedding, get_embedding_key(), verdict, sources, scores, image_url)
+
     @staticmethod
     def fetch_image(query):
         """Fetches a relevant image for the news query."""
         print(f"DEBUG: Fetching image for '{query}'...")
         try:
-            with DDGS() as ddgs:
+            with metrics.stage('image') as outcome, get_ddgs() as ddgs:
                 # Use a specific keyword to bias towards news photos
                 image_query = f"{query} news"
                 images = list(ddgs.images(image_query, max_results=1))
@@ -315,7 +1567,284 @@ class FactCheckerService:
                     img_url = images[0]['image']
                     print(f"DEBUG: Found image: {img_url}")
                     return img_url
+                outcome.status = 'empty'
         except Exception as e:
             print(f"DEBUG: Image Fetch Error: {e}")
         
         return None
+
+    # Async pipeline for the ASGI deployment. Same stages and results as the
+    # sync methods above: page downloads are awaited on httpx, the sync search
+    # libraries run in threads, and CPU work plus the DB caches go to
+    # run_blocking, so an in-flight verification holds no thread while it waits.
+
+    @staticmethod
+    async def asearch_web(query, num_results=10):
+        """Async search_web."""
+        print(f"DEBUG: Starting Search for '{query}'")
+
+        cached = await run_blocking(SearchResultCache.get, query, num_results)
+        if cached is not None:
+            return [r['url'] for r in cached]
+
+        ddgs = get_ddgs()
+        cheap, fallbacks = FactCheckerService._search_strategies(query, num_results, ddgs)
+
+        results = []
+        if getattr(settings, 'FACTS_PARALLEL_SEARCH', True):
+            results = await FactCheckerService._arace_strategies(cheap, fallbacks)
+        else:
+            for name, strategy in cheap + fallbacks:
+                results = await run_search(FactCheckerService._run_strategy, name, strategy)
+                if results:
+                    break
+
+        ranked = FactCheckerService._rank_results(results)
+        await run_blocking(SearchResultCache.set, query, num_results, ranked)
+
+        print(f"DEBUG: Total URLs Found: {len(ranked)}")
+        return [r['url'] for r in ranked]
+
+    @staticmethod
+    async def _arace_strategies(cheap, fallbacks):
+        """Async _race_strategies, with the same hedge delay and deadline."""
+        hedge_delay = getattr(settings, 'FACTS_SEARCH_HEDGE_DELAY', 3)
+        deadline = getattr(settings, 'FACTS_SEARCH_DEADLINE', 20)
+        started = time.monotonic()
+
+        def launch(strategies):
+            return {asyncio.ensure_future(run_search(FactCheckerService._run_strategy, name, fn))
+                    for name, fn in strategies}
+
+        pending = launch(cheap)
+        fallbacks_started = False
+        results = []
+
+        try:
+            while pending and not results:
+                elapsed = time.monotonic() - started
+                if elapsed >= deadline:
+                    print(f"DEBUG: Search deadline ({deadline}s) hit")
+                    break
+
+                timeout = deadline - elapsed
+                if not fallbacks_started:
+                    timeout = min(timeout, max(hedge_delay - elapsed, 0))
+
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.result():
+                        results = task.result()
+                        break
+
+                hedge_due = time.monotonic() - started >= hedge_delay
+                if not results and not fallbacks_started and (hedge_due or not pending):
+                    print("DEBUG: Primary search slow or empty, starting fallbacks")
+                    pending |= launch(fallbacks)
+                    fallbacks_started = True
+        finally:
+            # Losing strategies finish in their threads; their results are dropped
+            for task in pending:
+                task.cancel()
+
+        return results
+
+    @staticmethod
+    async def _ascrape_single(url, headers, summarize=True, give_up=None):
+        """Async _scrape_single."""
+        import httpx
+
+        try:
+            cached = await run_blocking(ArticleCache.get, url)
+            if cached is not None and ArticleCache.is_fresh(cached):
+                print(f"DEBUG: Article cache hit: {url}")
+                return await run_blocking(FactCheckerService._cached_page, cached, url, summarize)
+
+            skip_reason = await HostRegistry.acheck(url, headers)
+            if skip_reason:
+                print(f"DEBUG: Skipped {url} - {skip_reason}")
+                return None
+
+            request_headers = dict(headers)
+            if cached is not None:
+                request_headers.update(ArticleCache.conditional_headers(cached))
+
+            timeout = getattr(settings, 'FACTS_FETCH_TIMEOUT', 5)
+            async with _async_host_slot(url, give_up):
+                with metrics.stage('fetch') as outcome:
+                    client = get_async_http_client()
+                    requested = time.monotonic()
+                    try:
+                        async with client.stream('GET', url, headers=request_headers, timeout=timeout) as response:
+                            html = None
+                            if response.status_code == 200:
+                                html = await FactCheckerService._aread_html(response)
+                                if html is None:
+                                    outcome.status = 'skipped'
+                            elif response.status_code != 304:
+                                outcome.status = 'failure'
+                    except httpx.HTTPError as e:
+                        HostRegistry.record_error(
+                            url, time.monotonic() - requested, timeout=isinstance(e, httpx.TimeoutException))
+                        raise
+                    except asyncio.CancelledError:
+                        # Cut off by the deadline or an early exit, not the host's doing
+                        outcome.status = 'cancelled'
+                        raise
+                    HostRegistry.record(url, response.status_code, time.monotonic() - requested,
+                                        parse_retry_after(response.headers.get('Retry-After')))
+
+            if response.status_code == 304 and cached is not None:
+                await run_blocking(ArticleCache.revalidated, cached)
+                print(f"DEBUG: Article not modified (304): {url}")
+                return await run_blocking(FactCheckerService._cached_page, cached, url, summarize)
+
+            if response.status_code != 200:
+                print(f"DEBUG: Skipped {url} - Status Code {response.status_code}")
+                return None
+
+            if html is None:
+                print(f"DEBUG: Skipped {url} - Not HTML ({response.headers.get('Content-Type')})")
+                return None
+
+            return await run_blocking(FactCheckerService._process_page, url, html, response.headers, summarize)
+
+        except SlotUnavailable as e:
+            print(f"DEBUG: Skipped {url} - {e}")
+            return None
+        except Exception as e:
+            print(f"DEBUG: Error scraping {url}: {e}")
+            return None
+
+    @staticmethod
+    async def _aread_html(response):
+        """Async _read_html for a streamed httpx response."""
+        is_html, charset = FactCheckerService._html_content_type(response.headers.get('Content-Type', ''))
+        if not is_html:
+            return None
+
+        max_bytes = getattr(settings, 'FACTS_FETCH_MAX_BYTES', 2 * 1024 * 1024)
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                print(f"DEBUG: Truncated {response.url} at {max_bytes} bytes")
+                break
+        return FactCheckerService._decode_html(b''.join(chunks)[:max_bytes], charset)
+
+    @staticmethod
+    async def _ascrape_and_report(url, headers, on_result=None, summarize=True, give_up=None):
+        summary_text = await FactCheckerService._ascrape_single(url, headers, summarize, give_up)
+        if summary_text and on_result is not None:
+            try:
+                # Callbacks score the page, which is encoder work
+                await run_blocking(on_result, url, summary_text, None)
+            except Exception as e:
+                print(f"DEBUG: Result callback failed for {url}: {e}")
+        return summary_text
+
+    @staticmethod
+    async def _afetch_pages(urls, on_result=None, summarize=True, stop=None):
+        """
+        Async _fetch_pages: every URL is in flight at once, bounded per host and
+        by FACTS_FETCH_DEADLINE. Downloads still running when `stop` is set are cancelled.
+        """
+        headers = FactCheckerService._build_headers()
+        deadline = getattr(settings, 'FACTS_FETCH_DEADLINE', 12)
+        give_up = time.monotonic() + deadline
+
+        print(f"DEBUG: Scraping {len(urls)} URLs...")
+
+        tasks = [asyncio.ensure_future(
+                     FactCheckerService._ascrape_and_report(url, headers, on_result, summarize, give_up))
+                 for url in urls]
+        results = []
+        if tasks:
+            if stop is None:
+                done, not_done = await asyncio.wait(tasks, timeout=deadline)
+            else:
+                done, not_done = set(), set(tasks)
+                while not_done and not stop.is_set():
+                    remaining = give_up - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    finished, not_done = await asyncio.wait(
+                        not_done, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                    done |= finished
+            for task in not_done:
+                task.cancel()
+            if not_done and stop is not None and stop.is_set():
+                print(f"DEBUG: Verdict settled, cancelled {len(not_done)} outstanding URLs")
+            elif not_done:
+                print(f"DEBUG: Fetch deadline ({deadline}s) hit, dropped {len(not_done)} slow URLs")
+            results = [task.result() if task in done else None for task in tasks]
+
+        summaries = []
+        valid_urls = []
+        for url, summary_text in zip(urls, results):
+            if summary_text:
+                summaries.append(summary_text)
+                valid_urls.append(url)
+
+        print(f"DEBUG: Total VALID Summaries: {len(summaries)}")
+        return summaries, valid_urls
+
+    @staticmethod
+    async def ascrape_and_summarize(urls, query_text, on_result=None):
+        """Async scrape_and_summarize. on_result runs on the CPU pool."""
+        summaries, valid_urls, _ = await FactCheckerService._acollect_summaries(urls, query_text, on_result)
+        return summaries, valid_urls
+
+    @staticmethod
+    async def _acollect_summaries(urls, query_text, on_result=None, stop=None):
+        if FactCheckerService._summarizer_mode() != 'embedding':
+            summaries, valid_urls = await FactCheckerService._afetch_pages(urls, on_result, summarize=True, stop=stop)
+            return summaries, valid_urls, None
+
+        page_callback = FactCheckerService._page_callback(query_text, on_result)
+        texts, valid_urls = await FactCheckerService._afetch_pages(urls, page_callback, summarize=False, stop=stop)
+        summaries, embeddings = await run_blocking(FactCheckerService.summarize_for_query, texts, query_text)
+        return summaries, valid_urls, embeddings
+
+    @staticmethod
+    async def afetch_image(query):
+        """Async fetch_image. The DDG client is synchronous, so it runs on the search pool."""
+        return await run_search(FactCheckerService.fetch_image, query)
+
+    @staticmethod
+    async def averify_claim(claim, on_event=None):
+        """Async verify_claim, with the same result dict and progress events."""
+        def emit(stage, data):
+            if on_event is not None:
+                on_event(stage, data)
+
+        cached = await run_blocking(FactCheckerService.get_cached_verdict, claim)
+        if cached:
+            result = FactCheckerService._cached_result(claim, cached)
+            emit("verdict", result)
+            return result
+
+        matches = await run_blocking(FactCheckerService.lookup_known_claims, claim)
+        result = FactCheckerService._known_claim_result(claim, matches)
+        if result is not None:
+            emit("verdict", result)
+            return result
+
+        search_query = FactCheckerService.get_date_range_query(claim)
+        top_urls = await FactCheckerService.asearch_web(search_query)
+        emit("urls_found", {"urls": top_urls})
+
+        stop = threading.Event()
+        summaries, valid_urls, summary_embeddings = await FactCheckerService._acollect_summaries(
+            top_urls, claim, FactCheckerService._source_scorer(claim, on_event, len(top_urls), stop), stop
+        )
+
+        similarities, evidence = await run_blocking(
+            FactCheckerService.score_sources, claim, summaries, summary_embeddings)
+        result = await run_blocking(
+            functools.partial(FactCheckerService._verdict_result, claim, valid_urls, similarities, evidence=evidence))
+        result["known_claims"] = matches
+        emit("verdict", result)
+        return result
@@ -0,0 +1,100 @@
+"""
+Bounded, threaded generator stages for the streaming verification pipeline.
+
+stream_map() runs a function over an iterable on a few threads and yields the
+results in completion order, grouped into batches of whatever is ready.
+Results wait in a queue of at most `maxsize` items: when the consumer (say,
+the encoder) falls behind, the workers block instead of piling up pages, so
+memory stays flat however many items flow through.
+"""
+import queue
+import threading
+import time
+
+from django.db import connections
+
+_DONE = object()
+
+
+def stream_map(fn, items, workers=4, maxsize=8, max_batch=16, deadline=None, stop=None):
+    """
+    Yields lists of (item, fn(item)) as results come in, at most `max_batch`
+    per list. Items for which fn returns None or raises are dropped. `items`
+    is consumed lazily, so it may be a generator.
+
+    Workers stop taking items after `deadline` seconds; results they queued
+    before it are still yielded, however long the consumer took over earlier
+    batches. Everything stops once `stop` (a threading.Event) is set or the
+    generator is closed; workers then quit after their current item.
+    """
+    stop = stop if stop is not None else threading.Event()
+    results = queue.Queue(maxsize=maxsize)
+    source = iter(items)
+    source_lock = threading.Lock()
+    give_up = None if deadline is None else time.monotonic() + deadline
+
+    def halted():
+        return stop.is_set() or (give_up is not None and time.monotonic() >= give_up)
+
+    def put(value):
+        while not halted():
+            try:
+                results.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def work():
+        try:
+            while not halted():
+                with source_lock:
+                    item = next(source, _DONE)
+                if item is _DONE:
+                    break
+                try:
+                    value = fn(item)
+                except Exception as e:
+                    print(f"DEBUG: Stream stage failed for {item!r}: {e}")
+                    continue
+                if value is not None and not put((item, value)):
+                    break
+        finally:
+            # Don't leave a DB connection behind per stream thread
+            connections.close_all()
+            put(_DONE)
+
+    threads = [threading.Thread(target=work, name=f'stream-{i}', daemon=True) for i in range(max(workers, 1))]
+    for thread in threads:
+        thread.start()
+
+    running = len(threads)
+    try:
+        while running and not stop.is_set():
+            expired = give_up is not None and time.monotonic() >= give_up
+            try:
+                # Past the deadline only what is already queued is taken; short
+                # waits before it, so `stop` is noticed while workers are busy
+                value = results.get_nowait() if expired else results.get(timeout=0.1)
+            except queue.Empty:
+                if expired:
+                    print(f"DEBUG: Stream deadline ({deadline}s) hit with {running} workers still busy")
+                    break
+                continue
+
+            batch = []
+            while True:
+                if value is _DONE:
+                    running -= 1
+                else:
+                    batch.append(value)
+                if len(batch) >= max_batch:
+                    break
+                try:
+                    value = results.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                yield batch
+    finally:
+        stop.set()
@@ -1,3 +1,812 @@
-from django.test import TestCase
+import asyncio
+import contextlib
+import datetime
+import os
+import re
+import tempfile
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import known_claims, metrics
+from .cache import ArticleCache, EmbeddingCache, SearchResultCache, VerdictCache
+from .encoders import EncodeBatcher
+from .hosts import HostRegistry, SlotUnavailable
+from .jobs import JobQueue
+from .models import ArticleCacheEntry, SearchCacheEntry, VerdictCacheEntry, VerificationJobEntry
+from .pipeline import StageGraph
+from .services import FactCheckerService, _host_slot
+from .streams import stream_map
+
+
+def slow_scrape(delays):
+    """_scrape_and_report stand-in: sleeps delays[url] seconds, then returns the url in upper case."""
+    def scrape(url, *args):
+        time.sleep(delays[url])
+        return url.upper()
+    return scrape
+
+
+class ScrapeConcurrentlyTests(SimpleTestCase):
+    urls = ["https://a.example/", "https://b.example/", "https://c.example/"]
+
+    def test_results_keep_the_ranking_order(self):
+        # The first-ranked page finishes last
+        delays = {self.urls[0]: 0.2, self.urls[1]: 0.1, self.urls[2]: 0.0}
+        with mock.patch.object(FactCheckerService, '_scrape_and_report', side_effect=slow_scrape(delays)):
+            results = FactCheckerService._scrape_concurrently(self.urls, {})
+        self.assertEqual(results, [url.upper() for url in self.urls])
+
+    @override_settings(FACTS_FETCH_DEADLINE=0.2)
+    def test_slow_pages_are_dropped_at_the_deadline(self):
+        delays = {self.urls[0]: 0.0, self.urls[1]: 2, self.urls[2]: 0.0}
+        started = time.monotonic()
+        with mock.patch.object(FactCheckerService, '_scrape_and_report', side_effect=slow_scrape(delays)):
+            results = FactCheckerService._scrape_concurrently(self.urls, {})
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(results, [self.urls[0].upper(), None, self.urls[2].upper()])
+
+
+def strategy(result, delay=0.0, calls=None, name=None):
+    def run():
+        if calls is not None:
+            calls.append(name)
+        time.sleep(delay)
+        return result
+    return run
+
+
+@override_settings(FACTS_SEARCH_HEDGE_DELAY=0.2, FACTS_SEARCH_DEADLINE=2)
+class RaceStrategiesTests(SimpleTestCase):
+    def test_fast_cheap_result_skips_the_fallbacks(self):
+        calls = []
+        results = FactCheckerService._race_strategies(
+            [('slow', strategy(['slow'], 0.1)), ('fast', strategy(['fast']))],
+            [('fallback', strategy(['fallback'], calls=calls, name='fallback'))])
+        self.assertEqual(results, ['fast'])
+        self.assertEqual(calls, [])
+
+    def test_fallbacks_start_once_the_cheap_ones_come_back_empty(self):
+        started = time.monotonic()
+        results = FactCheckerService._race_strategies(
+            [('empty', strategy([])), ('none', strategy(None))], [('fallback', strategy(['fallback']))])
+        self.assertEqual(results, ['fallback'])
+        # Without waiting for the hedge delay
+        self.assertLess(time.monotonic() - started, 0.2)
+
+    def test_fallbacks_are_hedged_after_the_delay(self):
+        started = time.monotonic()
+        results = FactCheckerService._race_strategies(
+            [('stuck', strategy(['stuck'], 1))], [('fallback', strategy(['fallback']))])
+        self.assertEqual(results, ['fallback'])
+        self.assertLess(time.monotonic() - started, 0.6)
+
+    @override_settings(FACTS_SEARCH_DEADLINE=0.3)
+    def test_gives_up_at_the_deadline(self):
+        started = time.monotonic()
+        results = FactCheckerService._race_strategies(
+            [('stuck', strategy(['stuck'], 1))], [('also stuck', strategy(['fallback'], 1))])
+        self.assertEqual(results, [])
+        self.assertLess(time.monotonic() - started, 0.8)
+
+
+class SearchResultCacheTests(TestCase):
+    results = [{"url": "https://example.com/", "title": "", "snippet": ""}]
+
+    def age(self, query, minutes):
+        SearchCacheEntry.objects.filter(key=SearchResultCache.make_key(query, 10)).update(
+            last_accessed=timezone.now() - datetime.timedelta(minutes=minutes))
+
+    def test_normalized_queries_share_an_entry(self):
+        SearchResultCache.set("Moon  landing", 10, self.results)
+        self.assertEqual(SearchResultCache.get("moon landing", 10), self.results)
+        self.assertIsNone(SearchResultCache.get("moon landing", 5))
+
+    @override_settings(FACTS_SEARCH_CACHE_MAX_ENTRIES=2)
+    def test_evicts_least_recently_used(self):
+        SearchResultCache.set("first", 10, self.results)
+        self.age("first", 3)
+        SearchResultCache.set("second", 10, self.results)
+        self.age("second", 2)
+        # A hit makes "first" the most recently used
+        SearchResultCache.get("first", 10)
+        SearchResultCache.set("third", 10, self.results)
+
+        self.assertEqual(sorted(SearchCacheEntry.objects.values_list('query', flat=True)), ['first', 'third'])
+
+    @override_settings(FACTS_SEARCH_CACHE_TTL=60)
+    def test_expired_entry_is_a_miss(self):
+        SearchResultCache.set("old news", 10, self.results)
+        SearchCacheEntry.objects.update(created_at=timezone.now() - datetime.timedelta(minutes=2))
+        self.assertIsNone(SearchResultCache.get("old news", 10))
+        self.assertFalse(SearchCacheEntry.objects.exists())
+
+
+class ArticleCacheTests(TestCase):
+    def store(self, url, minutes_ago):
+        ArticleCache.store(url, '', '', 'x' * 100, '')
+        ArticleCacheEntry.objects.filter(url=url).update(
+            last_accessed=timezone.now() - datetime.timedelta(minutes=minutes_ago))
+
+    @override_settings(FACTS_ARTICLE_CACHE_MAX_BYTES=250)
+    def test_evicts_least_recently_used_pages_by_size(self):
+        self.store('https://a.example/', 3)
+        self.store('https://b.example/', 2)
+        ArticleCache.get('https://a.example/')
+        self.store('https://c.example/', 0)
+
+        self.assertEqual(sorted(ArticleCacheEntry.objects.values_list('url', flat=True)),
+                         ['https://a.example/', 'https://c.example/'])
+
+    def test_restoring_a_url_replaces_it(self):
+        ArticleCache.store('https://a.example/', '"v1"', '', 'old', '')
+        ArticleCache.store('https://a.example/', '"v2"', '', 'new', '')
+        entry = ArticleCache.get('https://a.example/')
+        self.assertEqual((entry.etag, entry.text), ('"v2"', 'new'))
+        self.assertEqual(ArticleCache.conditional_headers(entry), {'If-None-Match': '"v2"'})
+        self.assertEqual(ArticleCacheEntry.objects.count(), 1)
+
+
+@override_settings(FACTS_EMBEDDING_CACHE_SIZE=2, FACTS_EMBEDDING_CACHE_DIR=None)
+class EmbeddingCacheTests(SimpleTestCase):
+    def setUp(self):
+        EmbeddingCache._memory.clear()
+
+    def test_evicts_least_recently_used(self):
+        EmbeddingCache.put('a', 'model', [1.0])
+        EmbeddingCache.put('b', 'model', [2.0])
+        EmbeddingCache.get('a', 'model')
+        EmbeddingCache.put('c', 'model', [3.0])
+
+        self.assertIsNone(EmbeddingCache.get('b', 'model'))
+        np.testing.assert_array_equal(EmbeddingCache.get('a', 'model'), [1.0])
+        np.testing.assert_array_equal(EmbeddingCache.get('c', 'model'), [3.0])
+
+    def test_keyed_by_model(self):
+        EmbeddingCache.put('a', 'model', [1.0])
+        self.assertIsNone(EmbeddingCache.get('a', 'other-model'))
+
+
+class VerdictCacheTests(TestCase):
+    urls = ['https://a.example/', 'https://b.example/', 'https://c.example/']
+
+    def store(self, claim, verdict="Fake"):
+        VerdictCache.store(claim, [1.0, 0.0], 'model', verdict, self.urls, [0.1, 0.1, 0.1])
+
+    def test_same_normalized_claim_updates_its_row(self):
+        self.store("The moon is  made of cheese", "Fake")
+        self.store("the moon is made of CHEESE", "Unverified")
+        self.assertEqual(list(VerdictCacheEntry.objects.values_list('verdict', flat=True)), ["Unverified"])
+
+    @override_settings(FACTS_VERDICT_CACHE_MAX_ENTRIES=2)
+    def test_keeps_the_newest_entries(self):
+        for i in range(4):
+            self.store(f"claim {i}")
+        self.assertEqual(sorted(VerdictCacheEntry.objects.values_list('claim', flat=True)), ["claim 2", "claim 3"])
+
+    @override_settings(FACTS_VERDICT_CACHE_TTL=60)
+    def test_expired_entries_are_deleted_on_write(self):
+        self.store("old claim")
+        VerdictCacheEntry.objects.update(created_at=timezone.now() - datetime.timedelta(minutes=2))
+        self.store("new claim")
+        self.assertEqual(list(VerdictCacheEntry.objects.values_list('claim', flat=True)), ["new claim"])
+
+    @mock.patch('facts.services.encode_texts', return_value=np.ones((1, 2), dtype=np.float32))
+    def test_failed_scoring_is_not_cached(self, _):
+        # All-zero scores are what the scorers return when encoding fails
+        result = FactCheckerService._verdict_result("some claim", self.urls, [0.0, 0.0, 0.0])
+        self.assertIn("Fake", result['verdict'])
+        self.assertFalse(VerdictCacheEntry.objects.exists())
+
+        FactCheckerService._verdict_result("some claim", self.urls, [0.1, 0.0, 0.05])
+        self.assertEqual(VerdictCacheEntry.objects.count(), 1)
+
+
+def fake_verify_claim(claim, on_event=None):
+    on_event("urls_found", {"urls": ["https://a.example/", "https://b.example/"]})
+    on_event("source_scored", {"url": "https://a.example/", "score": 0.5})
+    result = {"claim": claim, "verdict": "Strong True", "sources": ["https://a.example/"]}
+    on_event("verdict", result)
+    return result
+
+
+@mock.patch('facts.jobs.FactCheckerService.verify_claim', side_effect=fake_verify_claim)
+class JobQueueTests(TransactionTestCase):
+    def finish(self, job):
+        for _ in range(100):
+            job.refresh()
+            if job.finished:
+                return
+            time.sleep(0.05)
+        self.fail(f"Job {job.id} didn't finish")
+
+    def test_state_is_readable_from_a_fresh_handle(self, _):
+        job = JobQueue.submit("the claim")
+        self.finish(job)
+        # What another worker sees: everything comes from the database
+        snapshot = JobQueue.get(job.id).snapshot()
+        self.assertEqual(snapshot['status'], "done")
+        self.assertEqual(snapshot['stage'], "verdict")
+        self.assertEqual(snapshot['urls'], ["https://a.example/", "https://b.example/"])
+        self.assertEqual(snapshot['scored_sources'], [{"url": "https://a.example/", "score": 0.5}])
+        self.assertEqual(snapshot['result']['verdict'], "Strong True")
+        self.assertIsNone(JobQueue.get("unknown"))
+
+    def test_event_stream_resumes_after_last_event_id(self, _):
+        job = JobQueue.submit("the claim")
+        self.finish(job)
+        response = self.client.get(reverse('api_verify_job_events', args=[job.id]), HTTP_LAST_EVENT_ID='0')
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(re.findall(r'^id: (\d+)$', body, re.M), ['1', '2'])
+        self.assertEqual(re.findall(r'^event: (\w+)$', body, re.M), ['source_scored', 'verdict'])
+
+    @override_settings(FACTS_JOB_MAX_PENDING=1)
+    def test_pending_limit_counts_every_worker(self, _):
+        # Unfinished jobs of any worker are in the table
+        VerificationJobEntry.objects.create(
+            id='other', claim='x', status='running', created_at=timezone.now(), updated_at=timezone.now())
+        self.assertIsNone(JobQueue.submit("the claim"))
+
+    @override_settings(FACTS_JOB_TIMEOUT=60, FACTS_JOB_TTL=60)
+    def test_purge(self, _):
+        old = timezone.now() - datetime.timedelta(minutes=2)
+        VerificationJobEntry.objects.create(id='lost', claim='x', status='running', created_at=old, updated_at=old)
+        VerificationJobEntry.objects.create(id='done', claim='x', status='done', created_at=old, updated_at=old)
+        self.finish(JobQueue.submit("the claim"))
+
+        self.assertFalse(VerificationJobEntry.objects.filter(pk='done').exists())
+        lost = JobQueue.get('lost')
+        self.assertEqual(lost.status, 'failed')
+        self.assertEqual(JobQueue.counts(), {'failed': 1, 'done': 1})
+
+
+def unit_vectors(calls):
+    """encode_texts stand-in: texts starting with "match" point the same way as every claim."""
+    def encode(texts):
+        calls.append(list(texts))
+        return np.array([[1.0, 0.0] if text.startswith(("claim", "match")) else [0.0, 1.0] for text in texts])
+    return encode
+
+
+def gather(claim):
+    if claim == "claim broken":
+        raise RuntimeError("search down")
+    if claim == "claim true":
+        return ["match one", "match two"], ["https://a.example/", "https://b.example/"], None
+    return ["other"], ["https://c.example/"], None
+
+
+@override_settings(FACTS_VERDICT_CACHE=False, FACTS_SCORING='summary')
+@mock.patch.object(FactCheckerService, '_gather_sources', side_effect=gather)
+class VerifyClaimsTests(SimpleTestCase):
+    claims = ["claim true", "claim broken", "claim other"]
+
+    def test_yields_every_claim_once(self, _):
+        calls = []
+        with mock.patch('facts.services.encode_texts', side_effect=unit_vectors(calls)):
+            results = dict(FactCheckerService.verify_claims(self.claims))
+
+        self.assertEqual(sorted(results), [0, 1, 2])
+        self.assertEqual(results[0]['scores'], [1.0, 1.0])
+        self.assertEqual(results[0]['sources'], ["https://a.example/", "https://b.example/"])
+        self.assertEqual(results[1], {"claim": "claim broken", "error": "search down"})
+        self.assertEqual(results[2]['scores'], [0.0])
+
+    def test_claims_and_summaries_are_encoded_in_batches(self, _):
+        calls = []
+        with mock.patch('facts.services.encode_texts', side_effect=unit_vectors(calls)):
+            list(FactCheckerService.verify_claims(self.claims))
+
+        # All claims in one call up front, then every summary exactly once
+        self.assertEqual(calls[0], self.claims)
+        self.assertEqual(sorted(text for call in calls[1:] for text in call), ["match one", "match two", "other"])
+
+    def test_cached_verdicts_skip_the_search(self, gather_sources):
+        cached = {"claim": "claim", "verdict": "The News is True (High Confidence)",
+                  "sources": [], "scores": [], "image_url": ""}
+        with override_settings(FACTS_VERDICT_CACHE=True), \
+                mock.patch('facts.services.encode_texts', side_effect=unit_vectors([])), \
+                mock.patch.object(VerdictCache, 'lookup', return_value=cached):
+            results = dict(FactCheckerService.verify_claims(self.claims))
+
+        gather_sources.assert_not_called()
+        self.assertTrue(all(result['cached'] for result in results.values()))
+
+
+class FakeResponse:
+    """Streamed requests response serving `body` in 64 KiB chunks; counts the chunks read."""
+
+    def __init__(self, body, content_type):
+        self.body = body
+        self.headers = {'Content-Type': content_type}
+        self.url = "https://example.com/"
+        self.chunks_read = 0
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            self.chunks_read += 1
+            yield self.body[start:start + chunk_size]
+
+
+class HtmlDownloadTests(SimpleTestCase):
+    def test_content_type(self):
+        self.assertEqual(FactCheckerService._html_content_type('text/html; charset="UTF-8"'), (True, 'UTF-8'))
+        self.assertEqual(FactCheckerService._html_content_type('Application/XHTML+XML'), (True, None))
+        self.assertEqual(FactCheckerService._html_content_type(''), (True, None))
+        self.assertEqual(FactCheckerService._html_content_type('application/pdf'), (False, None))
+        self.assertEqual(FactCheckerService._html_content_type('text/html; charset='), (True, None))
+
+    def test_non_html_body_isnt_downloaded(self):
+        response = FakeResponse(b'%PDF' * 1000, 'application/pdf')
+        self.assertIsNone(FactCheckerService._read_html(response))
+        self.assertEqual(response.chunks_read, 0)
+
+    @override_settings(FACTS_FETCH_MAX_BYTES=100 * 1024)
+    def test_body_is_capped(self):
+        response = FakeResponse(b'a' * 1024 * 1024, 'text/html')
+        html = FactCheckerService._read_html(response)
+        self.assertEqual(len(html), 100 * 1024)
+        self.assertEqual(response.chunks_read, 2)
+
+    def test_declared_charset_is_decoded(self):
+        body = '<p>Café</p>'.encode('latin-1')
+        self.assertEqual(FactCheckerService._read_html(FakeResponse(body, 'text/html; charset=latin-1')), '<p>Café</p>')
+        # Without one BeautifulSoup sniffs the bytes, as does an unknown charset
+        self.assertEqual(FactCheckerService._read_html(FakeResponse(body, 'text/html')), body)
+        self.assertEqual(FactCheckerService._read_html(FakeResponse(body, 'text/html; charset=bogus')), body)
+
+
+def keyword_vectors(calls):
+    """encode_texts stand-in: counts of a few keywords, so similarity follows the shared words."""
+    def encode(texts):
+        calls.append(list(texts))
+        words = ("moon", "landing", "weather")
+        return np.array([[text.lower().count(word) for word in words] for text in texts], dtype=np.float32)
+    return encode
+
+
+PAGE = ("The weather was sunny over Florida that day. The moon landing was broadcast live worldwide. "
+        "Astronauts walked on the moon for hours. Tickets sold out weeks before the launch.")
+
+
+@override_settings(FACTS_SUMMARY_SENTENCES=2)
+class SummarizeForQueryTests(SimpleTestCase):
+    def test_keeps_the_sentences_closest_to_the_query_in_reading_order(self):
+        calls = []
+        with mock.patch('facts.services.encode_texts', side_effect=keyword_vectors(calls)):
+            summaries, embeddings = FactCheckerService.summarize_for_query([PAGE, "Short page"], "Moon landing")
+
+        self.assertEqual(
+            summaries[0], "The moon landing was broadcast live worldwide. Astronauts walked on the moon for hours.")
+        # A page without usable sentences is kept whole
+        self.assertEqual(summaries[1], "Short page")
+        # One encode for the query and every sentence of every page
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0][0], "Moon landing")
+        self.assertEqual(len(calls[0]), 1 + 4 + 1)
+        # The summary embedding is the mean of its normalized sentence embeddings
+        expected = (np.array([1, 1, 0]) / np.sqrt(2) + np.array([1, 0, 0])) / 2
+        np.testing.assert_allclose(embeddings[0], expected, rtol=1e-6)
+
+    def test_no_pages(self):
+        self.assertEqual(FactCheckerService.summarize_for_query([], "Moon landing"), ([], []))
+
+
+class FakeEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[len(text), ord(text[0])] for text in texts], dtype=np.float32).reshape(-1, 2)
+
+
+class EncodeBatcherTests(SimpleTestCase):
+    @staticmethod
+    def expected(texts):
+        return np.array([[len(text), ord(text[0])] for text in texts], dtype=np.float32)
+
+    def test_rows_follow_each_callers_texts(self):
+        encoder = FakeEncoder()
+        batcher = EncodeBatcher(encoder, max_batch=64, max_wait=0.2)
+        requests = [['alpha', 'beta', 'alpha'], ['beta', 'gamma'], ['delta']]
+        results = [None] * len(requests)
+
+        def call(i):
+            results[i] = batcher.encode(requests[i])
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(len(requests))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for texts, result in zip(requests, results):
+            np.testing.assert_array_equal(result, self.expected(texts))
+        # One forward pass, each distinct text once
+        self.assertEqual(len(encoder.calls), 1)
+        self.assertEqual(sorted(encoder.calls[0]), ['alpha', 'beta', 'delta', 'gamma'])
+
+    def test_request_larger_than_max_batch_runs_alone(self):
+        encoder = FakeEncoder()
+        batcher = EncodeBatcher(encoder, max_batch=2, max_wait=0.01)
+        texts = ['one', 'two', 'three', 'four']
+        np.testing.assert_array_equal(batcher.encode(texts), self.expected(texts))
+        self.assertEqual(encoder.calls, [texts])
+
+    def test_encoder_errors_reach_the_caller(self):
+        class Broken:
+            def encode(self, texts):
+                raise RuntimeError("out of memory")
+
+        batcher = EncodeBatcher(Broken(), max_wait=0.01)
+        with self.assertRaises(RuntimeError):
+            batcher.encode(['text'])
+
+
+def after(seconds, value):
+    def stage(results):
+        time.sleep(seconds)
+        return value
+    return stage
+
+
+class StageGraphTests(SimpleTestCase):
+    def test_independent_stages_overlap(self):
+        graph = StageGraph('test')
+        graph.add('search', after(0.2, ['url']))
+        graph.add('image', after(0.2, 'image.png'))
+        graph.add('verdict', lambda results: (results['search'], results['image']), deps=['search', 'image'])
+        started = time.monotonic()
+        run = graph.run()
+        self.assertLess(time.monotonic() - started, 0.35)
+        self.assertEqual(run.results['verdict'], (['url'], 'image.png'))
+
+    def test_critical_path_follows_the_slowest_dependencies(self):
+        graph = StageGraph('test')
+        graph.add('search', after(0.05, None))
+        graph.add('image', after(0.2, None))
+        graph.add('sources', after(0.05, None), deps=['search'])
+        graph.add('verdict', after(0, None), deps=['sources', 'image'])
+        graph.add('wordcloud', after(0, None), deps=['sources'])
+        run = graph.run()
+        self.assertEqual(run.critical_path(graph), ['image', 'verdict'])
+
+    def test_failing_stage_raises(self):
+        graph = StageGraph('test')
+        graph.add('search', lambda results: 1 / 0)
+        graph.add('sources', after(0, None), deps=['search'])
+        with self.assertRaises(ZeroDivisionError):
+            graph.run()
+
+    def test_unknown_dependency(self):
+        with self.assertRaises(ValueError):
+            StageGraph('test').add('verdict', after(0, None), deps=['scores'])
+
+
+class VerificationGraphTests(SimpleTestCase):
+    @mock.patch('facts.services.encode_texts', side_effect=RuntimeError("encoder down"))
+    @mock.patch.object(FactCheckerService, 'fetch_image', return_value=None)
+    @mock.patch.object(FactCheckerService, 'search_web', return_value=[])
+    def test_claim_embedding_failure_doesnt_fail_the_run(self, *_):
+        run = FactCheckerService.verification_graph("the claim", with_image=True).run()
+        self.assertIsNone(run.results['claim_embedding'])
+        self.assertIn('verdict', run.results)
+
+
+@override_settings(FACTS_RESPECT_ROBOTS=False, FACTS_HOST_FAILURE_THRESHOLD=2, FACTS_HOST_COOLDOWN=60)
+class HostRegistryTests(SimpleTestCase):
+    url = 'https://news.example.com/story'
+
+    def setUp(self):
+        HostRegistry._hosts.clear()
+
+    def health(self):
+        return HostRegistry._get(HostRegistry.host_of(self.url))
+
+    def open_circuit(self):
+        HostRegistry.record(self.url, 503, 0.1)
+        HostRegistry.record(self.url, 503, 0.1)
+
+    def end_cooldown(self):
+        self.health().open_until = time.time() - 1
+
+    def test_opens_after_consecutive_failures(self):
+        HostRegistry.record(self.url, 503, 0.1)
+        self.assertIsNone(HostRegistry.check(self.url))
+        HostRegistry.record(self.url, 503, 0.1)
+        self.assertEqual(HostRegistry.check(self.url), 'circuit_open')
+        self.assertEqual(HostRegistry.open_circuits(), 1)
+
+    def test_success_resets_the_failure_count(self):
+        HostRegistry.record(self.url, 503, 0.1)
+        HostRegistry.record(self.url, 200, 0.1)
+        HostRegistry.record(self.url, 503, 0.1)
+        self.assertIsNone(HostRegistry.check(self.url))
+
+    def test_retry_after_opens_immediately(self):
+        HostRegistry.record(self.url, 429, 0.1, retry_after=120)
+        self.assertEqual(HostRegistry.check(self.url), 'circuit_open')
+        self.assertGreater(self.health().open_until, time.time() + 100)
+
+    def test_half_open_lets_one_probe_through(self):
+        self.open_circuit()
+        self.end_cooldown()
+        self.assertIsNone(HostRegistry.check(self.url))
+        self.assertEqual(HostRegistry.check(self.url), 'circuit_open')
+
+    def test_successful_probe_closes(self):
+        self.open_circuit()
+        self.end_cooldown()
+        HostRegistry.check(self.url)
+        HostRegistry.record(self.url, 200, 0.1)
+        self.assertIsNone(HostRegistry.check(self.url))
+        self.assertIsNone(HostRegistry.check(self.url))
+        self.assertEqual(HostRegistry.open_circuits(), 0)
+
+    def test_failed_probe_reopens(self):
+        self.open_circuit()
+        self.end_cooldown()
+        HostRegistry.check(self.url)
+        HostRegistry.record_error(self.url, 5.0, timeout=True)
+        self.assertEqual(HostRegistry.check(self.url), 'circuit_open')
+        self.assertGreater(self.health().open_until, time.time())
+
+    @override_settings(FACTS_FETCH_TIMEOUT=0.05)
+    def test_lost_probe_is_retried(self):
+        self.open_circuit()
+        self.end_cooldown()
+        HostRegistry.check(self.url)
+        time.sleep(0.15)
+        self.assertIsNone(HostRegistry.check(self.url))
+
+    @override_settings(FACTS_HOST_REGISTRY_SIZE=3)
+    def test_registry_is_bounded(self):
+        for i in range(10):
+            HostRegistry.check(f'https://host{i}.example.com/')
+        self.assertEqual(list(HostRegistry._hosts), [f'host{i}.example.com' for i in (7, 8, 9)])
+
+    @override_settings(FACTS_HOST_MIN_INTERVAL=10)
+    def test_slot_past_the_budget_is_not_booked(self):
+        self.assertEqual(HostRegistry.reserve_slot(self.url), 0)
+        self.assertIsNone(HostRegistry.reserve_slot(self.url, budget=5))
+        # The refused request didn't push the next slot back
+        self.assertAlmostEqual(HostRegistry.reserve_slot(self.url, budget=20), 10, delta=0.5)
+
+    @override_settings(FACTS_HOST_MIN_INTERVAL=10)
+    def test_paced_fetch_is_skipped(self):
+        with _host_slot(self.url, give_up=time.monotonic() + 5):
+            pass
+        with self.assertRaises(SlotUnavailable):
+            with _host_slot(self.url, give_up=time.monotonic() + 5):
+                pass
+
+    @override_settings(FACTS_FETCH_PER_HOST_LIMIT=1, FACTS_HOST_MIN_INTERVAL=0)
+    def test_busy_host_gives_up_at_the_deadline(self):
+        started = time.monotonic()
+        with _host_slot(self.url):
+            with self.assertRaises(SlotUnavailable):
+                with _host_slot(self.url, give_up=time.monotonic() + 0.2):
+                    pass
+        self.assertLess(time.monotonic() - started, 1)
+        # Slots are released either way
+        with _host_slot(self.url, give_up=time.monotonic() + 0.2):
+            pass
+
+    @override_settings(FACTS_HOST_MIN_INTERVAL=10)
+    def test_stop_ends_the_pacing_wait(self):
+        stop = threading.Event()
+        with _host_slot(self.url):
+            pass
+        threading.Timer(0.1, stop.set).start()
+        started = time.monotonic()
+        with self.assertRaises(SlotUnavailable):
+            with _host_slot(self.url, stop=stop):
+                pass
+        self.assertLess(time.monotonic() - started, 1)
+
+
+class KnownClaimsIndexTests(SimpleTestCase):
+    def write(self, filename, text):
+        with open(os.path.join(self.dataset_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dataset_dir = os.path.join(tmp.name, 'dataset')
+        self.index_dir = os.path.join(tmp.name, 'index')
+        os.makedirs(self.dataset_dir)
+        self.write('politifact_fake.csv', "id,news_url,title,tweet_ids\n"
+                                          "1,example.com/moon,Moon landing was faked,\n"
+                                          "2,,moon  landing WAS faked,\n"
+                                          "3,,,\n")
+        self.write('politifact_real.csv', "version https://git-lfs.github.com/spec/v1\noid sha256:0\n")
+        self.write('gossipcop_real.csv', "id,news_url,title,tweet_ids\n"
+                                         "4,https://news.example/w,Weather report for Sunday,\n"
+                                         "5,https://news.example/b,Moon base opens,\n")
+
+    def test_build_and_search(self):
+        calls = []
+        count = known_claims.build(self.dataset_dir, self.index_dir, keyword_vectors(calls), 'test-model',
+                                   batch_size=1, log=lambda message: None)
+        # Duplicates and blank titles are dropped, missing files and LFS pointers skipped
+        self.assertEqual(count, 3)
+        self.assertEqual(len(calls), 3)
+
+        index = known_claims.KnownClaimsIndex.load(self.index_dir)
+        self.assertEqual((len(index), index.model), (3, 'test-model'))
+        matches = index.search(np.array([1.0, 1.0, 0.0]), k=2)
+        self.assertEqual([m['title'] for m in matches], ["Moon landing was faked", "Moon base opens"])
+        self.assertEqual(matches[0]['label'], 'fake')
+        self.assertEqual(matches[0]['dataset'], 'politifact')
+        self.assertEqual(matches[0]['url'], 'https://example.com/moon')
+        self.assertAlmostEqual(matches[0]['score'], 1.0, places=3)
+        self.assertAlmostEqual(matches[1]['score'], 2 ** -0.5, places=3)
+
+    def test_no_headlines(self):
+        with self.assertRaises(ValueError):
+            known_claims.build(os.path.join(self.dataset_dir, 'missing'), self.index_dir, keyword_vectors([]),
+                               'test-model', log=lambda message: None)
+
+    def test_empty_index(self):
+        self.assertEqual(known_claims.KnownClaimsIndex(np.zeros((0, 3)), [], 'test-model').search(np.ones(3)), [])
+
+
+class VerdictSettledTests(SimpleTestCase):
+    settled = staticmethod(FactCheckerService.verdict_settled)
+
+    def test_no_scores(self):
+        self.assertFalse(self.settled([], 5, 'final'))
+        self.assertFalse(self.settled([], 0, 'true'))
+
+    def test_strong_true_settles_under_both_policies(self):
+        scores = [0.10, FactCheckerService.STRONG_TRUE_MAX]
+        self.assertTrue(self.settled(scores, 10, 'final'))
+        self.assertTrue(self.settled(scores, 10, 'true'))
+
+    def test_final_waits_below_strong_true(self):
+        self.assertFalse(self.settled([0.44, 0.40], 0, 'final'))
+
+    def test_true_needs_likely_true_max(self):
+        self.assertFalse(self.settled([0.29, 0.29], 0, 'true'))
+
+    def test_true_assumes_remaining_sources_score_the_floor(self):
+        scores = [0.35, 0.30]
+        self.assertTrue(self.settled(scores, 0, 'true'))
+        # (0.65 + 2 * 0.0) / 4 is below LIKELY_TRUE_AVG
+        self.assertFalse(self.settled(scores, 2, 'true'))
+        with override_settings(FACTS_EARLY_EXIT_FLOOR=0.2):
+            # (0.65 + 2 * 0.2) / 4
+            self.assertTrue(self.settled(scores, 2, 'true'))
+
+    def test_negative_remaining_counts_as_none(self):
+        self.assertTrue(self.settled([0.35, 0.30], -3, 'true'))
+
+
+class StreamMapTests(SimpleTestCase):
+    def test_yields_every_result_in_batches(self):
+        batches = list(stream_map(lambda x: x * 2, range(20), workers=3, max_batch=4))
+        self.assertTrue(all(1 <= len(batch) <= 4 for batch in batches))
+        self.assertEqual(sorted(pair for batch in batches for pair in batch), [(i, i * 2) for i in range(20)])
+
+    def test_batches_whatever_is_ready(self):
+        stream = stream_map(lambda x: x, range(20), workers=1, maxsize=8, max_batch=4)
+        next(stream)
+        # Let the worker fill the queue while the consumer is away
+        time.sleep(0.3)
+        self.assertEqual(len(next(stream)), 4)
+        stream.close()
+
+    def test_drops_none_and_failures(self):
+        def fn(x):
+            if x == 3:
+                raise ValueError("boom")
+            return None if x % 2 else x
+
+        pairs = [pair for batch in stream_map(fn, range(6), workers=2) for pair in batch]
+        self.assertEqual(sorted(pairs), [(0, 0), (2, 2), (4, 4)])
+
+    def test_deadline(self):
+        started = time.monotonic()
+        batches = list(stream_map(lambda x: time.sleep(1) or x, range(10), workers=2, deadline=0.3))
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertEqual(batches, [])
+
+    def test_deadline_keeps_queued_results(self):
+        def fn(x):
+            time.sleep({0: 0.01, 1: 0.01, 2: 0.1, 3: 0.1}.get(x, 2))
+            return x
+
+        stream = stream_map(fn, range(6), workers=6, deadline=0.5)
+        first = next(stream)
+        # The consumer is busy past the deadline; 2 and 3 were ready long before it
+        time.sleep(1)
+        rest = [pair for batch in stream for pair in batch]
+        self.assertEqual(sorted(first + rest), [(i, i) for i in range(4)])
+
+    def test_stop_event(self):
+        stop = threading.Event()
+        calls = []
+
+        def fn(x):
+            calls.append(x)
+            time.sleep(0.05)
+            return x
+
+        batches = []
+        for batch in stream_map(fn, range(100), workers=1, maxsize=1, stop=stop):
+            batches.append(batch)
+            stop.set()
+        self.assertEqual(len(batches), 1)
+        time.sleep(0.2)
+        self.assertLess(len(calls), 10)
+
+    def test_close_sets_stop(self):
+        stop = threading.Event()
+        stream = stream_map(lambda x: x, range(100), workers=1, stop=stop)
+        next(stream)
+        stream.close()
+        self.assertTrue(stop.is_set())
+
+
+class HangingClient:
+    """Async HTTP client whose downloads never finish."""
+
+    @contextlib.asynccontextmanager
+    async def stream(self, *args, **kwargs):
+        await asyncio.Event().wait()
+        yield
+
+
+class AsyncScrapeTests(SimpleTestCase):
+    def stage_count(self, outcome):
+        return metrics.STAGE_TOTAL._values.get((('stage', 'fetch'), ('outcome', outcome)), 0)
+
+    @mock.patch('facts.services.get_async_http_client', return_value=HangingClient())
+    @mock.patch.object(HostRegistry, 'acheck', new_callable=mock.AsyncMock, return_value=None)
+    @mock.patch.object(ArticleCache, 'get', return_value=None)
+    def test_cancelled_fetch_isnt_counted_as_success(self, *_):
+        async def cancel_fetch():
+            task = asyncio.create_task(FactCheckerService._ascrape_single("https://hang.example/a", {}))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        successes, cancelled = self.stage_count('success'), self.stage_count('cancelled')
+        asyncio.run(cancel_fetch())
+        self.assertEqual(self.stage_count('success'), successes)
+        self.assertEqual(self.stage_count('cancelled'), cancelled + 1)
+
+
+@override_settings(FACTS_EVIDENCE_SENTENCES=2)
+class ScoreEvidenceTests(SimpleTestCase):
+    def test_best_sentences_per_page(self):
+        calls = []
+        with mock.patch('facts.services.encode_texts', side_effect=keyword_vectors(calls)):
+            evidence = FactCheckerService.score_evidence("Moon landing", [PAGE, "Short page"])
+
+        # One encode for the query and every sentence of every page
+        self.assertEqual(len(calls), 1)
+        self.assertAlmostEqual(evidence[0]['score'], 1.0, places=5)
+        self.assertEqual([e['text'] for e in evidence[0]['sentences']],
+                         ["The moon landing was broadcast live worldwide.", "Astronauts walked on the moon for hours."])
+        self.assertAlmostEqual(evidence[0]['sentences'][1]['score'], 2 ** -0.5, places=5)
+        self.assertEqual(evidence[1], {"score": 0.0, "sentences": [{"text": "Short page", "score": 0.0}]})
+
+    def test_encoder_failure_scores_zero(self):
+        with mock.patch('facts.services.encode_texts', side_effect=RuntimeError("encoder down")):
+            evidence = FactCheckerService.score_evidence("Moon landing", [PAGE])
+        self.assertEqual(evidence, [{"score": 0.0, "sentences": []}])
+
+    @override_settings(FACTS_SCORING='evidence')
+    def test_evidence_scoring_mode(self):
+        with mock.patch('facts.services.encode_texts', side_effect=keyword_vectors([])):
+            scores, evidence = FactCheckerService.score_sources("Moon landing", [PAGE])
+        self.assertEqual(scores, [evidence[0]['score']])
@@ -1,8 +1,17 @@
 from . import views
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path,include
+
+# Under ASGI (see news_guardian/asgi.py) /verify runs the async pipeline
+verify_view = views.api_verify_claim_async if getattr(settings, 'FACTS_ASYNC_API', False) else views.api_verify_claim
+
 urlpatterns = [
     path('',views.home,name='home'),
     path('about', views.about, name='about'),
-    path('verify', views.api_verify_claim, name='api_verify')
+    path('wordcloud/<str:key>.png', views.wordcloud_image, name='wordcloud'),
+    path('verify', verify_view, name='api_verify'),
+    path('verify/batch', views.api_verify_batch, name='api_verify_batch'),
+    path('verify/jobs/<str:job_id>', views.api_verify_job, name='api_verify_job'),
+    path('verify/jobs/<str:job_id>/events', views.api_verify_job_events, name='api_verify_job_events')
 ]
\ No newline at end of file
@@ -1,17 +1,20 @@
 from django.shortcuts import render
 from .forms import factsForm
 from .services import FactCheckerService
-from wordcloud import WordCloud
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import io
-import urllib, base64
-import numpy as np
-import pandas as pd
 import json
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
+from . import metrics, wordclouds
+from .jobs import JobQueue
+
+def _sources_table(urls):
+    """Converting list of URLs to a HTML table for display"""
+    import pandas as pd
+
+    results_df = pd.DataFrame(urls, columns=['Source URLs'])
+    return results_df.to_html(classes='table table-striped', index=False)
 
 def home(request):
     """
@@ -21,108 +24,86 @@ def home(request):
     # Trigger reload (Team Details Updated)
     """
     if request.method == 'POST':
-        form = factsForm(request.POST)
-        context = {'facts': form}
-
-        if form.is_valid():
-            user_query = form.cleaned_data['facts']
-            
-            # 1. Prepare Query
-            search_query = FactCheckerService.get_date_range_query(user_query)
-            
-            # 2. Search Web
-            top_urls = FactCheckerService.search_web(search_query)
-            
-            # 3. Scrape and Summarize
-            summaries, valid_urls = FactCheckerService.scrape_and_summarize(top_urls, user_query)
-            
-            print(f"DEBUG VIEW: Summaries: {len(summaries)}, URLs: {len(valid_urls)}")
-
-            # Logic Update: Only fail if absolutely NO data found
-            if not summaries and not valid_urls:
-                 # Try one last Hail Mary - Pass invalid URLs just to show *something* if search worked but scrape failed?
-                 # ideally no, just show insufficient data.
-                 # BUT, if we have URLs but no summaries, we should tell user "Found sources but couldn't verify content"
-                 pass 
-
-            if not summaries:
-                 if valid_urls:
-                     # We found URLs but failed to scrape. Partial success?
-                     context['fact_check'] = "Found sources, but unable to analyze content deeply. Please check links below."
-                     # Create a dummy summary so flow continues? No, wordcloud will fail.
-                     # Let's create a dummy summary from titles or snippets if possible, but services doesn't return that.
-                     # Fallback behavior:
-                     pass
-                 else:
-                    context['fact_check'] = "Insufficient data found to verify."
-                    return render(request, 'index.html', context)
-
-            # 4. Calculate Similarity
-            # If no summaries, this returns []
-            similarities = FactCheckerService.check_similarity(user_query, summaries)
-            
-            # 5. Generate Word Cloud
-            # 5. Visuals: Search Image -> Fallback to WordCloud
-            news_image_url = FactCheckerService.fetch_image(user_query)
-            uri = ""
-            
-            # If no image found, generate WordCloud
-            if not news_image_url:
-                try:
-                    text = " "
-                    if summaries:
-                        sentences = np.array(summaries)
-                        text = ' '.join(sentences)
-                    
-                    if not text.strip():
-                        text = "No_Data_Found"
-                        
-                    wordcloud = WordCloud(width=800, height=500, background_color='#16191f', colormap='Set2').generate(text)
-                    
-                    # Convert plot to PNG image
-                    fig = plt.figure(figsize=(10, 5), facecolor='#16191f')
-                    plt.imshow(wordcloud)
-                    plt.axis("off")
-                    plt.tight_layout(pad=0)
-                    
-                    buf = io.BytesIO()
-                    plt.savefig(buf, format='png')
-                    buf.seek(0)
-                    image_base64 = base64.b64encode(buf.read()).decode('utf-8')
-                    uri = urllib.parse.quote(image_base64)
-                    plt.close(fig) 
-                except Exception as wc_e:
-                    print(f"WordCloud Error: {wc_e}")
-                    uri = ""
-
-            # 6. Determine Verdict
-            if similarities:
-                avg_similarity = np.mean(similarities)
-                max_similarity = np.max(similarities)
-                source_count = len(valid_urls)
-                verdict = FactCheckerService.classify_verdict(avg_similarity, max_similarity, source_count, user_query)
-            else:
-                verdict = "Could not determine similarity."
-
-            # 7. Prepare Results Table
-            # Converting list of URLs to a HTML table for display
-            results_df = pd.DataFrame(valid_urls, columns=['Source URLs'])
-            results_table_html = results_df.to_html(classes='table table-striped', index=False)
-
-            # Update Context
-            context.update({
-                'fine': results_table_html, 
-                'fact_check': verdict,
-                'news_image': news_image_url,
-                'data': uri
-            })
-
-        return render(request, 'index.html', context)
-    
+        with metrics.REQUESTS_IN_FLIGHT.track_in_progress(endpoint='home'):
+            return _home_post(request)
     else:
         form = factsForm()
         return render(request, 'index.html', {'facts': form})
 
+def _home_post(request):
+    """Runs the fact-checking pipeline for a submitted form and renders the dashboard."""
+    form = factsForm(request.POST)
+    context = {'facts': form}
+
+    if form.is_valid():
+        user_query = form.cleaned_data['facts']
+
+        # 0. Reuse the verdict of an already verified (near-)identical claim
+        cached = FactCheckerService.get_cached_verdict(user_query)
+        if cached:
+            context.update({
+                'fine': _sources_table(cached['sources']),
+                'fact_check': cached['verdict'],
+                'news_image': cached['image_url'] or None,
+                'wordcloud_url': ''
+            })
+            return render(request, 'index.html', context)
+        
+        # 1-6. Search, scrape, score and classify. The image lookup runs
+        # alongside (see FactCheckerService.verification_graph); the word
+        # cloud is scheduled after the verdict, off the critical path
+        graph = FactCheckerService.verification_graph(user_query, with_image=True, name='home')
+        graph.add('wordcloud', _schedule_wordcloud, deps=['sources', 'image', 'verdict'])
+        run = graph.run()
+
+        summaries, valid_urls, _ = run.results['sources']
+        print(f"DEBUG VIEW: Summaries: {len(summaries)}, URLs: {len(valid_urls)}")
+
+        if not summaries:
+            context['fact_check'] = "Insufficient data found to verify."
+            return render(request, 'index.html', context)
+
+        result = run.results['verdict']
+        verdict = result['verdict'] if result['scores'] else "Could not determine similarity."
+
+        # 7. Prepare Results Table
+        results_table_html = _sources_table(valid_urls)
+
+        # Update Context
+        context.update({
+            'fine': results_table_html, 
+            'fact_check': verdict,
+            'news_image': run.results['image'],
+            'wordcloud_url': run.results['wordcloud']
+        })
+
+    return render(request, 'index.html', context)
+
+def _schedule_wordcloud(results):
+    """Pipeline stage: without a news image, the word cloud renders in the background and the page lazy-loads it."""
+    summaries = results['sources'][0]
+    if results['image'] or not summaries:
+        return ""
+    try:
+        return reverse('wordcloud', args=[wordclouds.schedule(summaries)])
+    except Exception as wc_e:
+        print(f"WordCloud Error: {wc_e}")
+        return ""
+
+def wordcloud_image(request, key):
+    """Serves a word cloud scheduled by the home view, rendering it now if it isn't ready yet."""
+    try:
+        png = wordclouds.get(key)
+    except Exception as e:
+        print(f"WordCloud Error: {e}")
+        png = None
+    if png is None:
+        raise Http404("Unknown word cloud")
+    response = HttpResponse(png, content_type='image/png')
+    # Keys are content hashes, so an image never changes
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
 def about(request):
     """Renders the About page with team details."""
     return render(request, 'about.html')
@@ -133,6 +114,9 @@ def api_verify_claim(request):
     API Endpoint for external clients (Desktop/Android).
     Accepts JSON: {"claim": "some text"}
     Returns JSON: {"verdict": "...", "confidence": "...", "sources": 5}
+
+    With {"claim": "...", "async": true} the claim is queued instead and the
+    response (202) carries a job id plus the status and event stream URLs.
     """
     if request.method == 'POST':
         try:
@@ -142,39 +126,146 @@ def api_verify_claim(request):
             if not user_query:
                 return JsonResponse({"error": "Empty claim"}, status=400)
 
+            if data.get('async'):
+                return _queue_verification(user_query)
+
             # Re-use Service Logic
-            search_query = FactCheckerService.get_date_range_query(user_query)
-            top_urls = FactCheckerService.search_web(search_query)
-            summaries, valid_urls = FactCheckerService.scrape_and_summarize(top_urls, user_query)
-
-            verdict = "Insufficient Data"
-            confidence = "Low"
-            
-            if summaries:
-                 # Check similarity
-                similarities = FactCheckerService.calculate_similarity(summaries, user_query)
-                avg_similarity = np.mean(similarities)
-                max_similarity = np.max(similarities)
-                source_count = len(valid_urls)
-                
-                # Get detailed verdict string
-                full_verdict = FactCheckerService.classify_verdict(avg_similarity, max_similarity, source_count, user_query)
-                
-                # Parse simplified verdict/confidence for UI
-                verdict = full_verdict
-                if "True" in full_verdict:
-                    confidence = "High" if "High" in full_verdict else "Medium"
-                elif "Fake" in full_verdict:
-                     confidence = "High"
-            
-            return JsonResponse({
-                "verdict": verdict,
-                "confidence": confidence,
-                "sources": len(valid_urls),
-                "details": "Verified against live web sources."
-            })
+            with metrics.REQUESTS_IN_FLIGHT.track_in_progress(endpoint='verify'):
+                result = FactCheckerService.verify_claim(user_query)
+
+            return _verification_response(result)
 
         except Exception as e:
             return JsonResponse({"error": str(e)}, status=500)
     
-    return JsonResponse({"error": "Method not allowed"}, status=405)
\ No newline at end of file
+    return JsonResponse({"error": "Method not allowed"}, status=405)
+
+@csrf_exempt
+async def api_verify_claim_async(request):
+    """
+    api_verify_claim for the ASGI deployment (routed when FACTS_ASYNC_API is
+    on). The pipeline is awaited on the event loop, so a verification waiting
+    on search or page downloads doesn't hold a thread.
+    """
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            user_query = data.get('claim', '').strip()
+
+            if not user_query:
+                return JsonResponse({"error": "Empty claim"}, status=400)
+
+            if data.get('async'):
+                return _queue_verification(user_query)
+
+            with metrics.REQUESTS_IN_FLIGHT.track_in_progress(endpoint='verify'):
+                result = await FactCheckerService.averify_claim(user_query)
+
+            return _verification_response(result)
+
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=500)
+
+    return JsonResponse({"error": "Method not allowed"}, status=405)
+
+def _queue_verification(user_query):
+    job = JobQueue.submit(user_query)
+    if job is None:
+        return JsonResponse({"error": "Too many pending verifications, retry later"}, status=503)
+    return JsonResponse({
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": reverse('api_verify_job', args=[job.id]),
+        "events_url": reverse('api_verify_job_events', args=[job.id])
+    }, status=202)
+
+def _verification_response(result):
+    return JsonResponse({
+        "verdict": result['verdict'],
+        "confidence": result['confidence'],
+        "sources": len(result['sources']),
+        "details": result['details'],
+        "cached": result['cached'],
+        "known_claims": result.get('known_claims', []),
+        "evidence": result.get('evidence', []),
+    })
+
+@csrf_exempt
+def api_verify_batch(request):
+    """
+    Bulk verification for newsroom integrations.
+    Accepts JSON: {"claims": ["...", "..."]}
+    Streams NDJSON, one {"index": i, "verdict": ...} line per claim in completion order.
+    """
+    if request.method != 'POST':
+        return JsonResponse({"error": "Method not allowed"}, status=405)
+
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+    claims = data.get('claims')
+    if not isinstance(claims, list) or not claims:
+        return JsonResponse({"error": "Expected a non-empty list of claims"}, status=400)
+
+    claims = [str(c).strip() for c in claims]
+    if not all(claims):
+        return JsonResponse({"error": "Empty claim"}, status=400)
+
+    max_claims = getattr(settings, 'FACTS_BATCH_MAX_CLAIMS', 50)
+    if len(claims) > max_claims:
+        return JsonResponse({"error": f"At most {max_claims} claims per batch"}, status=400)
+
+    def stream():
+        with metrics.REQUESTS_IN_FLIGHT.track_in_progress(endpoint='verify_batch'):
+            try:
+                for index, result in FactCheckerService.verify_claims(claims):
+                    yield json.dumps({"index": index, **result}) + "\n"
+            except Exception as e:
+                yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingHttpResponse(stream(), content_type='application/x-ndjson')
+
+def api_verify_job(request, job_id):
+    """Status of an async verification, with the URLs and scored sources found so far."""
+    job = JobQueue.get(job_id)
+    if job is None:
+        return JsonResponse({"error": "Unknown job"}, status=404)
+    return JsonResponse(job.snapshot())
+
+def api_verify_job_events(request, job_id):
+    """
+    Server-Sent Events stream of an async verification's progress.
+    Each event is named after its stage (urls_found, source_scored, verdict);
+    the stream ends with the job. Reconnecting clients resume via Last-Event-ID.
+    """
+    job = JobQueue.get(job_id)
+    if job is None:
+        return JsonResponse({"error": "Unknown job"}, status=404)
+
+    try:
+        start = int(request.headers.get('Last-Event-ID', -1)) + 1
+    except ValueError:
+        start = 0
+
+    def stream():
+        sent = start
+        while True:
+            events = job.wait_for_events(sent, timeout=15)
+            for event in events:
+                yield f"id: {event['seq']}\nevent: {event['stage']}\ndata: {json.dumps(event['data'])}\n\n"
+                sent = event['seq'] + 1
+            # wait_for_events reads the status first: a finished job has no events left
+            if job.finished:
+                if job.status == "failed":
+                    yield f"event: error\ndata: {json.dumps({'error': job.error})}\n\n"
+                return
+            if not events:
+                # Keep proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
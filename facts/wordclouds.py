@@ -0,0 +1,122 @@
+"""
+Word clouds for the dashboard, rendered off the request path.
+
+The home view only calls schedule() once the verdict is known. That stores
+the source text under a hash of its content and renders the PNG on a
+background thread; the page then lazy-loads /wordcloud/<key>.png. The text is
+written first, so any worker process can render the image if it gets the
+image request before the one that scheduled it is done.
+"""
+import hashlib
+import io
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from . import metrics
+
+KEY_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+_executor = None
+_pending = {}
+_lock = threading.Lock()
+
+
+def _directory():
+    directory = getattr(settings, 'FACTS_WORDCLOUD_DIR', None) or os.path.join(
+        tempfile.gettempdir(), 'truthlens-wordclouds')
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def _path(key, extension):
+    return os.path.join(_directory(), f"{key}.{extension}")
+
+
+def render(text):
+    """PNG bytes of the word cloud for `text`, straight from WordCloud's PIL image."""
+    # wordcloud pulls in matplotlib; only the render threads need it
+    from wordcloud import WordCloud
+
+    with metrics.stage('wordcloud'):
+        cloud = WordCloud(width=800, height=500, background_color='#16191f', colormap='Set2').generate(text)
+        buf = io.BytesIO()
+        cloud.to_image().save(buf, format='PNG', optimize=True)
+        return buf.getvalue()
+
+
+def schedule(summaries):
+    """Queues the word cloud for these summaries and returns its key (cached renders are reused)."""
+    text = ' '.join(summaries).strip() or "No_Data_Found"
+    key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    if os.path.exists(_path(key, 'png')):
+        return key
+
+    with open(_path(key, 'txt'), 'w', encoding='utf-8') as f:
+        f.write(text)
+
+    global _executor
+    with _lock:
+        if key not in _pending:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='wordcloud')
+            _pending[key] = _executor.submit(_render_to_disk, key)
+    return key
+
+
+def _render_to_disk(key):
+    try:
+        with open(_path(key, 'txt'), encoding='utf-8') as f:
+            text = f.read()
+        png = render(text)
+        # Write-then-rename so readers never see a partial file
+        tmp_path = _path(key, f'{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(png)
+        os.replace(tmp_path, _path(key, 'png'))
+        _prune()
+        return png
+    finally:
+        with _lock:
+            _pending.pop(key, None)
+
+
+def _prune():
+    max_files = getattr(settings, 'FACTS_WORDCLOUD_MAX_FILES', 500)
+    directory = _directory()
+    pngs = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.png')]
+    if len(pngs) <= max_files:
+        return
+    pngs.sort(key=os.path.getmtime)
+    for path in pngs[:len(pngs) - max_files]:
+        for stale in (path, path[:-len('png')] + 'txt'):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def get(key, timeout=10):
+    """PNG bytes for `key`, waiting for (or doing) the render if needed. None for unknown keys."""
+    if not KEY_PATTERN.fullmatch(key):
+        return None
+
+    try:
+        with open(_path(key, 'png'), 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+
+    with _lock:
+        future = _pending.get(key)
+    if future is not None:
+        return future.result(timeout=timeout)
+
+    # Scheduled by another worker process, or the render was lost
+    if os.path.exists(_path(key, 'txt')):
+        return _render_to_disk(key)
+    return None
@@ -0,0 +1,17 @@
+# Gunicorn settings, picked up automatically when gunicorn runs from the
+# project root (Dockerfile CMD and Procfile).
+import os
+
+# Import the app (and with it the models) once in the master, then fork.
+# Workers share the model pages copy-on-write instead of each loading a copy.
+preload_app = True
+os.environ.setdefault("FACTS_PRELOAD_MODELS", "1")
+
+# Overridable with WEB_CONCURRENCY or --workers. With FACTS_INFERENCE_SOCKET
+# set, the models live in `manage.py run_inference_server` instead and extra
+# workers cost no model memory (see facts/inference.py). Async job state is in
+# the database (facts/jobs.py), so any worker serves a job's status and events.
+# Request threads keep a long SSE stream from holding a whole worker.
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "news_guardian.settings")
+# Serve /verify from the async pipeline (FACTS_ASYNC_API)
+os.environ.setdefault("FACTS_ASGI", "1")
 
 application = get_asgi_application()
@@ -94,6 +94,14 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # The fetch pool writes the caches from many threads at once. IMMEDIATE
+        # transactions take the write lock up front (no read-to-write upgrade
+        # that fails with "database is locked") and writers queue for `timeout`
+        # seconds. transaction_mode needs Django >= 5.1.
+        "OPTIONS": {
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+        },
     }
 }
 
@@ -142,3 +150,158 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static root')
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Fact-checking pipeline (facts/services.py)
+
+# Race the cheap DDG query variants instead of trying them one after another.
+# Google and SpaCy fallbacks start only after the hedge delay (seconds).
+FACTS_PARALLEL_SEARCH = True
+FACTS_SEARCH_HEDGE_DELAY = 3
+FACTS_SEARCH_DEADLINE = 20
+
+# Search results cached in the database per normalized query.
+# TTL in seconds; least recently used entries go first beyond the max.
+FACTS_SEARCH_CACHE = True
+FACTS_SEARCH_CACHE_TTL = 6 * 60 * 60
+FACTS_SEARCH_CACHE_MAX_ENTRIES = 5000
+
+# Fetch article pages with a bounded worker pool instead of one by one
+FACTS_CONCURRENT_FETCH = True
+FACTS_FETCH_MAX_WORKERS = 8
+# Parallel requests allowed against a single host
+FACTS_FETCH_PER_HOST_LIMIT = 2
+# Per-request timeout and overall deadline for the fetch stage, in seconds
+FACTS_FETCH_TIMEOUT = 5
+FACTS_FETCH_DEADLINE = 12
+# Only this many bytes of a page are downloaded and parsed; non-HTML is skipped
+FACTS_FETCH_MAX_BYTES = 2 * 1024 * 1024
+
+# Scraped pages (text + summary) cached in the database. Fresh entries skip
+# the network; older ones are revalidated with a conditional GET.
+FACTS_ARTICLE_CACHE = True
+FACTS_ARTICLE_CACHE_FRESHNESS = 60 * 60
+FACTS_ARTICLE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Sentence embeddings are cached by model + text hash. The in-memory LRU holds
+# FACTS_EMBEDDING_CACHE_SIZE vectors; set a directory to also keep float16
+# copies on disk.
+FACTS_SENTENCE_MODEL = 'all-MiniLM-L6-v2'
+FACTS_EMBEDDING_CACHE_SIZE = 4096
+FACTS_EMBEDDING_CACHE_DIR = None
+
+# Sentence encoder backend: "torch", "onnx" or "onnx-int8". The ONNX backends
+# load the files written by `python manage.py export_encoder` into
+# FACTS_ENCODER_PATH and fall back to PyTorch when they are missing. They need
+# the optional packages in requirements-onnx.txt.
+# FACTS_ENCODER_THREADS caps ONNX Runtime's intra-op threads (0 = all cores).
+FACTS_ENCODER_BACKEND = os.environ.get('FACTS_ENCODER_BACKEND', 'torch')
+FACTS_ENCODER_PATH = os.path.join(BASE_DIR, 'models', 'encoder')
+FACTS_ENCODER_THREADS = 0
+
+# Encode calls from concurrent requests are coalesced into one forward pass:
+# a batch runs after FACTS_ENCODE_BATCH_WAIT_MS or once FACTS_ENCODE_MAX_BATCH
+# texts are waiting, whichever comes first.
+FACTS_ENCODE_BATCHING = True
+FACTS_ENCODE_BATCH_WAIT_MS = 5
+FACTS_ENCODE_MAX_BATCH = 64
+
+# Verdicts reused for near-duplicate claims: cosine similarity of the claim
+# embeddings must reach the threshold, entries expire after the TTL (seconds).
+# Expired entries are deleted on write and at most MAX_ENTRIES are kept.
+FACTS_VERDICT_CACHE = True
+FACTS_VERDICT_CACHE_THRESHOLD = 0.9
+FACTS_VERDICT_CACHE_TTL = 24 * 60 * 60
+FACTS_VERDICT_CACHE_MAX_CANDIDATES = 2000
+FACTS_VERDICT_CACHE_MAX_ENTRIES = 5000
+
+# Async verification jobs (POST /verify with "async": true). Jobs run in the
+# worker that accepted them, on a bounded pool; their state and events are in
+# the database, so any worker serves the status and event stream (polling
+# every FACTS_JOB_POLL_INTERVAL seconds). Finished jobs are kept for
+# FACTS_JOB_TTL seconds; unfinished ones idle for FACTS_JOB_TIMEOUT are failed.
+FACTS_JOB_WORKERS = 2
+FACTS_JOB_MAX_PENDING = 20
+FACTS_JOB_TTL = 60 * 60
+FACTS_JOB_TIMEOUT = 15 * 60
+FACTS_JOB_POLL_INTERVAL = 0.5
+
+# Batch verification (POST /verify/batch): claims gathered in parallel
+FACTS_BATCH_WORKERS = 4
+FACTS_BATCH_MAX_CLAIMS = 50
+
+# Load and warm the SBERT/SpaCy models when the WSGI app is imported. Set by
+# gunicorn.conf.py so the gunicorn master loads them once before forking.
+FACTS_PRELOAD_MODELS = os.environ.get('FACTS_PRELOAD_MODELS') == '1'
+
+# Page summaries: "lsa" (sumy LsaSummarizer per page) or "embedding" (sentences
+# closest to the claim, picked with one batched SBERT call across all pages)
+FACTS_SUMMARIZER = 'lsa'
+FACTS_SUMMARY_SENTENCES = 10
+FACTS_SUMMARY_MAX_SENTENCES = 150
+
+# Shared inference server (python manage.py run_inference_server). When the
+# socket path is set, web workers send encode and keyword requests there
+# instead of loading their own models. The auth key defaults to SECRET_KEY.
+FACTS_INFERENCE_SOCKET = os.environ.get('FACTS_INFERENCE_SOCKET')
+FACTS_INFERENCE_AUTHKEY = os.environ.get('FACTS_INFERENCE_AUTHKEY')
+FACTS_INFERENCE_TIMEOUT = 60
+
+# Async pipeline, used by /verify when served through news_guardian/asgi.py.
+# Page downloads share one httpx pool per event loop; CPU work (parsing,
+# summarizing, encoding) and the DB caches run on FACTS_ASYNC_CPU_WORKERS
+# threads (None = one per core). The blocking search clients run on their own
+# FACTS_ASYNC_SEARCH_WORKERS threads.
+FACTS_ASYNC_API = os.environ.get('FACTS_ASGI') == '1'
+FACTS_ASYNC_MAX_CONNECTIONS = 100
+FACTS_ASYNC_CPU_WORKERS = None
+FACTS_ASYNC_SEARCH_WORKERS = 8
+
+# Word clouds are rendered in the background and cached on disk by content
+# hash (None = a directory under the system temp dir, shared by the workers).
+FACTS_WORDCLOUD_DIR = None
+FACTS_WORDCLOUD_MAX_FILES = 500
+
+# Host health: after FACTS_HOST_FAILURE_THRESHOLD failed fetches in a row
+# (timeouts, 403, 429, 5xx) a host is skipped for FACTS_HOST_COOLDOWN seconds.
+# robots.txt is honoured and cached; requests to one host start at least
+# FACTS_HOST_MIN_INTERVAL seconds apart (or the robots.txt Crawl-delay).
+FACTS_HOST_FAILURE_THRESHOLD = 3
+FACTS_HOST_COOLDOWN = 5 * 60
+FACTS_HOST_MIN_INTERVAL = 0.5
+FACTS_HOST_REGISTRY_SIZE = 2000
+FACTS_RESPECT_ROBOTS = True
+FACTS_ROBOTS_USER_AGENT = 'TruthLens'
+FACTS_ROBOTS_TTL = 24 * 60 * 60
+FACTS_ROBOTS_TIMEOUT = 3
+
+# Known-claims index of the labeled PolitiFact / GossipCop headlines in
+# dataset/, built with `python manage.py build_known_claims`. The closest
+# FACTS_KNOWN_CLAIMS_TOP_K headlines are returned with every API verdict; a
+# claim matching one with similarity >= FACTS_KNOWN_CLAIMS_MATCH takes that
+# headline's label without a web search (None = always search).
+FACTS_KNOWN_CLAIMS_PATH = os.path.join(BASE_DIR, 'models', 'known_claims')
+FACTS_KNOWN_CLAIMS_TOP_K = 5
+FACTS_KNOWN_CLAIMS_MATCH = 0.9
+
+# Early exit: score sources as they arrive and stop fetching once the verdict
+# can't change. None = wait for every source; "final" = stop at Strong True
+# (the verdict is the same as a full run's);
+# "true" = stop once some True verdict is certain, assuming the sources still
+# missing score FACTS_EARLY_EXIT_FLOOR (may under-state confidence).
+# Off by default: an early verdict lists, counts and caches only the sources
+# seen before the stop.
+FACTS_EARLY_EXIT = None
+FACTS_EARLY_EXIT_FLOOR = 0.0
+
+# Streaming sources stage of the API pipeline: pages flow from the fetch
+# workers to the encoder through a queue of FACTS_STREAM_QUEUE_SIZE pages, and
+# are encoded FACTS_STREAM_BATCH at a time while later pages still download.
+FACTS_STREAMING_PIPELINE = True
+FACTS_STREAM_QUEUE_SIZE = 8
+FACTS_STREAM_BATCH = 8
+
+# Source scoring: "summary" compares the claim with one embedding per summary;
+# "evidence" splits each summary into sentences, scores a source by its best
+# sentence and returns the FACTS_EVIDENCE_SENTENCES best ones per source.
+FACTS_SCORING = 'summary'
+FACTS_EVIDENCE_SENTENCES = 3
@@ -15,7 +15,9 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from facts import metrics
+from facts.services import models_loaded, warm_models_in_background
 
 def health(request):
     return JsonResponse({
@@ -24,8 +26,23 @@ def health(request):
         "message": "Backend is running"
     })
 
+def ready(request):
+    """Readiness probe: 503 until this worker has its models loaded (and starts loading them)."""
+    models = models_loaded()
+    if all(models.values()):
+        return JsonResponse({"status": "ready", "models": models})
+
+    warm_models_in_background()
+    return JsonResponse({"status": "loading", "models": models}, status=503)
+
+def metrics_view(request):
+    """Pipeline metrics of this worker in Prometheus text format."""
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 urlpatterns = [
     path("", health),
+    path("ready", ready),
+    path("metrics", metrics_view),
     path("admin/", admin.site.urls),
     path('', include('facts.urls'))
 ]
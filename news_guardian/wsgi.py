@@ -7,10 +7,20 @@ For more information on this file, see
 https://docs.djangoproject.com/en/4.1/howto/deployment/wsgi/
 """
 
+import gc
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "news_guardian.settings")
 
 application = get_wsgi_application()
+
+if settings.FACTS_PRELOAD_MODELS:
+    from facts.services import preload_models
+
+    preload_models()
+    # Move the loaded models out of the GC's reach so collections in the
+    # forked workers don't touch (and copy) their pages
+    gc.freeze()
@@ -0,0 +1,199 @@
+"""
+Encoder backend benchmark: PyTorch vs ONNX Runtime fp32 vs ONNX Runtime int8.
+
+Encodes a fixed, seeded set of headline- and paragraph-length texts with each
+backend and reports load time, resident memory, batch throughput, single-text
+latency and cosine agreement with the PyTorch embeddings. Every backend runs in
+its own subprocess so the memory numbers don't bleed into each other.
+
+    # Install requirements-onnx.txt and export the ONNX models first
+    # (writes FACTS_ENCODER_PATH)
+    python manage.py export_encoder
+
+    python research_prototypes/benchmark_encoder.py --output encoder.json
+    python research_prototypes/benchmark_encoder.py --backends torch onnx-int8 --texts 256
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import django
+import numpy as np
+
+# Setup Django Environment
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'news_guardian.settings')
+django.setup()
+
+from django.conf import settings
+from facts import encoders
+from facts.services import get_sentence_model_name
+
+SENTENCES = [
+    "India successfully landed the Chandrayaan-3 spacecraft near the lunar south pole.",
+    "The central bank raised interest rates by a quarter point to fight inflation.",
+    "A new study claims that drinking coffee every day reduces the risk of heart disease.",
+    "The senator denied reports that she would resign before the end of her term.",
+    "Heavy monsoon rains flooded several districts, forcing thousands to evacuate.",
+    "The World Health Organization declared the outbreak a public health emergency.",
+    "Scientists warn that the glacier could lose half of its mass by the end of the century.",
+    "The company recalled two million vehicles over a faulty airbag sensor.",
+    "Officials said the viral video of the bridge collapse was filmed in another country years ago.",
+    "The actor confirmed on social media that the couple had separated last spring.",
+    "Election authorities reported record turnout in the first phase of voting.",
+    "The government announced free electricity for households using less than 200 units a month.",
+    "Researchers found no evidence that the vaccine alters human DNA.",
+    "The stock market fell sharply after the trade talks collapsed without an agreement.",
+    "A photo shared thousands of times shows a shark swimming on a flooded highway, but it is edited.",
+    "The prime minister inaugurated the longest sea bridge in the country on Friday.",
+]
+
+
+def build_texts(count, seed):
+    """Deterministic mix of single headlines and multi-sentence passages."""
+    rng = random.Random(seed)
+    texts = []
+    for i in range(count):
+        length = 1 if i % 2 == 0 else rng.randint(2, 8)
+        texts.append(" ".join(rng.choice(SENTENCES) for _ in range(length)) + f" ({i})")
+    return texts
+
+
+def resident_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(backend, texts, repeats, latency_samples, batch_size, embeddings_out):
+    rss_before = resident_mb()
+    started = time.perf_counter()
+    encoder = encoders.load_encoder(
+        backend, get_sentence_model_name(), settings.FACTS_ENCODER_PATH,
+        getattr(settings, 'FACTS_ENCODER_THREADS', 0))
+    load_seconds = time.perf_counter() - started
+
+    embeddings = encoder.encode(texts, batch_size=batch_size)
+    np.save(embeddings_out, embeddings)
+
+    batch_times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        encoder.encode(texts, batch_size=batch_size)
+        batch_times.append(time.perf_counter() - started)
+
+    latencies = []
+    for text in texts[:latency_samples]:
+        started = time.perf_counter()
+        encoder.encode([text])
+        latencies.append(time.perf_counter() - started)
+    latencies = np.asarray(latencies) * 1000
+
+    return {
+        'backend': backend,
+        'load_seconds': load_seconds,
+        'rss_mb': resident_mb(),
+        'rss_delta_mb': resident_mb() - rss_before,
+        'texts_per_second': len(texts) / min(batch_times),
+        'single_latency_ms': {
+            'p50': float(np.percentile(latencies, 50)),
+            'p90': float(np.percentile(latencies, 90)),
+            'p99': float(np.percentile(latencies, 99)),
+        },
+    }
+
+
+def agreement(reference, candidate):
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    candidate = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    cosines = (reference * candidate).sum(axis=1)
+    # Do pairwise similarities rank the same way? (what check_similarity depends on)
+    ref_pairs = (reference[:64] @ reference[:64].T).ravel()
+    cand_pairs = (candidate[:64] @ candidate[:64].T).ravel()
+    return {
+        'mean_cosine': float(cosines.mean()),
+        'min_cosine': float(cosines.min()),
+        'max_pairwise_similarity_error': float(np.abs(ref_pairs - cand_pairs).max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', nargs='+', default=list(encoders.BACKENDS), choices=encoders.BACKENDS)
+    parser.add_argument('--texts', type=int, default=512, help='size of the fixed text set')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeats', type=int, default=3, help='batch passes per backend (best is reported)')
+    parser.add_argument('--latency-samples', type=int, default=100, help='texts encoded one at a time')
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--embeddings-out', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    texts = build_texts(args.texts, args.seed)
+
+    if args.child:
+        result = measure(args.child, texts, args.repeats, args.latency_samples, args.batch_size, args.embeddings_out)
+        print(json.dumps(result))
+        return
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in args.backends:
+            print(f"Benchmarking {backend} ...", file=sys.stderr)
+            embeddings_path = os.path.join(tmp, f"{backend}.npy")
+            command = [sys.executable, os.path.abspath(__file__), '--child', backend,
+                       '--embeddings-out', embeddings_path, '--texts', str(args.texts),
+                       '--seed', str(args.seed), '--repeats', str(args.repeats),
+                       '--latency-samples', str(args.latency_samples), '--batch-size', str(args.batch_size)]
+            completed = subprocess.run(command, capture_output=True, text=True)
+            if completed.returncode != 0:
+                print(completed.stderr, file=sys.stderr)
+                results[backend] = {'backend': backend, 'error': completed.stderr.strip().splitlines()[-1]}
+                continue
+            results[backend] = json.loads(completed.stdout.strip().splitlines()[-1])
+            results[backend]['embeddings'] = np.load(embeddings_path)
+
+    embeddings = {backend: result.pop('embeddings') for backend, result in results.items() if 'embeddings' in result}
+    if 'torch' in embeddings:
+        baseline = results['torch']
+        for backend, result in results.items():
+            if backend == 'torch' or backend not in embeddings:
+                continue
+            result['agreement_with_torch'] = agreement(embeddings['torch'], embeddings[backend])
+            result['speedup_vs_torch'] = result['texts_per_second'] / baseline['texts_per_second']
+
+    report = {
+        'model': get_sentence_model_name(),
+        'texts': args.texts,
+        'batch_size': args.batch_size,
+        'results': list(results.values()),
+    }
+
+    print(f"{'backend':<10} {'load s':>7} {'RSS MB':>7} {'texts/s':>9} {'p50 ms':>7} {'speedup':>8} {'cos mean':>9}")
+    for result in report['results']:
+        if 'error' in result:
+            print(f"{result['backend']:<10} error: {result['error']}")
+            continue
+        print(f"{result['backend']:<10} {result['load_seconds']:>7.2f} {result['rss_mb']:>7.0f} "
+              f"{result['texts_per_second']:>9.1f} {result['single_latency_ms']['p50']:>7.2f} "
+              f"{result.get('speedup_vs_torch', 1.0):>8.2f} "
+              f"{result.get('agreement_with_torch', {}).get('mean_cosine', 1.0):>9.4f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
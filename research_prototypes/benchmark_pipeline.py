@@ -0,0 +1,402 @@
+"""
+Offline latency and accuracy benchmark for the verification pipeline.
+
+Samples labeled headlines from dataset/politifact_*.csv and
+dataset/gossipcop_*.csv and runs them through FactCheckerService.verify_claim.
+Search results and pages come from a recorded corpus, served by a local
+stand-in HTTP server that the scraper reaches as its proxy. Original hostnames
+are kept, so per-host limits behave as in production.
+
+    # Record search results and pages once (needs internet)
+    python research_prototypes/benchmark_pipeline.py --record --samples 20
+
+    # Replay offline, as often as needed
+    python research_prototypes/benchmark_pipeline.py --output bench.json
+    python research_prototypes/benchmark_pipeline.py --output new.json --compare bench.json
+
+The caches are off unless --warm-caches is given, and so is the known-claims
+index unless --known-claims is: it is built from the same dataset titles, so
+every sampled claim would match itself and skip the pipeline.
+
+Reports per-stage latency percentiles, end-to-end latency, throughput and
+verdict accuracy against the real/fake labels, and writes them as JSON.
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import django
+import numpy as np
+import pandas as pd
+
+# Setup Django Environment
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'news_guardian.settings')
+django.setup()
+
+from django.conf import settings
+from facts import services
+from facts.services import FactCheckerService
+
+DATASETS = {
+    'politifact_fake': ('dataset/politifact_fake.csv', 'fake'),
+    'politifact_real': ('dataset/politifact_real.csv', 'real'),
+    'gossipcop_fake': ('dataset/gossipcop_fake.csv', 'fake'),
+    'gossipcop_real': ('dataset/gossipcop_real.csv', 'real'),
+}
+
+DEFAULT_CORPUS = os.path.join(BASE_DIR, 'research_prototypes', 'bench_corpus')
+
+# FactCheckerService stages timed by the harness
+TIMED_STAGES = [
+    'search_web',
+    '_collect_summaries',
+    '_collect_streamed',
+    '_scrape_single',
+    '_extract_text',
+    '_summarize_text',
+    'summarize_for_query',
+    'check_similarity',
+    'classify_verdict',
+]
+
+
+def sample_claims(samples_per_dataset, seed):
+    claims = []
+    for name, (path, label) in DATASETS.items():
+        full_path = os.path.join(BASE_DIR, path)
+        try:
+            titles = pd.read_csv(full_path, usecols=['title'])['title'].dropna().astype(str)
+        except Exception as e:
+            print(f"   Error reading {name}: {e}")
+            continue
+        titles = titles[titles.str.len() > 10].drop_duplicates()
+        picked = titles.sample(n=min(samples_per_dataset, len(titles)), random_state=seed)
+        claims.extend({'claim': t.strip(), 'label': label, 'dataset': name} for t in picked)
+    return claims
+
+
+def as_http(url):
+    """Replayed pages are served over plain HTTP by the stand-in server."""
+    return 'http://' + url.split('://', 1)[1] if url.startswith('https://') else url
+
+
+def page_key(url):
+    return hashlib.sha256(as_http(url).encode('utf-8')).hexdigest()
+
+
+class Corpus:
+    """Recorded search results (index.json) and page bodies (pages/<sha256>)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.pages_dir = os.path.join(path, 'pages')
+        self.index_path = os.path.join(path, 'index.json')
+        self.index = {'searches': {}, 'pages': {}}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+
+    def save(self):
+        os.makedirs(self.pages_dir, exist_ok=True)
+        with open(self.index_path, 'w') as f:
+            json.dump(self.index, f, indent=1)
+
+    def search_results(self, query):
+        return self.index['searches'].get(query)
+
+    def page(self, url):
+        meta = self.index['pages'].get(page_key(url))
+        if meta is None:
+            return None
+        with open(os.path.join(self.pages_dir, page_key(url)), 'rb') as f:
+            return meta, f.read()
+
+    def record(self, claims, max_page_bytes=5 * 1024 * 1024):
+        headers = FactCheckerService._build_headers()
+        for i, item in enumerate(claims, 1):
+            claim = item['claim']
+            if claim in self.index['searches']:
+                continue
+            print(f"[{i}/{len(claims)}] Recording '{claim}'")
+            results = [{'href': url} for url in FactCheckerService.search_web(claim)]
+            self.index['searches'][claim] = results
+            for result in results:
+                url = result['href']
+                if page_key(url) in self.index['pages']:
+                    continue
+                try:
+                    response = services.get_http_session().get(url, headers=headers, timeout=10)
+                    body = response.content[:max_page_bytes]
+                    meta = {
+                        'url': url,
+                        'status': response.status_code,
+                        'content_type': response.headers.get('Content-Type', 'text/html'),
+                    }
+                except Exception as e:
+                    print(f"   Failed to record {url}: {e}")
+                    meta, body = {'url': url, 'status': 504, 'content_type': 'text/plain'}, b''
+                os.makedirs(self.pages_dir, exist_ok=True)
+                with open(os.path.join(self.pages_dir, page_key(url)), 'wb') as f:
+                    f.write(body)
+                self.index['pages'][page_key(url)] = meta
+            self.save()
+
+
+def make_proxy_handler(corpus, latency_ms):
+    class ReplayHandler(BaseHTTPRequestHandler):
+        """Answers proxied GETs (absolute URL in the request line) from the corpus."""
+
+        def do_GET(self):
+            if latency_ms:
+                time.sleep(latency_ms / 1000.0)
+            found = corpus.page(self.path)
+            if found is None:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            meta, body = found
+            self.send_response(meta['status'])
+            self.send_header('Content-Type', meta['content_type'])
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return ReplayHandler
+
+
+class ReplayDDGS:
+    """Stands in for duckduckgo_search.DDGS, answering from the recorded searches."""
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    def __call__(self):
+        return self
+
+    def text(self, query, max_results=10):
+        results = self.corpus.search_results(query) or []
+        return [{'href': as_http(r['href']), 'title': '', 'body': ''} for r in results[:max_results]]
+
+    def images(self, query, max_results=1):
+        return []
+
+
+class StageTimer:
+    def __init__(self):
+        self.durations = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self.durations.setdefault(stage, []).append(seconds)
+
+    def wrap(self, stage, func):
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - started)
+        return timed
+
+    def install(self):
+        for name in TIMED_STAGES:
+            setattr(FactCheckerService, name, staticmethod(self.wrap(name, getattr(FactCheckerService, name))))
+        services.encode_texts = self.wrap('encode_texts', services.encode_texts)
+
+
+def summarize_latencies(values):
+    values = np.asarray(values, dtype=float)
+    return {
+        'count': int(values.size),
+        'mean': float(values.mean()),
+        'p50': float(np.percentile(values, 50)),
+        'p90': float(np.percentile(values, 90)),
+        'p99': float(np.percentile(values, 99)),
+        'max': float(values.max()),
+    }
+
+
+def predicted_label(verdict):
+    if "True" in verdict:
+        return 'real'
+    if "Fake" in verdict:
+        return 'fake'
+    return 'unverified'
+
+
+def run_benchmark(claims, concurrency):
+    timer = StageTimer()
+    timer.install()
+
+    def run_one(item):
+        started = time.perf_counter()
+        try:
+            result = FactCheckerService.verify_claim(item['claim'])
+            verdict = result['verdict']
+        except Exception as e:
+            verdict = f"Error: {e}"
+        return {**item, 'verdict': verdict, 'predicted': predicted_label(verdict),
+                'latency': time.perf_counter() - started}
+
+    # Load the models before the clock starts
+    services.get_sentence_model()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        rows = list(executor.map(run_one, claims))
+    wall = time.perf_counter() - started
+
+    decisive = [r for r in rows if r['predicted'] != 'unverified']
+    correct = sum(1 for r in rows if r['predicted'] == r['label'])
+    confusion = {}
+    for r in rows:
+        key = f"{r['label']}->{r['predicted']}"
+        confusion[key] = confusion.get(key, 0) + 1
+
+    return {
+        'claims': len(rows),
+        'wall_seconds': wall,
+        'throughput_per_second': len(rows) / wall if wall else 0.0,
+        'end_to_end': summarize_latencies([r['latency'] for r in rows]),
+        'stages': {stage: summarize_latencies(v) for stage, v in sorted(timer.durations.items())},
+        'accuracy': {
+            'overall': correct / len(rows) if rows else 0.0,
+            'decisive': sum(1 for r in decisive if r['predicted'] == r['label']) / len(decisive) if decisive else 0.0,
+            'coverage': len(decisive) / len(rows) if rows else 0.0,
+            'confusion': confusion,
+        },
+        'results': rows,
+    }
+
+
+def print_report(report, baseline=None):
+    print("\n" + "=" * 50)
+    print("BENCHMARK RESULTS")
+    print("=" * 50)
+    print(f"Claims: {report['claims']}  Wall: {report['wall_seconds']:.2f}s  "
+          f"Throughput: {report['throughput_per_second']:.2f} claims/s")
+
+    rows = [('end_to_end', report['end_to_end'])] + list(report['stages'].items())
+    print(f"\n{'stage':<22}{'count':>7}{'p50':>10}{'p90':>10}{'p99':>10}")
+    for stage, stats in rows:
+        line = f"{stage:<22}{stats['count']:>7}{stats['p50']:>10.3f}{stats['p90']:>10.3f}{stats['p99']:>10.3f}"
+        if baseline:
+            before = baseline['end_to_end'] if stage == 'end_to_end' else baseline['stages'].get(stage)
+            if before and before['p50']:
+                line += f"   p50 {100 * (stats['p50'] / before['p50'] - 1):+.1f}%"
+        print(line)
+
+    accuracy = report['accuracy']
+    print(f"\nAccuracy: {accuracy['overall']:.3f} overall, {accuracy['decisive']:.3f} on decisive verdicts "
+          f"({accuracy['coverage']:.0%} coverage)")
+    if baseline:
+        print(f"   Baseline: {baseline['accuracy']['overall']:.3f} overall, "
+              f"{baseline['accuracy']['decisive']:.3f} decisive")
+    print(f"Confusion (label->predicted): {accuracy['confusion']}")
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=BASE_DIR, text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--record', action='store_true', help='record live search results and pages into the corpus')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--samples', type=int, default=25, help='claims sampled per dataset file')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--concurrency', type=int, default=1, help='claims verified in parallel')
+    parser.add_argument('--latency-ms', type=int, default=0, help='artificial delay per replayed page')
+    parser.add_argument('--warm-caches', action='store_true',
+                        help='keep the search/article/verdict caches on (off by default so every claim runs the full pipeline)')
+    parser.add_argument('--known-claims', action='store_true',
+                        help='use the known-claims index (off by default: it is built from the same dataset titles '
+                             'that are sampled as claims, so every claim would match itself)')
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--compare', help='previous JSON report to compare against')
+    args = parser.parse_args()
+
+    claims = sample_claims(args.samples, args.seed)
+    if not claims:
+        print("No claims sampled; are the dataset CSVs checked out (git lfs pull)?")
+        return 1
+
+    corpus = Corpus(args.corpus)
+    if args.record:
+        corpus.record(claims)
+        print(f"Recorded {len(corpus.index['searches'])} searches, {len(corpus.index['pages'])} pages")
+        return 0
+
+    claims = [c for c in claims if corpus.search_results(c['claim']) is not None]
+    if not claims:
+        print(f"No recorded claims in {args.corpus}; run with --record first.")
+        return 1
+
+    if not args.warm_caches:
+        settings.FACTS_SEARCH_CACHE = False
+        settings.FACTS_ARTICLE_CACHE = False
+        settings.FACTS_VERDICT_CACHE = False
+
+    if not args.known_claims:
+        settings.FACTS_KNOWN_CLAIMS_MATCH = None
+        # No index, no lookup: its encode would show up in the timings
+        settings.FACTS_KNOWN_CLAIMS_PATH = None
+
+    # Everything the pipeline fetches goes to the stand-in server
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_proxy_handler(corpus, args.latency_ms))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    proxy = f"http://127.0.0.1:{server.server_address[1]}"
+    session = services.get_http_session()
+    session.trust_env = False
+    session.proxies = {'http': proxy, 'https': proxy}
+    services.DDGS = ReplayDDGS(corpus)
+    services.google_search = None
+
+    report = run_benchmark(claims, args.concurrency)
+    server.shutdown()
+
+    report['meta'] = {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'git_revision': git_revision(),
+        'samples_per_dataset': args.samples,
+        'seed': args.seed,
+        'concurrency': args.concurrency,
+        'latency_ms': args.latency_ms,
+        'warm_caches': args.warm_caches,
+        'known_claims': args.known_claims,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+Cold-start benchmark: import cost and time-to-first-response of the WSGI app.
+
+Every measurement runs in a fresh interpreter, the way a new gunicorn worker
+or a `manage.py` call in the container entrypoint starts:
+
+  * import profile: `python -X importtime` of django.setup() plus the URLconf
+    (which imports facts.services and facts.views): self time summed per
+    top-level package, heaviest first, and the cumulative time of our own
+    entry-point modules
+  * first response: interpreter start -> WSGI application built -> first
+    request answered, for a cheap path (the health check by default)
+  * manage.py: wall time of `manage.py check`
+
+    python research_prototypes/benchmark_startup.py --output startup.json
+    python research_prototypes/benchmark_startup.py --compare startup.json
+
+Model preloading is switched off in the children (FACTS_PRELOAD_MODELS is
+read from settings), so the numbers are about imports, not model loads.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_TARGET = "import django; django.setup(); import news_guardian.urls"
+ENTRY_POINTS = ('news_guardian.urls', 'facts.services', 'facts.views')
+
+FIRST_RESPONSE = """
+import json, sys, time
+started = time.perf_counter()
+from news_guardian.wsgi import application
+built = time.perf_counter()
+from wsgiref.util import setup_testing_defaults
+environ = {'PATH_INFO': sys.argv[1], 'HTTP_HOST': 'localhost'}
+setup_testing_defaults(environ)
+statuses = []
+body = b''.join(application(environ, lambda status, headers: statuses.append(status)))
+answered = time.perf_counter()
+print(json.dumps({
+    'wsgi_import_seconds': built - started,
+    'first_request_seconds': answered - built,
+    'status': statuses[0],
+}))
+"""
+
+
+def child_env():
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'news_guardian.settings')
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [BASE_DIR, env.get('PYTHONPATH')]))
+    env['FACTS_PRELOAD_MODELS'] = '0'
+    return env
+
+
+def parse_importtime(stderr):
+    """
+    From `-X importtime` output: (self microseconds summed per top-level
+    package, cumulative microseconds of each ENTRY_POINTS module).
+    """
+    packages = {}
+    entry_points = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        try:
+            own, cumulative, name = line[len('import time:'):].split('|')
+            own, cumulative = int(own), int(cumulative)
+        except ValueError:
+            continue
+        name = name.strip()
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + own
+        if name in ENTRY_POINTS:
+            entry_points[name] = cumulative
+    return packages, entry_points
+
+
+def measure_imports():
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', IMPORT_TARGET],
+                               capture_output=True, text=True, env=child_env(), cwd=BASE_DIR)
+    wall = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return (wall,) + parse_importtime(completed.stderr)
+
+
+def measure_first_response(path):
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-c', FIRST_RESPONSE, path],
+                               capture_output=True, text=True, env=child_env(), cwd=BASE_DIR)
+    wall = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['process_seconds'] = wall
+    return result
+
+
+def measure_command(command):
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, 'manage.py'] + command.split(),
+                               capture_output=True, text=True, env=child_env(), cwd=BASE_DIR)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return time.perf_counter() - started
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=BASE_DIR).stdout.strip()
+    except OSError:
+        return None
+
+
+def median(values):
+    return statistics.median(values) if values else None
+
+
+def run_benchmark(runs, path, command):
+    import_walls, responses, command_walls = [], [], []
+    packages = {}
+    entry_points = {}
+    for run in range(runs):
+        print(f"Run {run + 1}/{runs} ...", file=sys.stderr)
+        wall, run_packages, run_entry_points = measure_imports()
+        import_walls.append(wall)
+        for name, micros in run_packages.items():
+            packages.setdefault(name, []).append(micros)
+        for name, micros in run_entry_points.items():
+            entry_points.setdefault(name, []).append(micros)
+        responses.append(measure_first_response(path))
+        command_walls.append(measure_command(command))
+
+    return {
+        'import_process_seconds': median(import_walls),
+        'wsgi_import_seconds': median([r['wsgi_import_seconds'] for r in responses]),
+        'first_request_seconds': median([r['first_request_seconds'] for r in responses]),
+        'time_to_first_response_seconds': median([r['process_seconds'] for r in responses]),
+        'first_response_status': responses[-1]['status'],
+        'command_seconds': median(command_walls),
+        'entry_points_ms': {name: median(micros) / 1000 for name, micros in entry_points.items()},
+        'packages_ms': {name: median(micros) / 1000 for name, micros in
+                        sorted(packages.items(), key=lambda item: -median(item[1]))},
+    }
+
+
+def print_report(report, baseline=None, top=15):
+    rows = [
+        ('import (process)', 'import_process_seconds'),
+        ('WSGI app built', 'wsgi_import_seconds'),
+        ('first request', 'first_request_seconds'),
+        ('time to first response', 'time_to_first_response_seconds'),
+        (f"manage.py {report['meta']['command']}", 'command_seconds'),
+    ]
+    print(f"\n{'':<26} {'seconds':>9}" + (f" {'baseline':>9} {'change':>8}" if baseline else ''))
+    for label, key in rows:
+        line = f"{label:<26} {report[key]:>9.3f}"
+        if baseline and baseline.get(key):
+            line += f" {baseline[key]:>9.3f} {(report[key] / baseline[key] - 1) * 100:>+7.1f}%"
+        print(line)
+
+    print(f"First response status: {report['first_response_status']}")
+
+    def print_times(title, times, baseline_times):
+        print(f"\n{title}")
+        for name, ms in times:
+            line = f"  {name:<32} {ms:>9.1f}"
+            if name in baseline_times:
+                line += f" {baseline_times[name]:>9.1f}"
+            print(line)
+
+    baseline = baseline or {}
+    print_times("Entry points (ms, cumulative)", report['entry_points_ms'].items(),
+                baseline.get('entry_points_ms', {}))
+    print_times("Heaviest packages (ms, own modules only)", list(report['packages_ms'].items())[:top],
+                baseline.get('packages_ms', {}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per measurement (median is reported)')
+    parser.add_argument('--path', default='/', help='path of the first request')
+    parser.add_argument('--command', default='check', help='manage.py command to time')
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--compare', help='JSON report of an earlier run to compare against')
+    args = parser.parse_args()
+
+    report = run_benchmark(args.runs, args.path, args.command)
+    report['meta'] = {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'git_revision': git_revision(),
+        'python': sys.version.split()[0],
+        'runs': args.runs,
+        'path': args.path,
+        'command': args.command,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())